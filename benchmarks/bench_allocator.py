@@ -0,0 +1,60 @@
+"""
+Time of a loop of NDArray intermediates with the caching allocator on and off.
+
+Each step builds the intermediates of a layer-norm forward pass on a batch, all of which die at the
+end of the step, so from the second step on every allocation can be served by the cache.
+
+Usage:
+    python benchmarks/bench_allocator.py [--shape 1024 4096] [--steps 10] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+from minima.ndarray import NDArray, cpu, cpu_numpy
+
+
+def step(x, mean, inv_std):
+    centered = x - mean
+    return (centered * inv_std).maximum(0.0) + 1.0
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--shape', type=int, nargs=2, default=[1024, 4096])
+    parser.add_argument('--steps', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    x = np.random.randn(*args.shape).astype(np.float32)
+    mean, std = x.mean(axis=1, keepdims=True), x.std(axis=1, keepdims=True)
+    print(f"{'device':>10} {'no cache (ms/step)':>19} {'cache (ms/step)':>16} {'speedup':>8} {'hits':>7} {'misses':>7}")
+    for device in (cpu_numpy(), cpu()):
+        X, M, S = NDArray(x, device=device), NDArray(mean, device=device), NDArray(1 / std, device=device)
+
+        def run():
+            for _ in range(args.steps):
+                step(X, M, S)
+
+        limit = device.get_cache_limit()
+        device.set_cache_limit(0)
+        t_off = best_time(run, args.repeat)
+        device.set_cache_limit(limit)
+        before = device.memory_stats()
+        t_on = best_time(run, args.repeat)
+        after = device.memory_stats()
+        print(f"{device.name:>10} {t_off / args.steps * 1e3:>19.3f} {t_on / args.steps * 1e3:>16.3f} "
+              f"{t_off / t_on:>7.2f}x {after['hits'] - before['hits']:>7} {after['misses'] - before['misses']:>7}")
+
+
+if __name__ == '__main__':
+    main()
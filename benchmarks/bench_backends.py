@@ -0,0 +1,95 @@
+"""
+Benchmark of the numpy and compiled cpu `NDArray` backends, op by op.
+
+Every function of the backend table is timed on the same inputs with both backends, directly on
+backend `Array`s so that only the kernels are measured.
+
+Usage:
+    python benchmarks/bench_backends.py [--sizes 1024 65536 1048576] [--repeat 20] [--matmul 64 256]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from minima import ndarray_backend_numpy
+from minima.ndarray import ndarray_backend_cpu
+
+
+def to_array(mod, x):
+    a = mod.Array(x.size)
+    mod.from_numpy(np.ascontiguousarray(x, dtype=np.float32), a)
+    return a
+
+
+def time_call(fn, args, repeat):
+    "Best time of `repeat` calls, in microseconds."
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1e6
+
+
+def elementwise_cases(mod, n):
+    "(name, function, args) of every op that works on flat arrays of `n` elements, and of reductions of views of them."
+    x = to_array(mod, np.random.randn(n))
+    y = to_array(mod, np.random.randn(n))
+    pos = to_array(mod, np.random.rand(n) + 0.5)
+    out = mod.Array(n)
+    rows = mod.Array(n // 16)
+    side = int(round(n ** 0.5))
+    cases = [(name, (x, y, out)) for name in
+             ('ewise_add', 'ewise_mul', 'ewise_div', 'ewise_maximum', 'ewise_eq', 'ewise_ge')]
+    cases += [(name, (x, 0.5, out)) for name in
+              ('scalar_add', 'scalar_mul', 'scalar_div', 'scalar_maximum', 'scalar_eq', 'scalar_ge')]
+    cases += [('scalar_power', (pos, 2.5, out))]
+    cases += [(name, (pos, out)) for name in ('ewise_log', 'ewise_exp', 'ewise_tanh')]
+    cases += [(name, (x, rows, 16)) for name in ('reduce_sum', 'reduce_max')]
+    cases += [('fill', (out, 1.0)),
+              ('compact', (x, mod.Array(side * side), (side, side), (1, side), 0)),
+              ('ewise_setitem', (mod.Array(side * side), out, (side, side), (1, side), 0)),
+              ('scalar_setitem', (1.0, out, (side, side), (1, side), 0))]
+    cases = [(name, getattr(mod, name), args) for name, args in cases]
+    # every axis of a (side, side) view reduced in place, contiguous and transposed
+    for label, strides in (('', (side, 1)), ('_T', (1, side))):
+        view = ((side, side), strides, 0, 2)
+        cases += [(f'reduce_sum_all{label}', mod.reduce_sum_strided, (x, mod.Array(1), *view)),
+                  (f'mean_var_all{label}', mod.reduce_mean_var_strided, (x, mod.Array(1), mod.Array(1), *view))]
+    return cases
+
+
+def matmul_cases(mod, m):
+    a = to_array(mod, np.random.randn(m * m))
+    b = to_array(mod, np.random.randn(m * m))
+    return [('matmul', mod.matmul, (a, b, mod.Array(m * m), m, m, m))]
+
+
+def report(title, numpy_cases, cpu_cases, repeat):
+    print(f"\n{title}\n{'op':<16} {'numpy (us)':>12} {'cpu (us)':>12} {'speedup':>8}")
+    for (name, np_fn, np_args), (_, cpu_fn, cpu_args) in zip(numpy_cases, cpu_cases):
+        t_np, t_cpu = time_call(np_fn, np_args, repeat), time_call(cpu_fn, cpu_args, repeat)
+        print(f'{name:<16} {t_np:>12.1f} {t_cpu:>12.1f} {t_np / t_cpu:>7.2f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1 << 10, 1 << 16, 1 << 20])
+    parser.add_argument('--matmul', type=int, nargs='+', default=[64, 256])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if ndarray_backend_cpu is None:
+        sys.exit('the compiled cpu backend is not built, run `python setup.py build_ext --inplace` first')
+
+    for n in args.sizes:
+        report(f'{n} elements', elementwise_cases(ndarray_backend_numpy, n),
+               elementwise_cases(ndarray_backend_cpu, n), args.repeat)
+    for m in args.matmul:
+        report(f'{m}x{m} matmul', matmul_cases(ndarray_backend_numpy, m),
+               matmul_cases(ndarray_backend_cpu, m), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark of `Tensor.backward` on deep residual MLPs.
+
+Compares the iterative topological sort used by `Tensor.backward` with the recursive
+`build_topo` implementation it replaced, at depths of 10, 100 and 1000 `Residual` blocks.
+
+Usage:
+    python benchmarks/bench_backward.py [--depths 10 100 1000] [--steps 5] [--width 32]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import minima as mi
+from minima import nn
+
+
+def recursive_backward(tensor):
+    "The previous `Tensor.backward`: recursive sort."
+    tensor.grad = mi.Tensor(np.ones(tensor.shape))
+    node_to_output_grads_list = {tensor: tensor.grad}
+
+    visited = set()
+    reverse_topo_order = []
+
+    def build_topo(node):
+        visited.add(node)
+        for child in node.children:
+            if child not in visited:
+                build_topo(child)
+        reverse_topo_order.append(node)
+
+    build_topo(tensor)
+    reverse_topo_order.reverse()
+
+    for node in reverse_topo_order:
+        node.grad = node_to_output_grads_list[node]
+        if not node.is_leaf():
+            for in_node, grad in zip(node.children, node.op.gradient(node.grad, node)):
+                if in_node not in node_to_output_grads_list:
+                    node_to_output_grads_list[in_node] = grad
+                else:
+                    node_to_output_grads_list[in_node] += grad
+
+
+def iterative_backward(tensor):
+    tensor.backward()
+
+
+def make_model(depth, width):
+    blocks = [nn.Residual(nn.Sequential(nn.Linear(width, width), nn.ReLU())) for _ in range(depth)]
+    return nn.Sequential(*blocks)
+
+
+def time_steps(backward_fn, model, x, steps):
+    "Average forward + backward time per step, or `None` if the backward pass overflows the stack."
+    times = []
+    for _ in range(steps):
+        start = time.perf_counter()
+        # deep residual stacks overflow float32 without a tuned init; only the timings matter here
+        with np.errstate(over='ignore', invalid='ignore'):
+            loss = model(x).sum()
+            try:
+                backward_fn(loss)
+            except RecursionError:
+                return None
+        times.append(time.perf_counter() - start)
+    return sum(times) / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--depths', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--steps', type=int, default=5)
+    parser.add_argument('--width', type=int, default=32)
+    parser.add_argument('--batch', type=int, default=16)
+    args = parser.parse_args()
+
+    print(f'recursion limit: {sys.getrecursionlimit()}')
+    print(f"{'depth':>6} {'recursive (ms)':>16} {'iterative (ms)':>16} {'speedup':>8}")
+    for depth in args.depths:
+        model = make_model(depth, args.width)
+        x = mi.Tensor(np.random.randn(args.batch, args.width).astype('float32'))
+        old = time_steps(recursive_backward, model, x, args.steps)
+        new = time_steps(iterative_backward, model, x, args.steps)
+        old_str = f'{old * 1e3:16.2f}' if old is not None else f"{'RecursionError':>16}"
+        speedup = f'{old / new:7.2f}x' if old is not None else f"{'-':>8}"
+        print(f'{depth:>6} {old_str} {new * 1e3:16.2f} {speedup}')
+
+
+if __name__ == '__main__':
+    main()
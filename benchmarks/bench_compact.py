@@ -0,0 +1,73 @@
+"""
+Benchmark of `compact` on the numpy and compiled cpu backends.
+
+Reports the effective bandwidth (bytes read + written per second) of compacting the layouts that
+`permute`, `broadcast_to` and `__getitem__` produce, next to a plain contiguous copy as the memory
+bandwidth reference.
+
+Usage:
+    python benchmarks/bench_compact.py [--n 4096] [--repeat 10]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from minima import ndarray_backend_numpy
+from minima.ndarray import ndarray_backend_cpu
+
+
+def layouts(n):
+    "(name, shape, strides, offset) of views into a compact n x n buffer."
+    h = n // 2
+    return [('contiguous', (n, n), (n, 1), 0),
+            ('transpose', (n, n), (1, n), 0),
+            ('row slice', (h, h), (n, 1), h),
+            ('strided slice', (h, h), (2 * n, 2), 0),
+            ('4-D permute', (h // 8, 8, 2, h), (8 * n, n, n // 2, 1), 0),
+            ('broadcast row', (n, n), (0, 1), 0)]
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--n', type=int, default=4096)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    if ndarray_backend_cpu is None:
+        sys.exit('the compiled cpu backend is not built, run `python setup.py build_ext --inplace` first')
+
+    data = np.random.randn(args.n * args.n).astype(np.float32)
+    src, dst = data.copy(), np.empty_like(data)
+    nbytes = 2 * data.nbytes
+    print(f'memcpy reference: {nbytes / best_time(lambda: np.copyto(dst, src), args.repeat) / 1e9:.1f} GB/s')
+
+    backends = [ndarray_backend_numpy, ndarray_backend_cpu]
+    arrays = []
+    for mod in backends:
+        a = mod.Array(data.size)
+        mod.from_numpy(data, a)
+        arrays.append(a)
+
+    print(f"{'layout':<16} {'numpy (GB/s)':>14} {'cpu (GB/s)':>12} {'speedup':>8}")
+    for name, shape, strides, offset in layouts(args.n):
+        size = int(np.prod(shape))
+        times = []
+        for mod, a in zip(backends, arrays):
+            out = mod.Array(size)
+            times.append(best_time(lambda: mod.compact(a, out, shape, strides, offset), args.repeat))
+        gbs = [2 * size * 4 / t / 1e9 for t in times]
+        print(f'{name:<16} {gbs[0]:>14.1f} {gbs[1]:>12.1f} {times[0] / times[1]:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
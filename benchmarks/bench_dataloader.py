@@ -0,0 +1,64 @@
+"""
+Batches per second of a multiprocess DataLoader with batches pickled or sent through shared memory.
+
+The dataset gathers batches of images from a preallocated array, so that the time goes to moving
+the batches from the workers to the main process rather than to loading them.
+
+Usage:
+    python benchmarks/bench_dataloader.py [--size 224] [--batch-size 64] [--workers 1 2 4] [--batches 100]
+"""
+import argparse
+import time
+
+import numpy as np
+from minima.data import DataLoader, Dataset
+
+
+class ImageDataset(Dataset):
+    def __init__(self, n, size):
+        self.images = np.random.rand(n, size, size, 3).astype(np.float32)
+        self.labels = np.random.randint(0, 1000, n)
+
+    def __len__(self):
+        return len(self.images)
+
+    def __getitem__(self, idxs):
+        return self.images[idxs], self.labels[idxs]
+
+
+def batches_per_second(dl, batches):
+    # the first epoch starts the workers and sizes the slabs
+    for _ in dl:
+        pass
+    start, n = time.perf_counter(), 0
+    while n < batches:
+        for x, y in dl:
+            x.sum()
+            n += 1
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--size', type=int, default=224)
+    parser.add_argument('--batch-size', type=int, default=64)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--batches', type=int, default=100)
+    args = parser.parse_args()
+
+    ds = ImageDataset(8 * args.batch_size, args.size)
+    mb = args.batch_size * args.size * args.size * 3 * 4 / 2 ** 20
+    print(f'batch: {args.batch_size}x{args.size}x{args.size}x3 float32, {mb:.1f} MiB')
+    print(f"{'workers':>8} {'pickled (batch/s)':>18} {'shared (batch/s)':>17} {'speedup':>8}")
+    for workers in args.workers:
+        rates = []
+        for shared_memory in (False, True):
+            dl = DataLoader(ds, batch_size=args.batch_size, shuffle=True, num_workers=workers,
+                            shared_memory=shared_memory)
+            rates.append(batches_per_second(dl, args.batches))
+            dl.close()
+        print(f'{workers:>8} {rates[0]:>18.1f} {rates[1]:>17.1f} {rates[1] / rates[0]:>7.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+GFLOP/s of the compiled cpu backend matmul against `numpy.matmul`.
+
+Covers square sizes and shapes that are not multiples of the kernel's blocks, timing the backend
+`matmul` on compact buffers so that only the kernel is measured, then stacks of matrices through
+`matmul_batched`, with the second operand either stacked or broadcast over the batch.
+
+Usage:
+    python benchmarks/bench_matmul.py [--sizes 64 128 256 512 1024 2048] [--repeat 5] [--threads N]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from minima.ndarray import ndarray_backend_cpu
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def to_array(x):
+    a = ndarray_backend_cpu.Array(x.size)
+    ndarray_backend_cpu.from_numpy(x, a)
+    return a
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[64, 128, 256, 512, 1024, 2048])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if ndarray_backend_cpu is None:
+        sys.exit('the compiled cpu backend is not built, run `python setup.py build_ext --inplace` first')
+    if args.threads is not None:
+        ndarray_backend_cpu.set_num_threads(args.threads)
+
+    shapes = [(s, s, s) for s in args.sizes] + [(1000, 777, 513), (4096, 64, 10), (31, 4096, 17)]
+    print(f'threads: {ndarray_backend_cpu.get_num_threads()}')
+    print(f"{'m x n x p':>18} {'numpy (GFLOP/s)':>16} {'cpu (GFLOP/s)':>14} {'speedup':>8}")
+    for m, n, p in shapes:
+        a = np.random.randn(m, n).astype(np.float32)
+        b = np.random.randn(n, p).astype(np.float32)
+        a_handle, b_handle, out = to_array(a), to_array(b), ndarray_backend_cpu.Array(m * p)
+        t_np = best_time(lambda: np.matmul(a, b), args.repeat)
+        t_cpu = best_time(lambda: ndarray_backend_cpu.matmul(a_handle, b_handle, out, m, n, p), args.repeat)
+        gflop = 2 * m * n * p / 1e9
+        print(f"{f'{m}x{n}x{p}':>18} {gflop / t_np:>16.1f} {gflop / t_cpu:>14.1f} {t_np / t_cpu:>7.2f}x")
+
+    print()
+    print(f"{'batch x m x n x p':>22} {'b':>9} {'numpy (GFLOP/s)':>16} {'cpu (GFLOP/s)':>14} {'speedup':>8}")
+    for batch, m, n, p in [(64, 128, 64, 128), (256, 32, 32, 32), (8, 512, 512, 512)]:
+        a = np.random.randn(batch, m, n).astype(np.float32)
+        for broadcast in (False, True):
+            b = np.random.randn(*(() if broadcast else (batch,)), n, p).astype(np.float32)
+            a_handle, b_handle = to_array(a), to_array(b)
+            out = ndarray_backend_cpu.Array(batch * m * p)
+            a_strides = (m * n, n, 1)
+            b_strides = (0 if broadcast else n * p, p, 1)
+            t_np = best_time(lambda: np.matmul(a, b), args.repeat)
+            t_cpu = best_time(lambda: ndarray_backend_cpu.matmul_batched(
+                a_handle, b_handle, out, (batch,), a_strides, 0, b_strides, 0, m, n, p), args.repeat)
+            gflop = 2 * batch * m * n * p / 1e9
+            print(f"{f'{batch}x{m}x{n}x{p}':>22} {'broadcast' if broadcast else 'stacked':>9} "
+                  f"{gflop / t_np:>16.1f} {gflop / t_cpu:>14.1f} {t_np / t_cpu:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Step time and backward peak memory of an MLP trained in float32 and with 16-bit parameters under `autocast`.
+
+The 16-bit runs keep float32 master weights in the optimizer, so the memory saved is that of the
+parameters, activations and gradients the graph holds during the backward pass. numpy has no native
+16-bit arithmetic on CPUs, where the time of a step goes up rather than down.
+
+Usage:
+    python benchmarks/bench_mixed_precision.py [--batch 256] [--width 1024] [--depth 4] [--steps 5] [--repeat 3]
+"""
+import argparse
+import contextlib
+import time
+
+import numpy as np
+import minima.autograd as autograd
+from minima import nn
+from minima.autograd import Tensor, autocast
+from minima.optim import Adam
+from minima.utility import ml_dtypes
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--batch', type=int, default=256)
+    parser.add_argument('--width', type=int, default=1024)
+    parser.add_argument('--depth', type=int, default=4)
+    parser.add_argument('--steps', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    x = Tensor(np.random.randn(args.batch, args.width).astype(np.float32))
+    y = Tensor(np.random.randint(0, 10, args.batch).astype(np.float32))
+    dtypes = ['float32', 'float16'] + (['bfloat16'] if ml_dtypes is not None else [])
+    print(f"{'dtype':>9} {'ms/step':>9} {'peak MiB':>9} {'loss':>8}")
+    for dtype in dtypes:
+        np.random.seed(0)
+        layers = [m for _ in range(args.depth) for m in (nn.Linear(args.width, args.width), nn.ReLU())]
+        model = nn.Sequential(*layers, nn.Linear(args.width, 10)).astype(dtype)
+        optimizer = Adam(model.parameters(), lr=1e-4, foreach=True)
+        loss_fn = nn.CrossEntropyLoss()
+
+        def step():
+            optimizer.zero_grad()
+            with autocast(dtype) if dtype != 'float32' else contextlib.nullcontext():
+                loss = loss_fn(model(x), y)
+            loss.backward(retain_graph=False)
+            optimizer.step()
+            return loss
+
+        loss = step()
+
+        def run():
+            for _ in range(args.steps):
+                step()
+
+        t = best_time(run, args.repeat) / args.steps
+        print(f"{dtype:>9} {t * 1e3:>9.2f} {autograd.BACKWARD_PEAK_BYTES / 2 ** 20:>9.1f} "
+              f"{float(loss.numpy().astype(np.float32)):>8.4f}")
+
+
+if __name__ == '__main__':
+    main()
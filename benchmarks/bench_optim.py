@@ -0,0 +1,63 @@
+"""
+Time of an optimizer step over the parameters one by one and all at once, with `foreach=True`.
+
+The total number of weights is fixed and split into more and more parameter tensors, so that the
+difference between the two comes from the per-parameter overhead of the step.
+
+Usage:
+    python benchmarks/bench_optim.py [--weights 1000000] [--params 10 100 1000 10000] [--steps 5] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+from minima.autograd import Tensor
+from minima.nn import Parameter
+from minima.optim import SGD, Adam
+
+
+def best_time(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_params(weights, n):
+    size = max(1, weights // n)
+    params = [Parameter(Tensor(np.random.randn(size).astype(np.float32))) for _ in range(n)]
+    for p in params:
+        p.grad = Tensor(np.random.randn(size).astype(np.float32))
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--weights', type=int, default=1_000_000)
+    parser.add_argument('--params', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--steps', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    optimizers = [('SGD', SGD, dict(lr=0.01, momentum=0.9)), ('Adam', Adam, dict(lr=1e-3))]
+    print(f"{'optimizer':>9} {'params':>7} {'loop (ms/step)':>15} {'foreach (ms/step)':>18} {'speedup':>8}")
+    for name, opt, kwargs in optimizers:
+        for n in args.params:
+            times = []
+            for foreach in (False, True):
+                optimizer = opt(make_params(args.weights, n), foreach=foreach, **kwargs)
+                # the first step creates the states, and the flat buffers with foreach
+                optimizer.step()
+
+                def run():
+                    for _ in range(args.steps):
+                        optimizer.step()
+
+                times.append(best_time(run, args.repeat) / args.steps)
+            print(f"{name:>9} {n:>7} {times[0] * 1e3:>15.3f} {times[1] * 1e3:>18.3f} {times[0] / times[1]:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,11 +6,14 @@
 // #include <pybind11/stl.h>
 
 #include <cstddef>
+#include <cstdint>
 #include <cstdlib>
 #include <new>
 #include <cmath>
+#include <cstring>
 #include <iostream>
 #include <stdexcept>
+#include <string>
 #include <vector>
 
 
@@ -18,10 +21,106 @@ namespace minima {
 namespace cpu {
 
 constexpr size_t kAlignment = 256;
-constexpr size_t kTile = 8;
 using ScalarT = float;
 constexpr size_t kElemSize = sizeof(ScalarT);
 
+/**
+ * @brief The storage type of the elements of a buffer.
+ *
+ * The kernels compute in float32 (`ScalarT`), the 16-bit types are a storage format that the
+ * kernels read and write in place, converting a chunk of elements at a time.
+ */
+enum class DType { kFloat32, kFloat16, kBFloat16 };
+
+/**
+ * @brief The size in bytes of an element of `dtype`.
+ */
+inline size_t ElemSize(DType dtype) {
+  return dtype == DType::kFloat32 ? sizeof(float) : sizeof(uint16_t);
+}
+
+/**
+ * @brief The DType of a name, "float32", "float16" or "bfloat16".
+ *
+ * @throws std::invalid_argument for any other name.
+ */
+inline DType ParseDType(const std::string& name) {
+  if (name == "float32") return DType::kFloat32;
+  if (name == "float16") return DType::kFloat16;
+  if (name == "bfloat16") return DType::kBFloat16;
+  throw std::invalid_argument("Unsupported dtype " + name + ", expected float32, float16 or bfloat16");
+}
+
+inline const char* DTypeName(DType dtype) {
+  switch (dtype) {
+    case DType::kFloat16: return "float16";
+    case DType::kBFloat16: return "bfloat16";
+    default: return "float32";
+  }
+}
+
+inline uint32_t FloatBits(float value) {
+  uint32_t bits;
+  std::memcpy(&bits, &value, sizeof(bits));
+  return bits;
+}
+
+inline float BitsFloat(uint32_t bits) {
+  float value;
+  std::memcpy(&value, &bits, sizeof(value));
+  return value;
+}
+
+/**
+ * @brief Convert an IEEE half to float, exactly.
+ */
+inline float HalfToFloat(uint16_t half) {
+  const uint32_t sign = uint32_t{half & 0x8000u} << 16;
+  const uint32_t exponent = (half >> 10) & 0x1f;
+  const uint32_t mantissa = half & 0x3ff;
+  if (exponent == 0x1f) return BitsFloat(sign | 0x7f800000u | (mantissa << 13));
+  if (exponent != 0) return BitsFloat(sign | ((exponent + 112) << 23) | (mantissa << 13));
+  // subnormal, mantissa * 2^-24
+  const float magnitude = static_cast<float>(mantissa) * 5.9604644775390625e-8f;
+  return sign ? -magnitude : magnitude;
+}
+
+/**
+ * @brief Convert a float to an IEEE half, rounding to nearest even, with overflow to infinity.
+ */
+inline uint16_t FloatToHalf(float value) {
+  uint32_t bits = FloatBits(value);
+  const uint16_t sign = static_cast<uint16_t>((bits >> 16) & 0x8000u);
+  bits &= 0x7fffffffu;
+  if (bits >= 0x47800000u) {
+    // overflow and infinity give infinity, NaN stays a quiet NaN
+    return sign | (bits > 0x7f800000u ? 0x7e00u : 0x7c00u);
+  }
+  if (bits < 0x38800000u) {
+    // subnormal or zero: adding 0.5 aligns the mantissa so that the float addition rounds it
+    return sign | static_cast<uint16_t>(FloatBits(BitsFloat(bits) + 0.5f) - 0x3f000000u);
+  }
+  const uint32_t odd = (bits >> 13) & 1;
+  bits += 0xc8000fffu + odd;  // rebias the exponent from 127 to 15 and round to nearest even
+  return sign | static_cast<uint16_t>(bits >> 13);
+}
+
+/**
+ * @brief Convert a bfloat16, the upper half of a float, to float, exactly.
+ */
+inline float BFloat16ToFloat(uint16_t value) {
+  return BitsFloat(uint32_t{value} << 16);
+}
+
+/**
+ * @brief Convert a float to bfloat16, rounding to nearest even.
+ */
+inline uint16_t FloatToBFloat16(float value) {
+  const uint32_t bits = FloatBits(value);
+  if ((bits & 0x7fffffffu) > 0x7f800000u) return static_cast<uint16_t>((bits >> 16) | 0x40u);
+  return static_cast<uint16_t>((bits + 0x7fffu + ((bits >> 16) & 1)) >> 16);
+}
+
 
 /**
  * @class AlignedBuffer
@@ -37,15 +136,17 @@ class AlignedBuffer {
    * @brief Construct an AlignedBuffer.
    * 
    * This constructor creates a buffer of a specified size, aligning the buffer to the ALIGNMENT size.
+   * The memory comes from the caching allocator, which may hand back the block of a destroyed buffer.
    *
-   * @param size The size of the buffer to allocate.
+   * @param size The size of the buffer to allocate, in elements.
+   * @param dtype The storage type of the elements.
    */
-  explicit AlignedBuffer(const size_t& size);
+  explicit AlignedBuffer(const size_t& size, DType dtype = DType::kFloat32);
 
   /**
    * @brief Destructor for the AlignedBuffer.
    *
-   * This destructor frees the memory allocated for the buffer.
+   * This destructor returns the memory of the buffer to the caching allocator.
    */
   ~AlignedBuffer();
 
@@ -63,6 +164,11 @@ class AlignedBuffer {
    */
   size_t size() const;
 
+  /**
+   * @brief Get the storage type of the elements of the buffer.
+   */
+  DType dtype() const;
+
   /**
    * @brief Set an element in the buffer.
    *
@@ -80,8 +186,16 @@ class AlignedBuffer {
    */
   ScalarT get_element(size_t index) const;
 
+  /**
+   * @brief Get the elements of a float32 buffer, which is what the kernels read and write.
+   */
   ScalarT* data() const;
 
+  /**
+   * @brief Get the bytes of the buffer, whatever its dtype.
+   */
+  void* raw() const;
+
   /**
    * @brief Overload the << operator for the AlignedBuffer.
    *
@@ -95,10 +209,16 @@ class AlignedBuffer {
  private:
 
   /// @brief The buffer.
-  ScalarT* buffer_{};
+  void* buffer_{};
 
   /// @brief The size of the buffer.
   size_t size_;
+
+  /// @brief The storage type of the elements.
+  DType dtype_;
+
+  /// @brief The size in bytes of the block holding the buffer, as rounded by the allocator.
+  size_t capacity_;
 };
 
 
@@ -0,0 +1,116 @@
+#ifndef MINIMA_CPU_ALLOCATOR_H
+#define MINIMA_CPU_ALLOCATOR_H
+
+#include <cstddef>
+#include <mutex>
+#include <unordered_map>
+#include <vector>
+
+namespace minima {
+namespace cpu {
+
+/**
+ * @brief Counters of the caching allocator.
+ */
+struct AllocatorStats {
+  /// @brief Allocations served from the cache.
+  size_t hits = 0;
+  /// @brief Allocations that went to the system allocator.
+  size_t misses = 0;
+  /// @brief Bytes of free blocks held by the cache.
+  size_t bytes_held = 0;
+};
+
+/**
+ * @class CachingAllocator
+ * @brief A size-bucketed cache of aligned blocks.
+ *
+ * Requests are rounded up to a bucket size, and freed blocks are kept in a free list per bucket
+ * instead of being returned to the system, so that the next request of the same bucket reuses
+ * them. Blocks that would take the cache over its limit are freed.
+ */
+class CachingAllocator {
+ public:
+
+  /**
+   * @brief Construct a CachingAllocator.
+   *
+   * @param limit The most bytes of free blocks the cache holds.
+   */
+  explicit CachingAllocator(size_t limit);
+
+  /**
+   * @brief Destructor for the CachingAllocator, frees the cached blocks.
+   */
+  ~CachingAllocator();
+
+  /**
+   * @brief Allocate a block of at least `bytes` bytes, aligned to kAlignment.
+   *
+   * @param bytes The number of bytes requested.
+   * @param capacity Set to the size of the bucket of the block, to pass back to `Free`.
+   *
+   * @return The block.
+   */
+  void* Allocate(size_t bytes, size_t* capacity);
+
+  /**
+   * @brief Return a block to the cache, or to the system if the cache is full.
+   *
+   * @param ptr The block.
+   * @param capacity The capacity set by `Allocate`.
+   */
+  void Free(void* ptr, size_t capacity);
+
+  /**
+   * @brief Free every cached block.
+   */
+  void EmptyCache();
+
+  void set_limit(size_t limit);
+  size_t limit() const;
+  AllocatorStats stats() const;
+
+  /**
+   * @brief The bucket of a request: multiples of 512 bytes up to 1 MiB, then multiples of a
+   * quarter of the request's power of two, which wastes at most 25%.
+   */
+  static size_t RoundSize(size_t bytes);
+
+ private:
+  void TrimTo(size_t limit);
+
+  mutable std::mutex mutex_;
+  std::unordered_map<size_t, std::vector<void*>> free_blocks_;
+  size_t limit_;
+  AllocatorStats stats_;
+};
+
+/**
+ * @brief The allocator behind every AlignedBuffer.
+ *
+ * Its limit defaults to the `MINIMA_CACHE_LIMIT` environment variable, in bytes, or to 1 GiB.
+ */
+CachingAllocator& allocator();
+
+/**
+ * @brief Free every block cached by `allocator()`.
+ */
+void empty_cache();
+
+/**
+ * @brief Set the most bytes of free blocks `allocator()` holds, 0 disables the cache.
+ *
+ * @param limit The limit in bytes, cached blocks above it are freed.
+ */
+void set_cache_limit(size_t limit);
+
+/**
+ * @brief Get the most bytes of free blocks `allocator()` holds.
+ */
+size_t get_cache_limit();
+
+}  // namespace cpu
+}  // namespace minima
+
+#endif  // MINIMA_CPU_ALLOCATOR_H
@@ -0,0 +1,39 @@
+#ifndef MINIMA_CPU_GEMM_H
+#define MINIMA_CPU_GEMM_H
+
+#include <cstddef>
+
+namespace minima {
+namespace cpu {
+
+/**
+ * @brief Computes C = A @ B for strided single precision matrices.
+ *
+ * A is m x n and B is n x p, each addressed through a row and a column stride (in elements),
+ * so transposed or sliced operands are read in place. C is m x p with unit column stride.
+ *
+ * Blocks of A and B are packed into contiguous panels sized for the caches, and the
+ * output is computed by register-blocked micro-kernels. Rows of C are split across the
+ * thread pool when the product is large enough.
+ *
+ * @param m Rows of A / C.
+ * @param n Columns of A / rows of B.
+ * @param p Columns of B / C.
+ * @param a Pointer to the first element of A.
+ * @param a_row_stride Distance between the rows of A.
+ * @param a_col_stride Distance between the columns of A.
+ * @param b Pointer to the first element of B.
+ * @param b_row_stride Distance between the rows of B.
+ * @param b_col_stride Distance between the columns of B.
+ * @param c Pointer to the first element of C, which is overwritten.
+ * @param c_row_stride Distance between the rows of C.
+ */
+void gemm(size_t m, size_t n, size_t p,
+          const float* a, size_t a_row_stride, size_t a_col_stride,
+          const float* b, size_t b_row_stride, size_t b_col_stride,
+          float* c, size_t c_row_stride);
+
+}  // namespace cpu
+}  // namespace minima
+
+#endif  // MINIMA_CPU_GEMM_H
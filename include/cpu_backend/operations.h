@@ -14,6 +14,14 @@ namespace cpu {
  */
 void fill(AlignedBuffer *out, const ScalarT &value);
 
+/**
+ * @brief Copy the elements of a buffer into a buffer of another dtype, rounding to nearest even.
+ *
+ * @param a The buffer to convert.
+ * @param out The buffer to store the converted elements, of the same size as `a`.
+ */
+void cast(const AlignedBuffer& a, AlignedBuffer* out);
+
 /**
  * @brief Compact a given buffer with a specific shape and stride, with an
  * offset.
@@ -69,6 +77,31 @@ void ewise_add(const AlignedBuffer &a, const AlignedBuffer &b,
  */
 void scalar_add(const AlignedBuffer &a, ScalarT val, AlignedBuffer *out);
 
+/**
+ * @brief Element-wise subtraction of two buffers.
+ * @param a First input buffer.
+ * @param b Second input buffer, subtracted from a.
+ * @param out Output buffer where results are written.
+ */
+void ewise_sub(const AlignedBuffer &a, const AlignedBuffer &b,
+               AlignedBuffer *out);
+
+/**
+ * @brief Subtracts a scalar value from each element of a buffer.
+ * @param a Input buffer.
+ * @param val Scalar value to subtract.
+ * @param out Output buffer where results are written.
+ */
+void scalar_sub(const AlignedBuffer &a, ScalarT val, AlignedBuffer *out);
+
+/**
+ * @brief Subtracts each element of a buffer from a scalar value.
+ * @param a Input buffer.
+ * @param val Scalar value to subtract from.
+ * @param out Output buffer where results are written.
+ */
+void scalar_rsub(const AlignedBuffer &a, ScalarT val, AlignedBuffer *out);
+
 
 
 /**
@@ -184,7 +217,53 @@ void scalar_ge(const AlignedBuffer& a, ScalarT val, AlignedBuffer* out);
 
 
 /**
- * @brief Multiplies two matrices using a naive three-loop algorithm.
+ * @name Strided element-wise operations
+ * @brief Element-wise operations over two strided operands, written to a compact output.
+ *
+ * The operands are read through their own strides and offsets, and a zero stride broadcasts an
+ * operand along that dimension, so broadcast or sliced operands are never compacted first.
+ * @param a First input buffer.
+ * @param b Second input buffer.
+ * @param out Compact output buffer of `shape`.
+ * @param shape Shape of the output, which both operands are broadcast to.
+ * @param a_strides Strides of a, zero along broadcast dimensions.
+ * @param a_offset Offset of a.
+ * @param b_strides Strides of b, zero along broadcast dimensions.
+ * @param b_offset Offset of b.
+ */
+///@{
+void ewise_add_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+void ewise_sub_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+void ewise_mul_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+void ewise_div_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+void ewise_maximum_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+void ewise_eq_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+void ewise_ge_strided(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                         const std::vector<uint32_t>& shape,
+                         const std::vector<uint32_t>& a_strides, size_t a_offset,
+                         const std::vector<uint32_t>& b_strides, size_t b_offset);
+///@}
+
+/**
+ * @brief Multiplies two compact matrices with the packed `gemm` kernel.
  * @param a First input matrix.
  * @param b Second input matrix.
  * @param out Output matrix where results are written.
@@ -196,26 +275,27 @@ void matmul(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
             uint32_t m, uint32_t n, uint32_t p);
 
 /**
- * @brief Multiplies together two TILE x TILE matrices and adds the result to
- * out.
- * @param a First input matrix.
- * @param b Second input matrix.
- * @param out Output matrix where results are written.
- */
-void aligned_dot(const float *__restrict__ a, const float *__restrict__ b,
-                 float *__restrict__ out);
-
-/**
- * @brief Performs matrix multiplication on tiled representations of array.
- * @param a First input matrix.
- * @param b Second input matrix.
- * @param out Output matrix where results are written.
+ * @brief Multiplies two stacks of strided matrices, broadcasting over the batch dimensions.
+ *
+ * Each operand is addressed through one stride per batch dimension, zero where it is broadcast,
+ * followed by its row and column strides, so neither operand needs to be compacted.
+ * @param a First input stack.
+ * @param b Second input stack.
+ * @param out Compact output of shape batch_shape + (m, p).
+ * @param batch_shape Broadcast shape of the batch dimensions.
+ * @param a_strides Strides of a, batch dimensions first.
+ * @param a_offset Offset of a.
+ * @param b_strides Strides of b, batch dimensions first.
+ * @param b_offset Offset of b.
  * @param m Rows of a / out.
  * @param n Columns of a / rows of b.
  * @param p Columns of b / out.
  */
-void matmul_tiled(const AlignedBuffer &a, const AlignedBuffer &b,
-                  AlignedBuffer *out, uint32_t m, uint32_t n, uint32_t p);
+void matmul_batched(const AlignedBuffer &a, const AlignedBuffer &b, AlignedBuffer *out,
+                    const std::vector<uint32_t>& batch_shape,
+                    const std::vector<uint32_t>& a_strides, size_t a_offset,
+                    const std::vector<uint32_t>& b_strides, size_t b_offset,
+                    uint32_t m, uint32_t n, uint32_t p);
 
 /**
  * @brief Reduces an array to a single maximum value.
@@ -233,6 +313,70 @@ void reduce_max(const AlignedBuffer &a, AlignedBuffer *out, size_t reduce_size);
  */
 void reduce_sum(const AlignedBuffer &a, AlignedBuffer *out, size_t reduce_size);
 
+/**
+ * @brief Sums a strided view over its last `reduce_ndim` dimensions.
+ *
+ * The view is read in place, so reductions over any set of axes only need the reduced axes to be
+ * permuted to the end, not compacted.
+ * @param a Input buffer.
+ * @param out Compact output over the leading `shape.size() - reduce_ndim` dimensions.
+ * @param shape Shape of the view.
+ * @param strides Strides of the view.
+ * @param offset Offset of the view.
+ * @param reduce_ndim Number of trailing dimensions to reduce.
+ */
+void reduce_sum_strided(const AlignedBuffer &a, AlignedBuffer *out, const std::vector<uint32_t>& shape,
+                        const std::vector<uint32_t>& strides, size_t offset, size_t reduce_ndim);
+
+/**
+ * @brief Maximum of a strided view over its last `reduce_ndim` dimensions, see `reduce_sum_strided`.
+ */
+void reduce_max_strided(const AlignedBuffer &a, AlignedBuffer *out, const std::vector<uint32_t>& shape,
+                        const std::vector<uint32_t>& strides, size_t offset, size_t reduce_ndim);
+
+/**
+ * @brief Mean and population variance of a strided view over its last `reduce_ndim` dimensions,
+ * computed together in a single pass.
+ * @param a Input buffer.
+ * @param mean Compact output of the means.
+ * @param var Compact output of the variances.
+ * @param shape Shape of the view.
+ * @param strides Strides of the view.
+ * @param offset Offset of the view.
+ * @param reduce_ndim Number of trailing dimensions to reduce.
+ */
+void reduce_mean_var_strided(const AlignedBuffer &a, AlignedBuffer *mean, AlignedBuffer *var,
+                             const std::vector<uint32_t>& shape, const std::vector<uint32_t>& strides,
+                             size_t offset, size_t reduce_ndim);
+
+/**
+ * @brief Cross-entropy of rows of logits against class indices, `logsumexp(z_i) - z_i[t_i]`.
+ *
+ * The log-softmax is never materialized: each row is reduced to its log-sum-exp, shifted by its
+ * maximum, so the extra memory is one value per row.
+ * @param logits The batch x classes logits.
+ * @param target The class index of each row, stored as floats.
+ * @param loss The loss of each row.
+ * @param lse The log-sum-exp of each row, for `log_softmax_nll_backward`.
+ * @param batch Number of rows.
+ * @param classes Number of classes.
+ */
+void log_softmax_nll(const AlignedBuffer &logits, const AlignedBuffer &target, AlignedBuffer *loss,
+                     AlignedBuffer *lse, size_t batch, size_t classes);
+
+/**
+ * @brief Gradient of `log_softmax_nll` with respect to the logits, `g_i * (softmax(z_i) - onehot(t_i))`.
+ * @param logits The batch x classes logits.
+ * @param target The class index of each row, stored as floats.
+ * @param lse The log-sum-exp of each row computed by `log_softmax_nll`.
+ * @param grad_loss The gradient of each row's loss.
+ * @param out The batch x classes gradient.
+ * @param batch Number of rows.
+ * @param classes Number of classes.
+ */
+void log_softmax_nll_backward(const AlignedBuffer &logits, const AlignedBuffer &target, const AlignedBuffer &lse,
+                              const AlignedBuffer &grad_loss, AlignedBuffer *out, size_t batch, size_t classes);
+
 } // namespace cpu
 } // namespace minima
 
@@ -0,0 +1,134 @@
+#ifndef MINIMA_CPU_THREAD_POOL_H
+#define MINIMA_CPU_THREAD_POOL_H
+
+#include <condition_variable>
+#include <cstddef>
+#include <functional>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace minima {
+namespace cpu {
+
+/**
+ * @class ThreadPool
+ * @brief A fork-join pool of persistent worker threads.
+ *
+ * The thread that calls `run` takes the first chunk of the work itself, so a pool of
+ * `num_threads` threads only starts `num_threads - 1` workers.
+ */
+class ThreadPool {
+ public:
+
+  /**
+   * @brief Construct a ThreadPool.
+   *
+   * @param num_threads The number of threads working on each call to `run`, including the caller.
+   */
+  explicit ThreadPool(size_t num_threads);
+
+  /**
+   * @brief Destructor for the ThreadPool.
+   *
+   * This destructor stops and joins the worker threads.
+   */
+  ~ThreadPool();
+
+  /**
+   * @brief Get the number of threads working on each call to `run`, including the caller.
+   */
+  size_t size() const;
+
+  /**
+   * @brief Split [0, n) into one contiguous chunk per thread and call `fn(begin, end)` on each.
+   *
+   * Returns once every chunk has been processed.
+   *
+   * @param n The size of the range.
+   * @param fn The function to call on each chunk.
+   */
+  void run(size_t n, const std::function<void(size_t, size_t)>& fn);
+
+ private:
+  void WorkerLoop(size_t index);
+  void RunChunk(size_t index);
+
+  std::vector<std::thread> workers_;
+  std::mutex mutex_;
+  std::condition_variable start_;
+  std::condition_variable done_;
+
+  /// @brief The work of the current call to `run`.
+  const std::function<void(size_t, size_t)>* task_ = nullptr;
+  size_t n_ = 0;
+
+  /// @brief Incremented by every call to `run`, so that workers pick up each task exactly once.
+  size_t generation_ = 0;
+  size_t pending_ = 0;
+  bool stop_ = false;
+};
+
+/**
+ * @brief Set the number of threads used by the kernels.
+ *
+ * Defaults to the `MINIMA_NUM_THREADS` environment variable, or to the number of hardware threads.
+ *
+ * @param num_threads The number of threads, 1 runs every kernel on the calling thread.
+ */
+void set_num_threads(size_t num_threads);
+
+/**
+ * @brief Get the number of threads used by the kernels.
+ */
+size_t get_num_threads();
+
+/**
+ * @brief Set the number of elements below which the kernels stay on the calling thread.
+ *
+ * @param threshold The number of elements.
+ */
+void set_parallel_threshold(size_t threshold);
+
+/**
+ * @brief Get the number of elements below which the kernels stay on the calling thread.
+ */
+size_t get_parallel_threshold();
+
+/**
+ * @brief Run `fn` over [0, n) on the shared pool.
+ *
+ * @param n The size of the range.
+ * @param fn The function to call on each chunk.
+ */
+void run_parallel(size_t n, const std::function<void(size_t, size_t)>& fn);
+
+/**
+ * @brief Whether the calling thread is a worker of the pool.
+ */
+bool in_parallel_region();
+
+/**
+ * @brief Call `fn(begin, end)` over chunks of [0, n), in parallel when there is enough work.
+ *
+ * Ranges smaller than `min_parallel`, single-threaded configurations and calls made from inside
+ * another parallel loop run `fn(0, n)` directly on the calling thread.
+ *
+ * @param n The size of the range.
+ * @param fn The function to call on each chunk.
+ * @param min_parallel The smallest range that is split across threads.
+ */
+template <typename F>
+void parallel_for(size_t n, F&& fn, size_t min_parallel = get_parallel_threshold()) {
+  if (n == 0) return;
+  if (n < min_parallel || get_num_threads() <= 1 || in_parallel_region()) {
+    fn(size_t{0}, n);
+    return;
+  }
+  run_parallel(n, std::function<void(size_t, size_t)>(std::forward<F>(fn)));
+}
+
+}  // namespace cpu
+}  // namespace minima
+
+#endif  // MINIMA_CPU_THREAD_POOL_H
@@ -1,10 +1,12 @@
 __version__ = "0.0.1"
 from . import autograd
-from .autograd import Tensor, cpu, all_devices
+from .autograd import Tensor, cpu, all_devices, no_grad, autocast
 from . import operators
 from .operators import *
 
 from .ndarray import *
+# `ndarray` exports its own `cpu` device, the tensors' one is autograd's
+from .autograd import cpu
 from . import nn
 from . import init
 from . import optim
@@ -41,6 +41,7 @@ d = { 'settings': { 'branch': 'main',
                                  'minima.autograd.Tensor._init': ('autograd.html#tensor._init', 'minima/autograd.py'),
                                  'minima.autograd.Tensor.accuracy': ('autograd.html#tensor.accuracy', 'minima/autograd.py'),
                                  'minima.autograd.Tensor.argmax': ('autograd.html#tensor.argmax', 'minima/autograd.py'),
+                                 'minima.autograd.Tensor.astype': ('autograd.html#tensor.astype', 'minima/autograd.py'),
                                  'minima.autograd.Tensor.backward': ('autograd.html#tensor.backward', 'minima/autograd.py'),
                                  'minima.autograd.Tensor.broadcast_to': ('autograd.html#tensor.broadcast_to', 'minima/autograd.py'),
                                  'minima.autograd.Tensor.create_detached_tensor': ( 'autograd.html#tensor.create_detached_tensor',
@@ -83,23 +84,131 @@ d = { 'settings': { 'branch': 'main',
                                  'minima.autograd.Value.item': ('autograd.html#value.item', 'minima/autograd.py'),
                                  'minima.autograd.Value.relu': ('autograd.html#value.relu', 'minima/autograd.py'),
                                  'minima.autograd.Value.tanh': ('autograd.html#value.tanh', 'minima/autograd.py'),
+                                 'minima.autograd._Freed': ('autograd.html#_freed', 'minima/autograd.py'),
+                                 'minima.autograd._Freed._raise': ('autograd.html#_freed._raise', 'minima/autograd.py'),
+                                 'minima.autograd._autocast': ('autograd.html#_autocast', 'minima/autograd.py'),
+                                 'minima.autograd._evaluate_lazy': ('autograd.html#_evaluate_lazy', 'minima/autograd.py'),
+                                 'minima.autograd._grad_reads': ('autograd.html#_grad_reads', 'minima/autograd.py'),
+                                 'minima.autograd._is_fusable': ('autograd.html#_is_fusable', 'minima/autograd.py'),
+                                 'minima.autograd._nbytes': ('autograd.html#_nbytes', 'minima/autograd.py'),
+                                 'minima.autograd._pending_postorder': ('autograd.html#_pending_postorder', 'minima/autograd.py'),
+                                 'minima.autograd._run_chain': ('autograd.html#_run_chain', 'minima/autograd.py'),
                                  'minima.autograd.all_devices': ('autograd.html#all_devices', 'minima/autograd.py'),
-                                 'minima.autograd.cpu': ('autograd.html#cpu', 'minima/autograd.py')},
+                                 'minima.autograd.autocast': ('autograd.html#autocast', 'minima/autograd.py'),
+                                 'minima.autograd.autocast.__call__': ('autograd.html#autocast.__call__', 'minima/autograd.py'),
+                                 'minima.autograd.autocast.__enter__': ('autograd.html#autocast.__enter__', 'minima/autograd.py'),
+                                 'minima.autograd.autocast.__exit__': ('autograd.html#autocast.__exit__', 'minima/autograd.py'),
+                                 'minima.autograd.autocast.__init__': ('autograd.html#autocast.__init__', 'minima/autograd.py'),
+                                 'minima.autograd.cpu': ('autograd.html#cpu', 'minima/autograd.py'),
+                                 'minima.autograd.no_grad': ('autograd.html#no_grad', 'minima/autograd.py'),
+                                 'minima.autograd.no_grad.__call__': ('autograd.html#no_grad.__call__', 'minima/autograd.py'),
+                                 'minima.autograd.no_grad.__enter__': ('autograd.html#no_grad.__enter__', 'minima/autograd.py'),
+                                 'minima.autograd.no_grad.__exit__': ('autograd.html#no_grad.__exit__', 'minima/autograd.py'),
+                                 'minima.autograd.topological_sort': ('autograd.html#topological_sort', 'minima/autograd.py')},
             'minima.data': { 'minima.data.BatchSampler': ('data.html#batchsampler', 'minima/data.py'),
                              'minima.data.BatchSampler.__init__': ('data.html#batchsampler.__init__', 'minima/data.py'),
                              'minima.data.BatchSampler.__iter__': ('data.html#batchsampler.__iter__', 'minima/data.py'),
+                             'minima.data.BatchSampler.__len__': ('data.html#batchsampler.__len__', 'minima/data.py'),
+                             'minima.data.BatchSampler._blocks': ('data.html#batchsampler._blocks', 'minima/data.py'),
+                             'minima.data.BufferPool': ('data.html#bufferpool', 'minima/data.py'),
+                             'minima.data.BufferPool.__init__': ('data.html#bufferpool.__init__', 'minima/data.py'),
+                             'minima.data.BufferPool._release': ('data.html#bufferpool._release', 'minima/data.py'),
+                             'minima.data.BufferPool.empty': ('data.html#bufferpool.empty', 'minima/data.py'),
                              'minima.data.DataLoader': ('data.html#dataloader', 'minima/data.py'),
+                             'minima.data.DataLoader.__del__': ('data.html#dataloader.__del__', 'minima/data.py'),
                              'minima.data.DataLoader.__init__': ('data.html#dataloader.__init__', 'minima/data.py'),
                              'minima.data.DataLoader.__iter__': ('data.html#dataloader.__iter__', 'minima/data.py'),
+                             'minima.data.DataLoader._fetcher': ('data.html#dataloader._fetcher', 'minima/data.py'),
+                             'minima.data.DataLoader._iter_workers': ('data.html#dataloader._iter_workers', 'minima/data.py'),
+                             'minima.data.DataLoader.close': ('data.html#dataloader.close', 'minima/data.py'),
                              'minima.data.Dataset': ('data.html#dataset', 'minima/data.py'),
                              'minima.data.Dataset.__getitem__': ('data.html#dataset.__getitem__', 'minima/data.py'),
                              'minima.data.Dataset.__init__': ('data.html#dataset.__init__', 'minima/data.py'),
                              'minima.data.Dataset.__len__': ('data.html#dataset.__len__', 'minima/data.py'),
                              'minima.data.Dataset.apply_transforms': ('data.html#dataset.apply_transforms', 'minima/data.py'),
+                             'minima.data.DistributedSampler': ('data.html#distributedsampler', 'minima/data.py'),
+                             'minima.data.DistributedSampler.__init__': ('data.html#distributedsampler.__init__', 'minima/data.py'),
+                             'minima.data.DistributedSampler.__len__': ('data.html#distributedsampler.__len__', 'minima/data.py'),
+                             'minima.data.DistributedSampler._positions': ('data.html#distributedsampler._positions', 'minima/data.py'),
+                             'minima.data.IterableDataset': ('data.html#iterabledataset', 'minima/data.py'),
+                             'minima.data.IterableDataset.__init__': ('data.html#iterabledataset.__init__', 'minima/data.py'),
+                             'minima.data.IterableDataset.__iter__': ('data.html#iterabledataset.__iter__', 'minima/data.py'),
+                             'minima.data.IterableDataset.apply_transforms': ( 'data.html#iterabledataset.apply_transforms',
+                                                                               'minima/data.py'),
+                             'minima.data.IterableDataset.samples': ('data.html#iterabledataset.samples', 'minima/data.py'),
+                             'minima.data.IterableDataset.shard': ('data.html#iterabledataset.shard', 'minima/data.py'),
+                             'minima.data.MemmapDataset': ('data.html#memmapdataset', 'minima/data.py'),
+                             'minima.data.MemmapDataset.__getitem__': ('data.html#memmapdataset.__getitem__', 'minima/data.py'),
+                             'minima.data.MemmapDataset.__getstate__': ('data.html#memmapdataset.__getstate__', 'minima/data.py'),
+                             'minima.data.MemmapDataset.__init__': ('data.html#memmapdataset.__init__', 'minima/data.py'),
+                             'minima.data.MemmapDataset.__len__': ('data.html#memmapdataset.__len__', 'minima/data.py'),
+                             'minima.data.MemmapDataset.__setstate__': ('data.html#memmapdataset.__setstate__', 'minima/data.py'),
+                             'minima.data.MemmapDataset._gather': ('data.html#memmapdataset._gather', 'minima/data.py'),
+                             'minima.data.MemmapDataset._map': ('data.html#memmapdataset._map', 'minima/data.py'),
                              'minima.data.Sampler': ('data.html#sampler', 'minima/data.py'),
                              'minima.data.Sampler.__init__': ('data.html#sampler.__init__', 'minima/data.py'),
                              'minima.data.Sampler.__iter__': ('data.html#sampler.__iter__', 'minima/data.py'),
-                             'minima.data.collate': ('data.html#collate', 'minima/data.py')},
+                             'minima.data.Sampler.__len__': ('data.html#sampler.__len__', 'minima/data.py'),
+                             'minima.data.Sampler._order': ('data.html#sampler._order', 'minima/data.py'),
+                             'minima.data.Sampler._positions': ('data.html#sampler._positions', 'minima/data.py'),
+                             'minima.data.Sampler._rng': ('data.html#sampler._rng', 'minima/data.py'),
+                             'minima.data.Sampler.blocks': ('data.html#sampler.blocks', 'minima/data.py'),
+                             'minima.data.Sampler.set_epoch': ('data.html#sampler.set_epoch', 'minima/data.py'),
+                             'minima.data.ShardedDataset': ('data.html#shardeddataset', 'minima/data.py'),
+                             'minima.data.ShardedDataset.__init__': ('data.html#shardeddataset.__init__', 'minima/data.py'),
+                             'minima.data.ShardedDataset.__iter__': ('data.html#shardeddataset.__iter__', 'minima/data.py'),
+                             'minima.data.ShardedDataset.shard': ('data.html#shardeddataset.shard', 'minima/data.py'),
+                             'minima.data.StratifiedSampler': ('data.html#stratifiedsampler', 'minima/data.py'),
+                             'minima.data.StratifiedSampler.__init__': ('data.html#stratifiedsampler.__init__', 'minima/data.py'),
+                             'minima.data.StratifiedSampler._order': ('data.html#stratifiedsampler._order', 'minima/data.py'),
+                             'minima.data.WeightedSampler': ('data.html#weightedsampler', 'minima/data.py'),
+                             'minima.data.WeightedSampler.__init__': ('data.html#weightedsampler.__init__', 'minima/data.py'),
+                             'minima.data.WeightedSampler.__len__': ('data.html#weightedsampler.__len__', 'minima/data.py'),
+                             'minima.data.WeightedSampler._order': ('data.html#weightedsampler._order', 'minima/data.py'),
+                             'minima.data._ExceptionWrapper': ('data.html#_exceptionwrapper', 'minima/data.py'),
+                             'minima.data._ExceptionWrapper.__init__': ('data.html#_exceptionwrapper.__init__', 'minima/data.py'),
+                             'minima.data._ExceptionWrapper.reraise': ('data.html#_exceptionwrapper.reraise', 'minima/data.py'),
+                             'minima.data._FeistelPermutation': ('data.html#_feistelpermutation', 'minima/data.py'),
+                             'minima.data._FeistelPermutation.__call__': ('data.html#_feistelpermutation.__call__', 'minima/data.py'),
+                             'minima.data._FeistelPermutation.__init__': ('data.html#_feistelpermutation.__init__', 'minima/data.py'),
+                             'minima.data._FeistelPermutation._encrypt': ('data.html#_feistelpermutation._encrypt', 'minima/data.py'),
+                             'minima.data._MapFetcher': ('data.html#_mapfetcher', 'minima/data.py'),
+                             'minima.data._MapFetcher.__call__': ('data.html#_mapfetcher.__call__', 'minima/data.py'),
+                             'minima.data._MapFetcher.__init__': ('data.html#_mapfetcher.__init__', 'minima/data.py'),
+                             'minima.data._SlabArray': ('data.html#_slabarray', 'minima/data.py'),
+                             'minima.data._SlabArray.__getstate__': ('data.html#_slabarray.__getstate__', 'minima/data.py'),
+                             'minima.data._SlabArray.__init__': ('data.html#_slabarray.__init__', 'minima/data.py'),
+                             'minima.data._SlabArray.__setstate__': ('data.html#_slabarray.__setstate__', 'minima/data.py'),
+                             'minima.data._SlabArray.array': ('data.html#_slabarray.array', 'minima/data.py'),
+                             'minima.data._SlabArray.view': ('data.html#_slabarray.view', 'minima/data.py'),
+                             'minima.data._StreamEnd': ('data.html#_streamend', 'minima/data.py'),
+                             'minima.data._StreamFetcher': ('data.html#_streamfetcher', 'minima/data.py'),
+                             'minima.data._StreamFetcher.__call__': ('data.html#_streamfetcher.__call__', 'minima/data.py'),
+                             'minima.data._StreamFetcher.__init__': ('data.html#_streamfetcher.__init__', 'minima/data.py'),
+                             'minima.data._StreamFetcher.batches': ('data.html#_streamfetcher.batches', 'minima/data.py'),
+                             'minima.data._WorkerPool': ('data.html#_workerpool', 'minima/data.py'),
+                             'minima.data._WorkerPool.__init__': ('data.html#_workerpool.__init__', 'minima/data.py'),
+                             'minima.data._WorkerPool._lend_slab': ('data.html#_workerpool._lend_slab', 'minima/data.py'),
+                             'minima.data._WorkerPool._receive': ('data.html#_workerpool._receive', 'minima/data.py'),
+                             'minima.data._WorkerPool.alive': ('data.html#_workerpool.alive', 'minima/data.py'),
+                             'minima.data._WorkerPool.get': ('data.html#_workerpool.get', 'minima/data.py'),
+                             'minima.data._WorkerPool.put': ('data.html#_workerpool.put', 'minima/data.py'),
+                             'minima.data._WorkerPool.shutdown': ('data.html#_workerpool.shutdown', 'minima/data.py'),
+                             'minima.data._collate': ('data.html#_collate', 'minima/data.py'),
+                             'minima.data._create_slab': ('data.html#_create_slab', 'minima/data.py'),
+                             'minima.data._lend': ('data.html#_lend', 'minima/data.py'),
+                             'minima.data._map_batch': ('data.html#_map_batch', 'minima/data.py'),
+                             'minima.data._open_slab': ('data.html#_open_slab', 'minima/data.py'),
+                             'minima.data._read_slab': ('data.html#_read_slab', 'minima/data.py'),
+                             'minima.data._shutdown_workers': ('data.html#_shutdown_workers', 'minima/data.py'),
+                             'minima.data._stack': ('data.html#_stack', 'minima/data.py'),
+                             'minima.data._stack_numbers': ('data.html#_stack_numbers', 'minima/data.py'),
+                             'minima.data._tensor_view': ('data.html#_tensor_view', 'minima/data.py'),
+                             'minima.data._worker_loop': ('data.html#_worker_loop', 'minima/data.py'),
+                             'minima.data._write_slab': ('data.html#_write_slab', 'minima/data.py'),
+                             'minima.data.buffered_shuffle': ('data.html#buffered_shuffle', 'minima/data.py'),
+                             'minima.data.collate': ('data.html#collate', 'minima/data.py'),
+                             'minima.data.get_worker_info': ('data.html#get_worker_info', 'minima/data.py')},
             'minima.init': { 'minima.init.constant': ('init.html#constant', 'minima/init.py'),
                              'minima.init.kaiming_normal': ('init.html#kaiming_normal', 'minima/init.py'),
                              'minima.init.kaiming_uniform': ('init.html#kaiming_uniform', 'minima/init.py'),
@@ -123,7 +232,6 @@ d = { 'settings': { 'branch': 'main',
                                 'minima.ndarray.BackendDevice.rand': ('ndarray.html#backenddevice.rand', 'minima/ndarray.py'),
                                 'minima.ndarray.BackendDevice.randn': ('ndarray.html#backenddevice.randn', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray': ('ndarray.html#ndarray', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.__add__': ('ndarray.html#ndarray.__add__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__eq__': ('ndarray.html#ndarray.__eq__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__ge__': ('ndarray.html#ndarray.__ge__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__getitem__': ('ndarray.html#ndarray.__getitem__', 'minima/ndarray.py'),
@@ -132,87 +240,166 @@ d = { 'settings': { 'branch': 'main',
                                 'minima.ndarray.NDArray.__le__': ('ndarray.html#ndarray.__le__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__lt__': ('ndarray.html#ndarray.__lt__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__matmul__': ('ndarray.html#ndarray.__matmul__', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.__mul__': ('ndarray.html#ndarray.__mul__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__ne__': ('ndarray.html#ndarray.__ne__', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.__neg__': ('ndarray.html#ndarray.__neg__', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.__pow__': ('ndarray.html#ndarray.__pow__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__repr__': ('ndarray.html#ndarray.__repr__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__rsub__': ('ndarray.html#ndarray.__rsub__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__setitem__': ('ndarray.html#ndarray.__setitem__', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.__str__': ('ndarray.html#ndarray.__str__', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.__sub__': ('ndarray.html#ndarray.__sub__', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.__truediv__': ('ndarray.html#ndarray.__truediv__', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray._check_target': ('ndarray.html#ndarray._check_target', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray._ewise_or_scalar': ('ndarray.html#ndarray._ewise_or_scalar', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray._init': ('ndarray.html#ndarray._init', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray._is_compact': ('ndarray.html#ndarray._is_compact', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray._output': ('ndarray.html#ndarray._output', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray._reduce_axes': ('ndarray.html#ndarray._reduce_axes', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray._reduce_view': ('ndarray.html#ndarray._reduce_view', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray._result_dtype': ('ndarray.html#ndarray._result_dtype', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray._store': ('ndarray.html#ndarray._store', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.add': ('ndarray.html#ndarray.add', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.as_strided': ('ndarray.html#ndarray.as_strided', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.astype': ('ndarray.html#ndarray.astype', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.broadcast_to': ('ndarray.html#ndarray.broadcast_to', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.compact': ('ndarray.html#ndarray.compact', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.compact_strides': ('ndarray.html#ndarray.compact_strides', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.device': ('ndarray.html#ndarray.device', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.div': ('ndarray.html#ndarray.div', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.dtype': ('ndarray.html#ndarray.dtype', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.exp': ('ndarray.html#ndarray.exp', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.fill': ('ndarray.html#ndarray.fill', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.flat': ('ndarray.html#ndarray.flat', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.iadd': ('ndarray.html#ndarray.iadd', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.idiv': ('ndarray.html#ndarray.idiv', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.imul': ('ndarray.html#ndarray.imul', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.isub': ('ndarray.html#ndarray.isub', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.log': ('ndarray.html#ndarray.log', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.log_softmax_nll': ('ndarray.html#ndarray.log_softmax_nll', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.log_softmax_nll_backward': ( 'ndarray.html#ndarray.log_softmax_nll_backward',
+                                                                                     'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.make': ('ndarray.html#ndarray.make', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.max': ('ndarray.html#ndarray.max', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.maximum': ('ndarray.html#ndarray.maximum', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.mean': ('ndarray.html#ndarray.mean', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.mean_var': ('ndarray.html#ndarray.mean_var', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.mul': ('ndarray.html#ndarray.mul', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.ndim': ('ndarray.html#ndarray.ndim', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.neg': ('ndarray.html#ndarray.neg', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.numpy': ('ndarray.html#ndarray.numpy', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.permute': ('ndarray.html#ndarray.permute', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.power': ('ndarray.html#ndarray.power', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.process_slice': ('ndarray.html#ndarray.process_slice', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.reduce': ('ndarray.html#ndarray.reduce', 'minima/ndarray.py'),
-                                'minima.ndarray.NDArray.reduce_view_out': ('ndarray.html#ndarray.reduce_view_out', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.reshape': ('ndarray.html#ndarray.reshape', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.shape': ('ndarray.html#ndarray.shape', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.size': ('ndarray.html#ndarray.size', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.strides': ('ndarray.html#ndarray.strides', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.sub': ('ndarray.html#ndarray.sub', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.sum': ('ndarray.html#ndarray.sum', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.tanh': ('ndarray.html#ndarray.tanh', 'minima/ndarray.py'),
                                 'minima.ndarray.NDArray.to': ('ndarray.html#ndarray.to', 'minima/ndarray.py'),
+                                'minima.ndarray.NDArray.var': ('ndarray.html#ndarray.var', 'minima/ndarray.py'),
+                                'minima.ndarray.broadcast_shapes': ('ndarray.html#broadcast_shapes', 'minima/ndarray.py'),
+                                'minima.ndarray.cpu': ('ndarray.html#cpu', 'minima/ndarray.py'),
                                 'minima.ndarray.cpu_numpy': ('ndarray.html#cpu_numpy', 'minima/ndarray.py'),
                                 'minima.ndarray.default_device': ('ndarray.html#default_device', 'minima/ndarray.py')},
             'minima.ndarray_backend_numpy': { 'minima.ndarray_backend_numpy.Array': ( 'ndarray_backend_numpy.html#array',
                                                                                       'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.Array.__del__': ( 'ndarray_backend_numpy.html#array.__del__',
+                                                                                              'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.Array.__init__': ( 'ndarray_backend_numpy.html#array.__init__',
                                                                                                'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.Array.__repr__': ( 'ndarray_backend_numpy.html#array.__repr__',
                                                                                                'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.Array.size': ( 'ndarray_backend_numpy.html#array.size',
                                                                                            'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._CachingAllocator': ( 'ndarray_backend_numpy.html#_cachingallocator',
+                                                                                                  'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._CachingAllocator.__init__': ( 'ndarray_backend_numpy.html#_cachingallocator.__init__',
+                                                                                                           'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._CachingAllocator.allocate': ( 'ndarray_backend_numpy.html#_cachingallocator.allocate',
+                                                                                                           'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._CachingAllocator.release': ( 'ndarray_backend_numpy.html#_cachingallocator.release',
+                                                                                                          'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._CachingAllocator.round_size': ( 'ndarray_backend_numpy.html#_cachingallocator.round_size',
+                                                                                                             'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._CachingAllocator.trim': ( 'ndarray_backend_numpy.html#_cachingallocator.trim',
+                                                                                                       'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._accumulator': ( 'ndarray_backend_numpy.html#_accumulator',
+                                                                                             'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._check_targets': ( 'ndarray_backend_numpy.html#_check_targets',
+                                                                                               'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._ewise_strided': ( 'ndarray_backend_numpy.html#_ewise_strided',
+                                                                                               'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._matmul': ( 'ndarray_backend_numpy.html#_matmul',
+                                                                                        'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy._strided': ( 'ndarray_backend_numpy.html#_strided',
+                                                                                         'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.cast': ( 'ndarray_backend_numpy.html#cast',
+                                                                                     'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.compact': ( 'ndarray_backend_numpy.html#compact',
                                                                                         'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.empty_cache': ( 'ndarray_backend_numpy.html#empty_cache',
+                                                                                            'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_add': ( 'ndarray_backend_numpy.html#ewise_add',
                                                                                           'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_add_strided': ( 'ndarray_backend_numpy.html#ewise_add_strided',
+                                                                                                  'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_div': ( 'ndarray_backend_numpy.html#ewise_div',
                                                                                           'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_div_strided': ( 'ndarray_backend_numpy.html#ewise_div_strided',
+                                                                                                  'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_eq': ( 'ndarray_backend_numpy.html#ewise_eq',
                                                                                          'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_eq_strided': ( 'ndarray_backend_numpy.html#ewise_eq_strided',
+                                                                                                 'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_exp': ( 'ndarray_backend_numpy.html#ewise_exp',
                                                                                           'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_ge': ( 'ndarray_backend_numpy.html#ewise_ge',
                                                                                          'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_ge_strided': ( 'ndarray_backend_numpy.html#ewise_ge_strided',
+                                                                                                 'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_log': ( 'ndarray_backend_numpy.html#ewise_log',
                                                                                           'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_maximum': ( 'ndarray_backend_numpy.html#ewise_maximum',
                                                                                               'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_maximum_strided': ( 'ndarray_backend_numpy.html#ewise_maximum_strided',
+                                                                                                      'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_mul': ( 'ndarray_backend_numpy.html#ewise_mul',
                                                                                           'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_mul_strided': ( 'ndarray_backend_numpy.html#ewise_mul_strided',
+                                                                                                  'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_setitem': ( 'ndarray_backend_numpy.html#ewise_setitem',
                                                                                               'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_sub': ( 'ndarray_backend_numpy.html#ewise_sub',
+                                                                                          'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.ewise_sub_strided': ( 'ndarray_backend_numpy.html#ewise_sub_strided',
+                                                                                                  'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.ewise_tanh': ( 'ndarray_backend_numpy.html#ewise_tanh',
                                                                                            'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.fill': ( 'ndarray_backend_numpy.html#fill',
                                                                                      'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.from_numpy': ( 'ndarray_backend_numpy.html#from_numpy',
                                                                                            'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.get_cache_limit': ( 'ndarray_backend_numpy.html#get_cache_limit',
+                                                                                                'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.log_softmax_nll': ( 'ndarray_backend_numpy.html#log_softmax_nll',
+                                                                                                'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.log_softmax_nll_backward': ( 'ndarray_backend_numpy.html#log_softmax_nll_backward',
+                                                                                                         'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.matmul': ( 'ndarray_backend_numpy.html#matmul',
                                                                                        'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.matmul_batched': ( 'ndarray_backend_numpy.html#matmul_batched',
+                                                                                               'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.memory_stats': ( 'ndarray_backend_numpy.html#memory_stats',
+                                                                                             'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.reduce_max': ( 'ndarray_backend_numpy.html#reduce_max',
                                                                                            'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.reduce_max_strided': ( 'ndarray_backend_numpy.html#reduce_max_strided',
+                                                                                                   'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.reduce_mean_var_strided': ( 'ndarray_backend_numpy.html#reduce_mean_var_strided',
+                                                                                                        'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.reduce_sum': ( 'ndarray_backend_numpy.html#reduce_sum',
                                                                                            'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.reduce_sum_strided': ( 'ndarray_backend_numpy.html#reduce_sum_strided',
+                                                                                                   'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.scalar_add': ( 'ndarray_backend_numpy.html#scalar_add',
                                                                                            'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.scalar_div': ( 'ndarray_backend_numpy.html#scalar_div',
@@ -227,13 +414,22 @@ d = { 'settings': { 'branch': 'main',
                                                                                            'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.scalar_power': ( 'ndarray_backend_numpy.html#scalar_power',
                                                                                              'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.scalar_rsub': ( 'ndarray_backend_numpy.html#scalar_rsub',
+                                                                                            'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.scalar_setitem': ( 'ndarray_backend_numpy.html#scalar_setitem',
                                                                                                'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.scalar_sub': ( 'ndarray_backend_numpy.html#scalar_sub',
+                                                                                           'minima/ndarray_backend_numpy.py'),
+                                              'minima.ndarray_backend_numpy.set_cache_limit': ( 'ndarray_backend_numpy.html#set_cache_limit',
+                                                                                                'minima/ndarray_backend_numpy.py'),
                                               'minima.ndarray_backend_numpy.to_numpy': ( 'ndarray_backend_numpy.html#to_numpy',
                                                                                          'minima/ndarray_backend_numpy.py')},
             'minima.nn': { 'minima.nn.BatchNorm1d': ('nn.html#batchnorm1d', 'minima/nn.py'),
                            'minima.nn.BatchNorm1d.__init__': ('nn.html#batchnorm1d.__init__', 'minima/nn.py'),
+                           'minima.nn.BatchNorm1d._fold_pending': ('nn.html#batchnorm1d._fold_pending', 'minima/nn.py'),
                            'minima.nn.BatchNorm1d.forward': ('nn.html#batchnorm1d.forward', 'minima/nn.py'),
+                           'minima.nn.BatchNorm1d.running_mean': ('nn.html#batchnorm1d.running_mean', 'minima/nn.py'),
+                           'minima.nn.BatchNorm1d.running_std': ('nn.html#batchnorm1d.running_std', 'minima/nn.py'),
                            'minima.nn.BatchNorm1d.update_stats': ('nn.html#batchnorm1d.update_stats', 'minima/nn.py'),
                            'minima.nn.CrossEntropyLoss': ('nn.html#crossentropyloss', 'minima/nn.py'),
                            'minima.nn.CrossEntropyLoss.forward': ('nn.html#crossentropyloss.forward', 'minima/nn.py'),
@@ -253,18 +449,28 @@ d = { 'settings': { 'branch': 'main',
                            'minima.nn.Linear.forward': ('nn.html#linear.forward', 'minima/nn.py'),
                            'minima.nn.Module': ('nn.html#module', 'minima/nn.py'),
                            'minima.nn.Module.__call__': ('nn.html#module.__call__', 'minima/nn.py'),
+                           'minima.nn.Module.__delattr__': ('nn.html#module.__delattr__', 'minima/nn.py'),
                            'minima.nn.Module.__init__': ('nn.html#module.__init__', 'minima/nn.py'),
                            'minima.nn.Module.__repr__': ('nn.html#module.__repr__', 'minima/nn.py'),
+                           'minima.nn.Module.__setattr__': ('nn.html#module.__setattr__', 'minima/nn.py'),
                            'minima.nn.Module._add_indent': ('nn.html#module._add_indent', 'minima/nn.py'),
                            'minima.nn.Module._children': ('nn.html#module._children', 'minima/nn.py'),
                            'minima.nn.Module._get_name': ('nn.html#module._get_name', 'minima/nn.py'),
+                           'minima.nn.Module.astype': ('nn.html#module.astype', 'minima/nn.py'),
                            'minima.nn.Module.eval': ('nn.html#module.eval', 'minima/nn.py'),
                            'minima.nn.Module.extra_repr': ('nn.html#module.extra_repr', 'minima/nn.py'),
+                           'minima.nn.Module.flatten_parameters': ('nn.html#module.flatten_parameters', 'minima/nn.py'),
                            'minima.nn.Module.parameters': ('nn.html#module.parameters', 'minima/nn.py'),
                            'minima.nn.Module.register_backward_hook': ('nn.html#module.register_backward_hook', 'minima/nn.py'),
                            'minima.nn.Module.register_forward_hook': ('nn.html#module.register_forward_hook', 'minima/nn.py'),
                            'minima.nn.Module.train': ('nn.html#module.train', 'minima/nn.py'),
                            'minima.nn.Parameter': ('nn.html#parameter', 'minima/nn.py'),
+                           'minima.nn.Parameter.data': ('nn.html#parameter.data', 'minima/nn.py'),
+                           'minima.nn.Parameter.grad': ('nn.html#parameter.grad', 'minima/nn.py'),
+                           'minima.nn.ParameterArena': ('nn.html#parameterarena', 'minima/nn.py'),
+                           'minima.nn.ParameterArena.__init__': ('nn.html#parameterarena.__init__', 'minima/nn.py'),
+                           'minima.nn.ParameterArena.__len__': ('nn.html#parameterarena.__len__', 'minima/nn.py'),
+                           'minima.nn.ParameterArena.__repr__': ('nn.html#parameterarena.__repr__', 'minima/nn.py'),
                            'minima.nn.ReLU': ('nn.html#relu', 'minima/nn.py'),
                            'minima.nn.ReLU.forward': ('nn.html#relu.forward', 'minima/nn.py'),
                            'minima.nn.Residual': ('nn.html#residual', 'minima/nn.py'),
@@ -280,11 +486,19 @@ d = { 'settings': { 'branch': 'main',
                            'minima.nn.Softmax': ('nn.html#softmax', 'minima/nn.py'),
                            'minima.nn.Softmax.forward': ('nn.html#softmax.forward', 'minima/nn.py'),
                            'minima.nn._child_modules': ('nn.html#_child_modules', 'minima/nn.py'),
+                           'minima.nn._containers': ('nn.html#_containers', 'minima/nn.py'),
+                           'minima.nn._holds_params': ('nn.html#_holds_params', 'minima/nn.py'),
                            'minima.nn._unpack_params': ('nn.html#_unpack_params', 'minima/nn.py')},
             'minima.operators': { 'minima.operators.AddScalar': ('operators.html#addscalar', 'minima/operators.py'),
                                   'minima.operators.AddScalar.__init__': ('operators.html#addscalar.__init__', 'minima/operators.py'),
                                   'minima.operators.AddScalar.compute': ('operators.html#addscalar.compute', 'minima/operators.py'),
+                                  'minima.operators.AddScalar.compute_into': ( 'operators.html#addscalar.compute_into',
+                                                                               'minima/operators.py'),
                                   'minima.operators.AddScalar.gradient': ('operators.html#addscalar.gradient', 'minima/operators.py'),
+                                  'minima.operators.AsType': ('operators.html#astype', 'minima/operators.py'),
+                                  'minima.operators.AsType.__init__': ('operators.html#astype.__init__', 'minima/operators.py'),
+                                  'minima.operators.AsType.compute': ('operators.html#astype.compute', 'minima/operators.py'),
+                                  'minima.operators.AsType.gradient': ('operators.html#astype.gradient', 'minima/operators.py'),
                                   'minima.operators.BroadcastTo': ('operators.html#broadcastto', 'minima/operators.py'),
                                   'minima.operators.BroadcastTo.__init__': ('operators.html#broadcastto.__init__', 'minima/operators.py'),
                                   'minima.operators.BroadcastTo.compute': ('operators.html#broadcastto.compute', 'minima/operators.py'),
@@ -292,19 +506,29 @@ d = { 'settings': { 'branch': 'main',
                                   'minima.operators.DivScalar': ('operators.html#divscalar', 'minima/operators.py'),
                                   'minima.operators.DivScalar.__init__': ('operators.html#divscalar.__init__', 'minima/operators.py'),
                                   'minima.operators.DivScalar.compute': ('operators.html#divscalar.compute', 'minima/operators.py'),
+                                  'minima.operators.DivScalar.compute_into': ( 'operators.html#divscalar.compute_into',
+                                                                               'minima/operators.py'),
                                   'minima.operators.DivScalar.gradient': ('operators.html#divscalar.gradient', 'minima/operators.py'),
                                   'minima.operators.EWiseAdd': ('operators.html#ewiseadd', 'minima/operators.py'),
                                   'minima.operators.EWiseAdd.compute': ('operators.html#ewiseadd.compute', 'minima/operators.py'),
+                                  'minima.operators.EWiseAdd.compute_into': ('operators.html#ewiseadd.compute_into', 'minima/operators.py'),
                                   'minima.operators.EWiseAdd.gradient': ('operators.html#ewiseadd.gradient', 'minima/operators.py'),
                                   'minima.operators.EWiseDiv': ('operators.html#ewisediv', 'minima/operators.py'),
                                   'minima.operators.EWiseDiv.compute': ('operators.html#ewisediv.compute', 'minima/operators.py'),
+                                  'minima.operators.EWiseDiv.compute_into': ('operators.html#ewisediv.compute_into', 'minima/operators.py'),
                                   'minima.operators.EWiseDiv.gradient': ('operators.html#ewisediv.gradient', 'minima/operators.py'),
                                   'minima.operators.EWiseMul': ('operators.html#ewisemul', 'minima/operators.py'),
                                   'minima.operators.EWiseMul.compute': ('operators.html#ewisemul.compute', 'minima/operators.py'),
+                                  'minima.operators.EWiseMul.compute_into': ('operators.html#ewisemul.compute_into', 'minima/operators.py'),
                                   'minima.operators.EWiseMul.gradient': ('operators.html#ewisemul.gradient', 'minima/operators.py'),
                                   'minima.operators.Exp': ('operators.html#exp', 'minima/operators.py'),
                                   'minima.operators.Exp.compute': ('operators.html#exp.compute', 'minima/operators.py'),
+                                  'minima.operators.Exp.compute_into': ('operators.html#exp.compute_into', 'minima/operators.py'),
                                   'minima.operators.Exp.gradient': ('operators.html#exp.gradient', 'minima/operators.py'),
+                                  'minima.operators.LogSoftmaxNLL': ('operators.html#logsoftmaxnll', 'minima/operators.py'),
+                                  'minima.operators.LogSoftmaxNLL.compute': ('operators.html#logsoftmaxnll.compute', 'minima/operators.py'),
+                                  'minima.operators.LogSoftmaxNLL.gradient': ( 'operators.html#logsoftmaxnll.gradient',
+                                                                               'minima/operators.py'),
                                   'minima.operators.LogSumExp': ('operators.html#logsumexp', 'minima/operators.py'),
                                   'minima.operators.LogSumExp.__init__': ('operators.html#logsumexp.__init__', 'minima/operators.py'),
                                   'minima.operators.LogSumExp.compute': ('operators.html#logsumexp.compute', 'minima/operators.py'),
@@ -315,16 +539,26 @@ d = { 'settings': { 'branch': 'main',
                                   'minima.operators.MulScalar': ('operators.html#mulscalar', 'minima/operators.py'),
                                   'minima.operators.MulScalar.__init__': ('operators.html#mulscalar.__init__', 'minima/operators.py'),
                                   'minima.operators.MulScalar.compute': ('operators.html#mulscalar.compute', 'minima/operators.py'),
+                                  'minima.operators.MulScalar.compute_into': ( 'operators.html#mulscalar.compute_into',
+                                                                               'minima/operators.py'),
                                   'minima.operators.MulScalar.gradient': ('operators.html#mulscalar.gradient', 'minima/operators.py'),
                                   'minima.operators.Negate': ('operators.html#negate', 'minima/operators.py'),
                                   'minima.operators.Negate.compute': ('operators.html#negate.compute', 'minima/operators.py'),
+                                  'minima.operators.Negate.compute_into': ('operators.html#negate.compute_into', 'minima/operators.py'),
                                   'minima.operators.Negate.gradient': ('operators.html#negate.gradient', 'minima/operators.py'),
+                                  'minima.operators.Normalize': ('operators.html#normalize', 'minima/operators.py'),
+                                  'minima.operators.Normalize.__init__': ('operators.html#normalize.__init__', 'minima/operators.py'),
+                                  'minima.operators.Normalize.compute': ('operators.html#normalize.compute', 'minima/operators.py'),
+                                  'minima.operators.Normalize.gradient': ('operators.html#normalize.gradient', 'minima/operators.py'),
                                   'minima.operators.PowerScalar': ('operators.html#powerscalar', 'minima/operators.py'),
                                   'minima.operators.PowerScalar.__init__': ('operators.html#powerscalar.__init__', 'minima/operators.py'),
                                   'minima.operators.PowerScalar.compute': ('operators.html#powerscalar.compute', 'minima/operators.py'),
+                                  'minima.operators.PowerScalar.compute_into': ( 'operators.html#powerscalar.compute_into',
+                                                                                 'minima/operators.py'),
                                   'minima.operators.PowerScalar.gradient': ('operators.html#powerscalar.gradient', 'minima/operators.py'),
                                   'minima.operators.ReLU': ('operators.html#relu', 'minima/operators.py'),
                                   'minima.operators.ReLU.compute': ('operators.html#relu.compute', 'minima/operators.py'),
+                                  'minima.operators.ReLU.compute_into': ('operators.html#relu.compute_into', 'minima/operators.py'),
                                   'minima.operators.ReLU.gradient': ('operators.html#relu.gradient', 'minima/operators.py'),
                                   'minima.operators.Reshape': ('operators.html#reshape', 'minima/operators.py'),
                                   'minima.operators.Reshape.__init__': ('operators.html#reshape.__init__', 'minima/operators.py'),
@@ -338,17 +572,25 @@ d = { 'settings': { 'branch': 'main',
                                   'minima.operators.Transpose.__init__': ('operators.html#transpose.__init__', 'minima/operators.py'),
                                   'minima.operators.Transpose.compute': ('operators.html#transpose.compute', 'minima/operators.py'),
                                   'minima.operators.Transpose.gradient': ('operators.html#transpose.gradient', 'minima/operators.py'),
+                                  'minima.operators._is_half': ('operators.html#_is_half', 'minima/operators.py'),
+                                  'minima.operators._log_softmax_nll': ('operators.html#_log_softmax_nll', 'minima/operators.py'),
+                                  'minima.operators._log_softmax_nll_backward': ( 'operators.html#_log_softmax_nll_backward',
+                                                                                  'minima/operators.py'),
+                                  'minima.operators._mean_var': ('operators.html#_mean_var', 'minima/operators.py'),
                                   'minima.operators.add': ('operators.html#add', 'minima/operators.py'),
                                   'minima.operators.add_scalar': ('operators.html#add_scalar', 'minima/operators.py'),
+                                  'minima.operators.astype': ('operators.html#astype', 'minima/operators.py'),
                                   'minima.operators.broadcast_to': ('operators.html#broadcast_to', 'minima/operators.py'),
                                   'minima.operators.divide': ('operators.html#divide', 'minima/operators.py'),
                                   'minima.operators.divide_scalar': ('operators.html#divide_scalar', 'minima/operators.py'),
                                   'minima.operators.exp': ('operators.html#exp', 'minima/operators.py'),
+                                  'minima.operators.log_softmax_nll': ('operators.html#log_softmax_nll', 'minima/operators.py'),
                                   'minima.operators.logsumexp': ('operators.html#logsumexp', 'minima/operators.py'),
                                   'minima.operators.matmul': ('operators.html#matmul', 'minima/operators.py'),
                                   'minima.operators.mul_scalar': ('operators.html#mul_scalar', 'minima/operators.py'),
                                   'minima.operators.multiply': ('operators.html#multiply', 'minima/operators.py'),
                                   'minima.operators.negate': ('operators.html#negate', 'minima/operators.py'),
+                                  'minima.operators.normalize': ('operators.html#normalize', 'minima/operators.py'),
                                   'minima.operators.power_scalar': ('operators.html#power_scalar', 'minima/operators.py'),
                                   'minima.operators.relu': ('operators.html#relu', 'minima/operators.py'),
                                   'minima.operators.reshape': ('operators.html#reshape', 'minima/operators.py'),
@@ -366,6 +608,11 @@ d = { 'settings': { 'branch': 'main',
                               'minima.optim.Adam.step': ('optim.html#adam.step', 'minima/optim.py'),
                               'minima.optim.Optimizer': ('optim.html#optimizer', 'minima/optim.py'),
                               'minima.optim.Optimizer.__init__': ('optim.html#optimizer.__init__', 'minima/optim.py'),
+                              'minima.optim.Optimizer._flat_params': ('optim.html#optimizer._flat_params', 'minima/optim.py'),
+                              'minima.optim.Optimizer._param_states': ('optim.html#optimizer._param_states', 'minima/optim.py'),
+                              'minima.optim.Optimizer._segments': ('optim.html#optimizer._segments', 'minima/optim.py'),
+                              'minima.optim.Optimizer.load_state_dict': ('optim.html#optimizer.load_state_dict', 'minima/optim.py'),
+                              'minima.optim.Optimizer.state_dict': ('optim.html#optimizer.state_dict', 'minima/optim.py'),
                               'minima.optim.Optimizer.step': ('optim.html#optimizer.step', 'minima/optim.py'),
                               'minima.optim.Optimizer.zero_grad': ('optim.html#optimizer.zero_grad', 'minima/optim.py'),
                               'minima.optim.RMSProp': ('optim.html#rmsprop', 'minima/optim.py'),
@@ -377,5 +624,16 @@ d = { 'settings': { 'branch': 'main',
                               'minima.optim.SGD.__init__': ('optim.html#sgd.__init__', 'minima/optim.py'),
                               'minima.optim.SGD._opt_step': ('optim.html#sgd._opt_step', 'minima/optim.py'),
                               'minima.optim.SGD._reg_step': ('optim.html#sgd._reg_step', 'minima/optim.py'),
-                              'minima.optim.SGD.step': ('optim.html#sgd.step', 'minima/optim.py')},
-            'minima.utility': {'minima.utility.prod': ('utility.html#prod', 'minima/utility.py')}}}
+                              'minima.optim.SGD.step': ('optim.html#sgd.step', 'minima/optim.py'),
+                              'minima.optim._FlatParams': ('optim.html#_flatparams', 'minima/optim.py'),
+                              'minima.optim._FlatParams.__init__': ('optim.html#_flatparams.__init__', 'minima/optim.py'),
+                              'minima.optim._FlatParams.param_states': ('optim.html#_flatparams.param_states', 'minima/optim.py'),
+                              'minima.optim._FlatParams.segments': ('optim.html#_flatparams.segments', 'minima/optim.py')},
+            'minima.startup': { 'minima.startup.heavy_imports': ('startup.html#heavy_imports', 'minima/startup.py'),
+                                'minima.startup.import_costs': ('startup.html#import_costs', 'minima/startup.py'),
+                                'minima.startup.main': ('startup.html#main', 'minima/startup.py'),
+                                'minima.startup.report': ('startup.html#report', 'minima/startup.py'),
+                                'minima.startup.total_ms': ('startup.html#total_ms', 'minima/startup.py')},
+            'minima.utility': { 'minima.utility.float_dtype': ('utility.html#float_dtype', 'minima/utility.py'),
+                                'minima.utility.numpy_dtype': ('utility.html#numpy_dtype', 'minima/utility.py'),
+                                'minima.utility.prod': ('utility.html#prod', 'minima/utility.py')}}}
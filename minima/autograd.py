@@ -1,8 +1,9 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/00_autograd.ipynb.
 
 # %% auto 0
-__all__ = ['NDArray', 'LAZY_MODE', 'TENSOR_COUNTER', 'Value', 'Device', 'CPUDevice', 'cpu', 'all_devices', 'Operator', 'TensorOp',
-           'Tensor']
+__all__ = ['NDArray', 'LAZY_MODE', 'TENSOR_COUNTER', 'BACKWARD_PEAK_BYTES', 'GRAD_ENABLED', 'AUTOCAST_DTYPE', 'FUSION_BLOCK_SIZE',
+           'Value', 'Device', 'CPUDevice', 'cpu', 'all_devices', 'Operator', 'TensorOp', 'topological_sort', 'no_grad',
+           'autocast', 'Tensor']
 
 # %% ../nbs/00_autograd.ipynb 3
 from typing import (
@@ -13,9 +14,11 @@ from typing import (
     Set,
 )
 
+import functools
 import numpy
 import numpy as ARRAY_API
 import minima as mi
+from .utility import float_dtype
 numpy.set_printoptions(precision=6, linewidth=160)
 # from graphviz import Digraph
 
@@ -333,6 +336,9 @@ class Value:
 NDArray = numpy.ndarray
 LAZY_MODE = False
 TENSOR_COUNTER = 0
+BACKWARD_PEAK_BYTES = 0
+GRAD_ENABLED = True
+AUTOCAST_DTYPE = None
 
 # %% ../nbs/00_autograd.ipynb 72
 class Device:
@@ -393,9 +399,27 @@ class Operator:
 class TensorOp(Operator):
     """ Op class specialized to output tensors, will be alternate subclasses for other structures """
 
+    # whether the inputs are cast to the 16-bit dtype of `autocast`, ops that need the precision of their inputs opt out
+    autocast = True
+    # whether `gradient` reads the data of the inputs, or of the output, of the node: lazy mode keeps that data
+    # instead of fusing it away when the graph is differentiated
+    grad_reads_inputs = True
+    grad_reads_output = True
+
     def __call__(self, *args):
         return Tensor.make_from_op(self, args)
 
+class _Freed(TensorOp):
+    "The op of the interior nodes released by `Tensor.backward(retain_graph=False)`, whose data can't be recomputed."
+
+    def _raise(self, *args):
+        raise RuntimeError("the data of this tensor was freed by backward(retain_graph=False), "
+                           "run the backward pass with retain_graph=True to use the intermediates of the graph after it")
+
+    compute = gradient = _raise
+
+_FREED = _Freed()
+
 # %% ../nbs/00_autograd.ipynb 75
 class Value:
     """
@@ -421,18 +445,227 @@ class Value:
         If the data of this tensor has not been computed, computes and caches it.
         Otherwise, returns the cached data.
 
+        In `LAZY_MODE` the pending subgraph is evaluated by `_evaluate_lazy`, which fuses chains of element-wise ops.
+
         Returns:
         The actual data of this tensor.
         """
 
         if self.cached_data is None:
-            self.cached_data = self.op.compute(*[child.compute_cached_data() for child in self.children])
+            if LAZY_MODE:
+                # hand the whole pending subgraph to the scheduler, which fuses element-wise chains
+                _evaluate_lazy(self)
+            else:
+                self.cached_data = self.op.compute(*[child.compute_cached_data() for child in self.children])
         return self.cached_data
     
     def is_leaf(self):
         return self.op is None
 
-# %% ../nbs/00_autograd.ipynb 76
+# %% ../nbs/00_autograd.ipynb 77
+FUSION_BLOCK_SIZE = 1 << 14
+
+def _is_fusable(node: Value) -> bool:
+    return node.cached_data is None and hasattr(node.op, 'compute_into')
+
+def _grad_reads(child: Value, consumer: Value) -> bool:
+    "Whether the backward pass reads the data of `child`, which then has to be kept rather than fused into `consumer`."
+    return (child.requires_grad and child.op.grad_reads_output) or (consumer.requires_grad and consumer.op.grad_reads_inputs)
+
+def _pending_postorder(root: Value) -> List[Value]:
+    "The nodes of the graph rooted at `root` that have no data yet, children before their consumers."
+    visited = {root}
+    order = []
+    stack = [(root, iter(root.children))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if child.cached_data is None and child not in visited:
+                visited.add(child)
+                stack.append((child, iter(child.children)))
+                break
+        else:
+            stack.pop()
+            order.append(node)
+    return order
+
+def _run_chain(chain: List[Value]) -> NDArray:
+    """
+    Evaluates a chain of element-wise nodes, innermost first, where every node consumes the one before it.
+
+    When every operand of the chain has the same shape, the chain runs block by block in a single output buffer.
+    Otherwise each op writes in place into the running buffer when it can, and allocates when it must.
+    """
+    steps = []
+    for i, node in enumerate(chain):
+        args = [child.cached_data for child in node.children]
+        if i > 0:
+            # the running value of the chain, filled in by the buffer below
+            args[list(node.children).index(chain[i - 1])] = None
+        steps.append((node.op, args))
+
+    operands = [a for _, args in steps for a in args if a is not None]
+    shape = operands[0].shape
+    if all(isinstance(a, numpy.ndarray) and a.shape == shape for a in operands) and operands[0].size > 0:
+        flat_steps = [(op, [None if a is None else a.reshape(-1) for a in args]) for op, args in steps]
+        # run the chain on the first element to get the dtype of its result
+        probe = None
+        for op, args in flat_steps:
+            probe = op.compute(*[probe if a is None else a[:1] for a in args])
+        out = numpy.empty(operands[0].size, dtype=probe.dtype)
+        for start in range(0, out.size, FUSION_BLOCK_SIZE):
+            block = slice(start, start + FUSION_BLOCK_SIZE)
+            buf = out[block]
+            for op, args in flat_steps:
+                op.compute_into(*[buf if a is None else a[block] for a in args], out=buf)
+        return out.reshape(shape)
+
+    buf = None
+    for op, args in steps:
+        args = [buf if a is None else a for a in args]
+        if buf is not None and all(getattr(a, 'shape', None) == buf.shape for a in args):
+            try:
+                op.compute_into(*args, out=buf)
+                continue
+            except TypeError:
+                # the result can't be cast to the dtype of the buffer
+                pass
+        buf = op.compute(*args)
+    return buf
+
+def _evaluate_lazy(root: Value) -> None:
+    "Computes the data of `root` and of the pending nodes it depends on, fusing chains of element-wise ops."
+    order = _pending_postorder(root)
+    consumers = {}
+    for node in order:
+        for child in node.children:
+            consumers[child] = consumers.get(child, 0) + 1
+
+    # every fusable node absorbs at most one fusable child that nothing else in the subgraph consumes
+    absorbed = {}
+    for node in order:
+        if not _is_fusable(node):
+            continue
+        for child in node.children:
+            if _is_fusable(child) and consumers[child] == 1 and not _grad_reads(child, node):
+                absorbed[child] = node
+                break
+    fused_child = {consumer: child for child, consumer in absorbed.items()}
+
+    for node in order:
+        if node in absorbed:
+            continue
+        if node in fused_child:
+            chain = [node]
+            while chain[-1] in fused_child:
+                chain.append(fused_child[chain[-1]])
+            node.cached_data = _run_chain(chain[::-1])
+        else:
+            node.cached_data = node.op.compute(*[child.cached_data for child in node.children])
+
+# %% ../nbs/00_autograd.ipynb 79
+def topological_sort(root: Value) -> List[Value]:
+    """
+    Returns all the nodes of the graph rooted at `root` in reverse topological order (`root` first).
+
+    The depth-first search keeps its own stack of child iterators instead of recursing, so the depth of the graph is not
+    bounded by Python's recursion limit.
+    """
+    visited = {root}
+    topo = []
+    stack = [(root, iter(root.children))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if child not in visited:
+                visited.add(child)
+                stack.append((child, iter(child.children)))
+                break
+        else:
+            stack.pop()
+            topo.append(node)
+    topo.reverse()
+    return topo
+
+def _nbytes(node: Value) -> int:
+    "Number of bytes of the data cached on `node`."
+    return 0 if node.cached_data is None else node.cached_data.nbytes
+
+# %% ../nbs/00_autograd.ipynb 81
+class no_grad:
+    """
+    Context manager, and decorator, that disables graph construction.
+
+    Example:
+    >>> with no_grad():
+    ...     y = model(x)
+    >>> y.requires_grad, y.children
+    (False, ())
+
+    >>> @no_grad()
+    ... def predict(x): return model(x)
+    """
+
+    def __enter__(self):
+        global GRAD_ENABLED
+        self.prev = GRAD_ENABLED
+        GRAD_ENABLED = False
+        return self
+
+    def __exit__(self, *exc):
+        global GRAD_ENABLED
+        GRAD_ENABLED = self.prev
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with no_grad():
+                return fn(*args, **kwargs)
+        return wrapper
+
+class autocast:
+    """
+    Context manager, and decorator, under which ops compute in a 16-bit float `dtype`, "float16" or
+    "bfloat16": their wider floating inputs are cast to it, unless the op sets `autocast = False`.
+    The casts are ops themselves, so gradients flow back to float32 parameters in float32.
+
+    Example:
+    >>> with autocast('bfloat16'):
+    ...     loss = loss_fn(model(x), y)
+    >>> loss.backward()
+    """
+
+    def __init__(self, dtype='float16'):
+        self.dtype = float_dtype(dtype)
+
+    def __enter__(self):
+        global AUTOCAST_DTYPE
+        self.prev = AUTOCAST_DTYPE
+        AUTOCAST_DTYPE = self.dtype
+        return self
+
+    def __exit__(self, *exc):
+        global AUTOCAST_DTYPE
+        AUTOCAST_DTYPE = self.prev
+
+    def __call__(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with autocast(self.dtype):
+                return fn(*args, **kwargs)
+        return wrapper
+
+def _autocast(value):
+    "`value` cast to `AUTOCAST_DTYPE` if it is a tensor of wider floats."
+    if not isinstance(value, Tensor):
+        return value
+    # the dtype of a pending tensor is only known once it is computed, its chain is evaluated up to here
+    dtype = value.compute_cached_data().dtype
+    if not (dtype.kind == 'f' and dtype.itemsize > 2):
+        return value
+    return mi.operators.astype(value, AUTOCAST_DTYPE)
+
+# %% ../nbs/00_autograd.ipynb 82
 class Tensor(Value):
     """
     A Tensor represents a multidimensional array of values in a computational graph.
@@ -577,7 +810,14 @@ class Tensor(Value):
         The newly created tensor.
         """
         
+        if AUTOCAST_DTYPE is not None and op.autocast:
+            children = tuple(_autocast(child) for child in children)
         tensor = Tensor.__new__(Tensor)
+        if not GRAD_ENABLED:
+            # under `no_grad` nothing is recorded, so the data has to be computed right away, lazy mode or not
+            data = op.compute(*[child.compute_cached_data() for child in children])
+            tensor._init(None, (), data=data, requires_grad=False)
+            return tensor
         tensor._init(op, children)
         if not LAZY_MODE:
             tensor.compute_cached_data()
@@ -628,6 +868,10 @@ class Tensor(Value):
     @property
     def T(self) -> 'Tensor':
         return mi.operators.transpose(self, self.shape)
+
+    def astype(self, dtype) -> 'Tensor':
+        "This tensor converted to `dtype`, differentiably."
+        return mi.operators.astype(self, dtype)
     
     def numpy(self):
         """
@@ -724,56 +968,58 @@ class Tensor(Value):
         if ARRAY_API is numpy: return cpu()
         return data.device
     
-    def backward(self, out_grad: Optional['Tensor']=None) -> None:
+    def backward(self, out_grad: Optional['Tensor']=None, retain_graph: bool=True) -> None:
         """
         computes the backward gradient for a given tensor.
 
         Args:
             output_grad: A tensor that stores the gradients for back propagation.
                 Default value is None, which initializes the tensor with ones.
-        """
-        self.grad = out_grad if out_grad is not None else Tensor(ARRAY_API.ones(self.shape))
+            retain_graph: If False, runs a memory-lean backward pass. Gradients are detached from the graph, and the
+                out-grad and cached data of every interior node are released as soon as all of its consumers are done.
+                Only the leaves (and this tensor) keep their `grad`, and the graph can't be differentiated again:
+                using the released intermediates afterwards raises a `RuntimeError`.
+
+        The peak number of bytes of data and gradients held by the graph during the pass is stored in
+        `BACKWARD_PEAK_BYTES`.
+        """
+        global BACKWARD_PEAK_BYTES
+        self.grad = out_grad if out_grad is not None else Tensor(ARRAY_API.ones(self.shape, dtype=self.dtype))
+        if not retain_graph:
+            self.grad = self.grad.detach()
         
         node_to_output_grads_list: Dict[Tensor, Tensor] = {}
         node_to_output_grads_list[self] = self.grad
 
-        def topological_sort(t) -> List['Tensor']:
-            """
-            Given a node in a computational graph, this function returns a list of all nodes in the graph sorted 
-            in topological order.
-
-            Args:
-                self: A node in a computational graph.
-
-            Returns:
-                A list of all nodes in the graph sorted in topological order.
-            """
-            
-            
-            visited = set()
-            reverse_topo_order = []
-
-            def build_topo(node):
-                visited.add(node)
-                for child in node.children:
-                    if child not in visited:
-                        build_topo(child)
-                reverse_topo_order.append(node)
-
-            build_topo(t)
-            reverse_topo_order.reverse()
-            return reverse_topo_order    
-
-        for node in topological_sort(self):
-            node.grad = node_to_output_grads_list[node]
+        topo = topological_sort(self)
+        held = sum(_nbytes(node) for node in topo) + _nbytes(self.grad)
+        peak = held
+        for node in topo:
+            if node.is_leaf() or node is self or retain_graph:
+                node.grad = node_to_output_grads_list[node]
+                node_grad = node.grad
+            else:
+                node_grad = node_to_output_grads_list.pop(node)
             # compute grad of current node w.r.t. output node
             # propagate grad to inputs
-            if not node.is_leaf():
-                for in_node, grad in zip(node.children, node.op.gradient(node.grad, node)):
-                    if in_node not in node_to_output_grads_list:
-                        node_to_output_grads_list[in_node] = grad
-                    else:
-                        node_to_output_grads_list[in_node] += grad
+            if node.is_leaf():
+                continue
+            for in_node, grad in zip(node.children, node.op.gradient(node_grad, node)):
+                if in_node not in node_to_output_grads_list:
+                    node_to_output_grads_list[in_node] = grad if retain_graph else grad.detach()
+                    held += _nbytes(grad)
+                else:
+                    held -= _nbytes(node_to_output_grads_list[in_node])
+                    node_to_output_grads_list[in_node] += grad
+                    if not retain_graph:
+                        node_to_output_grads_list[in_node] = node_to_output_grads_list[in_node].detach()
+                    held += _nbytes(node_to_output_grads_list[in_node])
+                peak = max(peak, held)
+            if not retain_graph and node is not self:
+                # every consumer of `node` comes before it in the order, so neither its data nor its grad is needed anymore
+                held -= _nbytes(node) + _nbytes(node_grad)
+                node.op, node.children, node.cached_data = _FREED, (), None
+        BACKWARD_PEAK_BYTES = peak
 
     
     def __add__(self, other: Union['Tensor', int, float]) -> 'Tensor':
@@ -788,7 +1034,8 @@ class Tensor(Value):
         """
         if isinstance(other, Tensor):
             # Ensure both tensors have the same shape for addition
-            if self.shape != other.shape:
+            # (in lazy mode shapes aren't known until the graph is evaluated, which is where a mismatch surfaces)
+            if not LAZY_MODE and self.shape != other.shape:
                 raise AssertionError(f"Tensors must be of the same shape for addition. Got {self.shape} and {other.shape}.")
 
             return mi.operators.EWiseAdd()(self, other)
@@ -815,7 +1062,7 @@ class Tensor(Value):
         """
         if isinstance(other, Tensor):
             # Ensure both tensors have the same shape for subtraction
-            if self.shape != other.shape:
+            if not LAZY_MODE and self.shape != other.shape:
                 raise AssertionError(f"Tensors must be of the same shape for subtraction. Got {self.shape} and {other.shape}.")
 
             return mi.operators.EWiseAdd()(self, mi.operators.negate(other))
@@ -840,7 +1087,7 @@ class Tensor(Value):
         """
         if isinstance(other, Tensor):
             # Ensure both tensors have the same shape for multiplication
-            if self.shape != other.shape:
+            if not LAZY_MODE and self.shape != other.shape:
                 raise AssertionError(f"Tensors must be of the same shape for multiplication. Got {self.shape} and {other.shape}.")
 
             return mi.operators.EWiseMul()(self, other)
@@ -872,7 +1119,7 @@ class Tensor(Value):
         """
         if isinstance(other, Tensor):
             # Ensure both tensors have the same shape for addition
-            if self.shape != other.shape:
+            if not LAZY_MODE and self.shape != other.shape:
                 raise AssertionError(f"Tensors must be of the same shape for addition. Got {self.shape} and {other.shape}.")
 
             return mi.operators.EWiseDiv()(self, other)
@@ -1,7 +1,9 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/05_data.ipynb.
 
 # %% auto 0
-__all__ = ['Sampler', 'BatchSampler', 'Dataset', 'collate', 'DataLoader']
+__all__ = ['WorkerInfo', 'Sampler', 'BatchSampler', 'DistributedSampler', 'WeightedSampler', 'StratifiedSampler', 'Dataset',
+           'IterableDataset', 'ShardedDataset', 'buffered_shuffle', 'get_worker_info', 'BufferPool', 'collate',
+           'DataLoader', 'MemmapDataset']
 
 # %% ../nbs/05_data.ipynb 2
 from typing import (
@@ -13,11 +15,61 @@ from typing import (
 )
 import minima as mi
 from . import Tensor
+from .ndarray import NDArray
 from . import init
-import fastcore.all as fc
+import collections
+import ctypes
+import itertools
+import mmap
+import multiprocessing as mp
+import numpy as np
+import os
+import queue
 import random
+import tempfile
+import time
+import traceback
+import weakref
+from collections import namedtuple
 
 # %% ../nbs/05_data.ipynb 3
+# indices of an epoch are drawn this many at a time, and shuffled datasets up to this size get an exact permutation
+_SAMPLER_BLOCK = 1 << 16
+
+class _FeistelPermutation:
+    """
+    A pseudo-random permutation of `range(n)`, computed for any positions without materializing the rest.
+
+    An unbalanced Feistel network over the bits of `n - 1` is a bijection of a range less than twice as
+    large, and positions it maps past `n` are mapped again until they fall in range, which keeps it a
+    bijection of `range(n)`.
+    """
+    ROUNDS = 4
+
+    def __init__(self, n: int, rng: np.random.Generator):
+        bits = max((n - 1).bit_length(), 2)
+        self.n = n
+        self.widths = (bits // 2, bits - bits // 2)
+        self.keys = rng.integers(0, 2 ** 63, self.ROUNDS, dtype=np.uint64)
+
+    def _encrypt(self, x: np.ndarray) -> np.ndarray:
+        left_bits, right_bits = self.widths
+        left, right = x >> np.uint64(right_bits), x & np.uint64((1 << right_bits) - 1)
+        for key in self.keys:
+            mixed = ((right ^ key) * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32)
+            left, right = right, left ^ (mixed & np.uint64((1 << left_bits) - 1))
+            left_bits, right_bits = right_bits, left_bits
+        return (left << np.uint64(right_bits)) | right
+
+    def __call__(self, positions: np.ndarray) -> np.ndarray:
+        x = self._encrypt(positions.astype(np.uint64))
+        out = np.flatnonzero(x >= self.n)
+        while len(out):
+            walked = self._encrypt(x[out])
+            x[out] = walked
+            out = out[walked >= self.n]
+        return x.astype(np.int64)
+
 class Sampler:
     """
     A custom sampler class.
@@ -25,20 +77,66 @@ class Sampler:
     Args:
         ds (Iterable[int]): Iterable of indices.
         shuffle (bool): Whether to shuffle the indices.
+        seed (int): Seed of the shuffle, combined with the epoch set by `set_epoch`. By default each
+            epoch draws its seed from `random`.
+        block_size (int): Number of indices of the arrays yielded by `blocks`.
+
+    The indices of an epoch are drawn as int64 arrays by `blocks`, iterating the sampler yields them as
+    ints. A dataset larger than `block_size` is shuffled with a pseudo-random permutation computed block
+    by block, so that an epoch never holds more than a block of indices.
 
     Example:
         >>> x = range(10)
         >>> sampler = Sampler(x, shuffle=True)
     """
 
-    def __init__(self, ds: Iterable[int], shuffle: bool = False):
+    def __init__(self, ds: Iterable[int], shuffle: bool = False, seed: Optional[int] = None,
+                 block_size: int = _SAMPLER_BLOCK):
         self.n = len(ds)
         self.shuffle = shuffle
+        self.seed = seed
+        self.block_size = block_size
+        self.epoch = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def set_epoch(self, epoch: int):
+        """Set the epoch the shuffle of a seeded sampler is drawn for."""
+        self.epoch = epoch
+
+    def _rng(self) -> np.random.Generator:
+        if self.seed is None:
+            return np.random.default_rng(random.getrandbits(64))
+        return np.random.default_rng((self.seed, self.epoch))
+
+    def _order(self, rng: np.random.Generator) -> Callable[[np.ndarray], np.ndarray]:
+        """The dataset index at each position of the epoch."""
+        if not self.shuffle:
+            return lambda positions: positions
+        if self.n <= self.block_size:
+            return rng.permutation(self.n).take
+        return _FeistelPermutation(self.n, rng)
+
+    def _positions(self) -> Iterator[np.ndarray]:
+        for start in range(0, len(self), self.block_size):
+            yield np.arange(start, min(start + self.block_size, len(self)), dtype=np.int64)
+
+    def blocks(self) -> Iterator[np.ndarray]:
+        """
+        Get the indices of an epoch, as int64 arrays of `block_size` indices.
+
+        Example:
+            >>> [b.tolist() for b in Sampler(range(5), block_size=2).blocks()]
+            [[0, 1], [2, 3], [4]]
+        """
+        order = self._order(self._rng())
+        for positions in self._positions():
+            yield order(positions)
 
     def __iter__(self) -> Iterator[int]:
-        res = list(range(self.n))
-        if self.shuffle: random.shuffle(res)
-        return iter(res)
+        for block in self.blocks():
+            yield from block.tolist()
 
 # %% ../nbs/05_data.ipynb 4
 class BatchSampler:
@@ -50,6 +148,9 @@ class BatchSampler:
         bs (int): Batch size.
         drop_last (bool): Whether to drop the last batch if it is smaller than the batch size.
 
+    The batches are contiguous int64 arrays, cut from the blocks of indices of the sampler, or from its
+    indices if it only yields ints.
+
     Example:
         >>> x = range(10)
         >>> sampler = Sampler(x, shuffle=True)
@@ -61,11 +162,145 @@ class BatchSampler:
         self.bs = bs
         self.drop_last = drop_last
 
-    def __iter__(self):
-        yield from fc.chunked(iter(self.sampler), self.bs, drop_last=self.drop_last)
+    def __len__(self) -> int:
+        return len(self.sampler) // self.bs if self.drop_last else -(-len(self.sampler) // self.bs)
+
+    def _blocks(self) -> Iterator[np.ndarray]:
+        if hasattr(self.sampler, 'blocks'):
+            yield from self.sampler.blocks()
+            return
+        indices = iter(self.sampler)
+        while True:
+            block = np.fromiter(itertools.islice(indices, _SAMPLER_BLOCK), np.int64)
+            if not len(block):
+                return
+            yield block
 
+    def __iter__(self) -> Iterator[np.ndarray]:
+        rest = None
+        for block in self._blocks():
+            if rest is not None:
+                block = np.concatenate((rest, block))
+            end = len(block) - len(block) % self.bs
+            for start in range(0, end, self.bs):
+                yield block[start:start + self.bs]
+            rest = block[end:] if end < len(block) else None
+        if rest is not None and not self.drop_last:
+            yield rest
 
 # %% ../nbs/05_data.ipynb 5
+class DistributedSampler(Sampler):
+    """
+    A sampler of the share of one process of a distributed run.
+
+    Every process draws the same order of the dataset from `seed` and the epoch set by `set_epoch`, and
+    takes every `num_replicas`-th index from the `rank`-th. The order is padded with its first indices to
+    give each process as many, or cut to a multiple of `num_replicas` with `drop_last`.
+
+    Args:
+        ds (Iterable[int]): Iterable of indices.
+        num_replicas (int): Number of processes.
+        rank (int): Rank of this process.
+        shuffle (bool): Whether to shuffle the indices.
+        seed (int): Seed of the shuffle, the same in every process.
+        drop_last (bool): Whether to drop the indices past a multiple of `num_replicas`, rather than padding.
+        block_size (int): Number of indices of the arrays yielded by `blocks`.
+
+    Example:
+        >>> sampler = DistributedSampler(dataset, num_replicas=4, rank=0, seed=0)
+        >>> sampler.set_epoch(epoch)
+    """
+
+    def __init__(self, ds: Iterable[int], num_replicas: int, rank: int, shuffle: bool = True, seed: int = 0,
+                 drop_last: bool = False, block_size: int = _SAMPLER_BLOCK):
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f"rank must be in [0, {num_replicas}), got {rank}")
+        super().__init__(ds, shuffle, seed, block_size)
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.drop_last = drop_last
+
+    def __len__(self) -> int:
+        return self.n // self.num_replicas if self.drop_last else -(-self.n // self.num_replicas)
+
+    def _positions(self) -> Iterator[np.ndarray]:
+        for positions in super()._positions():
+            yield (positions * self.num_replicas + self.rank) % self.n
+
+class WeightedSampler(Sampler):
+    """
+    A sampler drawing the indices with probabilities proportional to `weights`.
+
+    Args:
+        weights (Iterable[float]): The weight of each index.
+        num_samples (int): Number of indices drawn per epoch, the number of weights by default.
+        replacement (bool): Whether an index can be drawn more than once.
+        seed (int): Seed of the draws, combined with the epoch set by `set_epoch`.
+        block_size (int): Number of indices of the arrays yielded by `blocks`.
+
+    Example:
+        >>> sampler = WeightedSampler(1 / np.bincount(labels)[labels], num_samples=len(labels))
+    """
+
+    def __init__(self, weights: Iterable[float], num_samples: Optional[int] = None, replacement: bool = True,
+                 seed: Optional[int] = None, block_size: int = _SAMPLER_BLOCK):
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim != 1 or (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError("weights must be a 1-d array of non-negative numbers, not all zero")
+        super().__init__(weights, True, seed, block_size)
+        self.weights = weights
+        self.num_samples = num_samples if num_samples is not None else len(weights)
+        self.replacement = replacement
+        if not replacement and self.num_samples > np.count_nonzero(weights):
+            raise ValueError(f"can't draw {self.num_samples} indices without replacement from "
+                             f"{np.count_nonzero(weights)} non-zero weights")
+
+    def __len__(self) -> int:
+        return self.num_samples
+
+    def _order(self, rng: np.random.Generator) -> Callable[[np.ndarray], np.ndarray]:
+        if not self.replacement:
+            # the smallest exponential keys scaled by the weights are a draw without replacement
+            with np.errstate(divide='ignore'):
+                keys = rng.exponential(size=self.n) / self.weights
+            return np.argsort(keys, kind='stable')[:self.num_samples].take
+        cumulative = np.cumsum(self.weights)
+        return lambda positions: np.searchsorted(cumulative, rng.random(len(positions)) * cumulative[-1],
+                                                 side='right').astype(np.int64)
+
+class StratifiedSampler(Sampler):
+    """
+    A sampler spreading each class evenly over the epoch, so that any run of indices, a batch for
+    instance, holds the classes in about the proportions of the dataset.
+
+    The indices of a class are shuffled and placed at regular intervals of the epoch, starting from a
+    random offset.
+
+    Args:
+        labels (Iterable[int]): The class of each index.
+        seed (int): Seed of the shuffle, combined with the epoch set by `set_epoch`.
+        block_size (int): Number of indices of the arrays yielded by `blocks`.
+
+    Example:
+        >>> batch_sampler = BatchSampler(StratifiedSampler(labels), bs=64)
+    """
+
+    def __init__(self, labels: Iterable[int], seed: Optional[int] = None, block_size: int = _SAMPLER_BLOCK):
+        labels = np.asarray(labels)
+        super().__init__(labels, True, seed, block_size)
+        self.labels = labels
+
+    def _order(self, rng: np.random.Generator) -> Callable[[np.ndarray], np.ndarray]:
+        _, classes, counts = np.unique(self.labels, return_inverse=True, return_counts=True)
+        # rank of each index in a shuffle of its class
+        shuffled = rng.permutation(self.n)
+        by_class = shuffled[np.argsort(classes[shuffled], kind='stable')]
+        rank = np.empty(self.n, np.int64)
+        rank[by_class] = np.arange(self.n) - np.repeat(np.cumsum(counts) - counts, counts)
+        keys = (rank + rng.random(len(counts))[classes]) / counts[classes]
+        return np.argsort(keys, kind='stable').take
+
+# %% ../nbs/05_data.ipynb 8
 class Dataset():
     r"""An abstract class representing a :class:`Dataset`.
 
@@ -115,21 +350,568 @@ class Dataset():
                 x = tfms(x)
         return x
 
-# %% ../nbs/05_data.ipynb 6
-def collate(b):
-    xs,ys = zip(*b)
-    return torch.stack(xs),torch.stack(ys)
+# %% ../nbs/05_data.ipynb 9
+class IterableDataset():
+    r"""An abstract class representing a stream of samples, for sources that can't be indexed such as log
+    files or a sequence of record shards.
+
+    All subclasses should overwrite `__iter__`, yielding the samples. Those which can read a part of the
+    stream without going through the rest, a subset of their files for instance, should overwrite `shard`
+    too, which DataLoader workers call to split the stream between them.
+
+    The `transforms` are generator functions: each one takes the iterator of samples and returns the
+    iterator of its own results, so that a pipeline holds a few samples at a time whatever the size of
+    the dataset.
+    """
+
+    def __init__(self, transforms: Optional[List[Callable]] = None):
+        self.transforms = transforms
+
+    def __iter__(self) -> Iterator:
+        raise NotImplementedError
+
+    def shard(self, index: int, count: int) -> Iterator:
+        """
+        Get the samples of the shard `index` out of `count`, every `count`-th sample by default.
+
+        Example:
+            >>> list(dataset.shard(1, 3))
+            [1, 4, 7]
+        """
+        return itertools.islice(iter(self), index, None, count)
+
+    def apply_transforms(self, samples: Iterator) -> Iterator:
+        if self.transforms is not None:
+            for tfms in self.transforms:
+                samples = tfms(samples)
+        return samples
+
+    def samples(self, index: int = 0, count: int = 1) -> Iterator:
+        """The samples of a shard, through the transforms."""
+        return self.apply_transforms(self.shard(index, count))
+
+class ShardedDataset(IterableDataset):
+    """
+    A stream read from a sequence of shards, such as files, split between DataLoader workers by shard.
+
+    Args:
+        shards (list): The shards, paths for instance.
+        read (callable): Returns an iterable of the samples of a shard.
+        transforms (list): Generator functions applied in turn to the stream.
+
+    Example:
+        >>> ds = ShardedDataset(sorted(glob.glob('logs/*.txt')), open, transforms=[parse_lines])
+    """
+
+    def __init__(self, shards: List, read: Callable, transforms: Optional[List[Callable]] = None):
+        super().__init__(transforms)
+        self.shards = list(shards)
+        self.read = read
+
+    def __iter__(self) -> Iterator:
+        return self.shard(0, 1)
+
+    def shard(self, index: int, count: int) -> Iterator:
+        return itertools.chain.from_iterable(map(self.read, self.shards[index::count]))
+
+def buffered_shuffle(samples: Iterable, size: int, rng: Optional[random.Random] = None) -> Iterator:
+    """
+    Shuffle a stream through a buffer of `size` samples.
+
+    The buffer is filled with the first samples, then each sample read takes the place of a random one
+    of the buffer, which is yielded. Only `size` samples are held at a time, so the larger the buffer the
+    further a sample can move from its place in the stream.
+
+    Args:
+        samples (Iterable): The stream.
+        size (int): Number of samples of the buffer.
+        rng (random.Random): The generator drawing the samples, `random` by default.
+
+    Example:
+        >>> sorted(buffered_shuffle(range(5), 2))
+        [0, 1, 2, 3, 4]
+    """
+    if size < 1:
+        raise ValueError(f"the shuffle buffer must hold at least one sample, got {size}")
+    rng = rng if rng is not None else random
+    buffer = []
+    for sample in samples:
+        if len(buffer) < size:
+            buffer.append(sample)
+            continue
+        i = rng.randrange(size)
+        yield buffer[i]
+        buffer[i] = sample
+    rng.shuffle(buffer)
+    yield from buffer
+
+# %% ../nbs/05_data.ipynb 10
+# arrays are placed in a slab at multiples of a cache line
+_SLAB_ALIGNMENT = 64
+# slabs are files mapped by the main process and the workers, in memory where the system has a tmpfs for it
+_SLAB_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+def _create_slab(nbytes: int):
+    """Creates a slab of `nbytes` bytes, returns its path and its mapping."""
+    fd, path = tempfile.mkstemp(prefix='minima_slab_', dir=_SLAB_DIR)
+    try:
+        os.ftruncate(fd, nbytes)
+        return path, mmap.mmap(fd, nbytes)
+    finally:
+        os.close(fd)
+
+def _open_slab(path: str):
+    with open(path, 'r+b') as f:
+        return mmap.mmap(f.fileno(), 0)
+
+def _lend(buf, nbytes: int, release: Callable, *args):
+    """
+    A ctypes array over the first `nbytes` of `buf`, to build arrays on. `release(*args)` is called once it
+    and every array viewing it are garbage collected.
+    """
+    # numpy keeps a ctypes array as the base of its views, where a memoryview or an ndarray would be
+    # unwrapped to the buffer itself, which outlives the arrays
+    owner = (ctypes.c_char * nbytes).from_buffer(buf)
+    weakref.finalize(owner, release, *args)
+    return owner
+
+def _tensor_view(array) -> Tensor:
+    """A constant Tensor over `array`, without copying it."""
+    tensor = Tensor.__new__(Tensor)
+    tensor._init(None, (), data=array, requires_grad=False)
+    return tensor
+
+def _map_batch(fn, batch):
+    """Applies `fn` to the leaves of a batch made of (named) tuples, lists and dicts."""
+    if isinstance(batch, tuple) and hasattr(batch, '_fields'):
+        return type(batch)(*(_map_batch(fn, b) for b in batch))
+    if isinstance(batch, (tuple, list)):
+        return type(batch)(_map_batch(fn, b) for b in batch)
+    if isinstance(batch, dict):
+        return {k: _map_batch(fn, v) for k, v in batch.items()}
+    return fn(batch)
+
+class _SlabArray:
+    """Where an array of a batch was written in a shared-memory slab, sent in its place."""
+    __slots__ = ('offset', 'shape', 'dtype', 'tensor')
+
+    def __init__(self, offset: int, shape: tuple, dtype: str, tensor: bool):
+        self.offset, self.shape, self.dtype, self.tensor = offset, shape, dtype, tensor
+
+    def __getstate__(self):
+        return self.offset, self.shape, self.dtype, self.tensor
+
+    def __setstate__(self, state):
+        self.offset, self.shape, self.dtype, self.tensor = state
+
+    def array(self, buf) -> np.ndarray:
+        return np.ndarray(self.shape, np.dtype(self.dtype), buffer=buf, offset=self.offset)
+
+    def view(self, owner):
+        array = self.array(owner)
+        return _tensor_view(array) if self.tensor else array
+
+def _write_slab(batch, buf):
+    """
+    Copies the numeric arrays and Tensors of `batch` into `buf`, and returns the batch with `_SlabArray`s
+    in their place and the bytes it takes. The batch is None if `buf` is None or too small.
+    """
+    fields, nbytes = [], 0
+
+    def place(x):
+        nonlocal nbytes
+        array = x.numpy() if isinstance(x, Tensor) else x
+        if not isinstance(array, np.ndarray) or array.dtype.hasobject:
+            return x
+        slot = _SlabArray(nbytes, array.shape, array.dtype.str, isinstance(x, Tensor))
+        fields.append((slot, array))
+        nbytes += -(-array.nbytes // _SLAB_ALIGNMENT) * _SLAB_ALIGNMENT
+        return slot
+
+    structure = _map_batch(place, batch)
+    if buf is None or nbytes > len(buf):
+        return None, nbytes
+    for slot, array in fields:
+        np.copyto(slot.array(buf), array)
+    return structure, nbytes
+
+def _read_slab(structure, owner):
+    """The batch written by `_write_slab`, as arrays and Tensors viewing `owner`."""
+    return _map_batch(lambda x: x.view(owner) if isinstance(x, _SlabArray) else x, structure)
+
+# %% ../nbs/05_data.ipynb 11
+# how long the main process waits on the workers before checking that none of them died
+_POLL_INTERVAL = 1.0
+
+WorkerInfo = namedtuple('WorkerInfo', ['id', 'num_workers', 'seed', 'dataset'])
+WorkerInfo.__doc__ = "The worker process a dataset is being loaded in, see `get_worker_info`."
+
+_worker_info = None
+
+def get_worker_info() -> Optional[WorkerInfo]:
+    """
+    Get the `WorkerInfo` of the current DataLoader worker process.
+
+    Returns:
+        Optional[WorkerInfo]: The id, number of workers, seed and copy of the dataset of the worker,
+        or None in the main process.
+
+    Example:
+        >>> def worker_init_fn(worker_id):
+        >>>     info = get_worker_info()
+        >>>     info.dataset.open_files(info.id)
+    """
+    return _worker_info
+
+class _ExceptionWrapper:
+    """An exception raised in a worker, with its traceback formatted, to be raised again in the main process."""
+
+    def __init__(self, exc: BaseException, worker_id: int):
+        self.exc_type = type(exc)
+        self.msg = f"Caught {self.exc_type.__name__} in DataLoader worker {worker_id}:\n" + \
+                   ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+
+    def reraise(self):
+        try:
+            exc = self.exc_type(self.msg)
+        except Exception:
+            # the exception can't be built from a message alone
+            exc = RuntimeError(self.msg)
+        raise exc
+
+class _StreamEnd:
+    """Returned in place of a batch once the shard of a worker has no batch left for the epoch."""
+
+class _MapFetcher:
+    """Fetches the batch of a list of indices from a map-style dataset."""
+
+    def __init__(self, dataset, collate_fn: Optional[Callable]):
+        self.dataset = dataset
+        self.collate_fn = collate_fn
+
+    def __call__(self, batch_idxs):
+        if self.collate_fn is None:
+            return self.dataset[batch_idxs]
+        # datasets indexed one sample at a time get Python ints
+        return self.collate_fn([self.dataset[i] for i in np.asarray(batch_idxs).tolist()])
+
+class _StreamFetcher:
+    """Batches the samples of an `IterableDataset`, each worker reading its own shard of it."""
+
+    def __init__(self, dataset, collate_fn: Optional[Callable], batch_size: int, drop_last: bool, shuffle_buffer: int):
+        self.dataset = dataset
+        self.collate_fn = collate_fn if collate_fn is not None else collate
+        self.batch_size = batch_size
+        self.drop_last = drop_last
+        self.shuffle_buffer = shuffle_buffer
+        self._epoch, self._batches = None, None
+
+    def batches(self, shard: int = 0, num_shards: int = 1) -> Iterator:
+        samples = self.dataset.samples(shard, num_shards)
+        if self.shuffle_buffer:
+            samples = buffered_shuffle(samples, self.shuffle_buffer)
+        while True:
+            batch = list(itertools.islice(samples, self.batch_size))
+            if not batch or self.drop_last and len(batch) < self.batch_size:
+                return
+            yield self.collate_fn(batch)
+
+    def __call__(self, epoch: int):
+        # a worker keeps reading the same stream until the main process starts another epoch
+        if epoch != self._epoch:
+            self._epoch, self._batches = epoch, self.batches(_worker_info.id, _worker_info.num_workers)
+        return next(self._batches, _StreamEnd)
+
+def _worker_loop(fetcher, index_queue, result_queue, worker_id: int, num_workers: int, seed: int,
+                 worker_init_fn: Optional[Callable], shared_memory: bool = False):
+    """
+    Runs in a worker process: fetches the batches of the `(key, task, slab)` tasks until it gets None. A
+    task is the list of indices of a batch, or the epoch a batch of the worker's shard is drawn for.
+
+    With `shared_memory`, the arrays of a batch are written into the slab named by the task, and the
+    batch is put on the result queue with `_SlabArray`s in their place, along with the bytes it
+    needs. If the task has no slab or it is too small, the batch is pickled as it is.
+    """
+    global _worker_info
+    slabs = {}
+    random.seed(seed)
+    np.random.seed(seed % 2 ** 32)
+    _worker_info = WorkerInfo(worker_id, num_workers, seed, fetcher.dataset)
+    try:
+        if worker_init_fn is not None:
+            worker_init_fn(worker_id)
+        while True:
+            task = index_queue.get()
+            if task is None:
+                break
+            key, task, slab = task
+            try:
+                data = fetcher(task)
+            except Exception as e:
+                result_queue.put((key, _ExceptionWrapper(e, worker_id), None))
+                continue
+            if not shared_memory or data is _StreamEnd:
+                result_queue.put((key, data, None))
+                continue
+            if slab is not None and slab not in slabs:
+                slabs[slab] = _open_slab(slab)
+            structure, nbytes = _write_slab(data, slabs[slab] if slab is not None else None)
+            if structure is None:
+                result_queue.put((key, data, (nbytes, False)))
+            else:
+                result_queue.put((key, structure, (nbytes, True)))
+    except KeyboardInterrupt:
+        # the main process is the one to handle it, and will shut the workers down
+        pass
+
+def _shutdown_workers(workers, index_queues, result_queue, slabs):
+    for q in index_queues:
+        try:
+            q.put(None)
+        except (OSError, ValueError):
+            pass
+    for w in workers:
+        w.join(timeout=5)
+        if w.is_alive():
+            w.terminate()
+            w.join()
+    for q in index_queues + [result_queue]:
+        q.cancel_join_thread()
+        q.close()
+    # the mappings are not closed, batches may still view them: they are unmapped once the last one is gone
+    for path in slabs:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+    slabs.clear()
+
+class _WorkerPool:
+    """
+    The worker processes of a DataLoader, started once and reused by every epoch.
+
+    Each worker reads `(key, task, slab)` tasks from its own index queue, calls `fetcher` on the task, and
+    all of them put their `(key, batch, slab_info)` results on one result queue. The workers are shut down by
+    `shutdown`, or when the pool is garbage collected.
+
+    With `shared_memory`, batches come back through shared-memory slabs owned by the pool. A slab is
+    lent to a task, and returns to the free slabs once the arrays of the batch read from it are
+    garbage collected. Slabs are sized from the first batch unless `slab_bytes` is given, and at
+    most `max_slabs` are created: when none is free, or a batch doesn't fit, it is pickled instead.
+    """
+
+    def __init__(self, fetcher, num_workers: int, worker_init_fn: Optional[Callable] = None,
+                 multiprocessing_context=None, shared_memory: bool = False, slab_bytes: Optional[int] = None,
+                 max_slabs: int = 0):
+        ctx = mp.get_context(multiprocessing_context) if not hasattr(multiprocessing_context, 'Process') \
+            else multiprocessing_context
+        # drawn from the main process' generator, so that seeding it makes the workers reproducible
+        base_seed = random.randrange(2 ** 63)
+        self.num_workers = num_workers
+        self.shared_memory = shared_memory
+        self.slab_bytes = slab_bytes
+        self.max_slabs = max_slabs
+        self.slabs = {}
+        self._free_slabs = collections.deque()
+        self._lent_slabs = {}
+        self.result_queue = ctx.Queue()
+        self.index_queues, self.workers = [], []
+        for worker_id in range(num_workers):
+            index_queue = ctx.Queue()
+            w = ctx.Process(target=_worker_loop, daemon=True,
+                            args=(fetcher, index_queue, self.result_queue, worker_id, num_workers,
+                                  base_seed + worker_id, worker_init_fn, shared_memory))
+            w.start()
+            self.index_queues.append(index_queue)
+            self.workers.append(w)
+        self._finalizer = weakref.finalize(self, _shutdown_workers, self.workers, self.index_queues,
+                                           self.result_queue, self.slabs)
+
+    def _lend_slab(self) -> Optional[str]:
+        if not self.shared_memory or self.slab_bytes is None:
+            return None
+        if self._free_slabs:
+            return self._free_slabs.popleft()
+        if len(self.slabs) >= self.max_slabs:
+            return None
+        path, slab = _create_slab(self.slab_bytes)
+        self.slabs[path] = slab
+        return path
+
+    def put(self, worker_id: int, key, task):
+        slab = self._lend_slab()
+        if slab is not None:
+            self._lent_slabs[key] = slab
+        self.index_queues[worker_id].put((key, task, slab))
+
+    def _receive(self, key, data, slab_info):
+        slab = self._lent_slabs.pop(key, None)
+        if slab_info is None:
+            if slab is not None:
+                self._free_slabs.append(slab)
+            return data
+        nbytes, in_slab = slab_info
+        if self.slab_bytes is None:
+            # room for batches a quarter larger than the first one, in whole pages
+            self.slab_bytes = max(-(-(nbytes + nbytes // 4) // 4096) * 4096, 4096)
+        if not in_slab:
+            if slab is not None:
+                self._free_slabs.append(slab)
+            return data
+        # the slab is only lent again once every array of the batch is gone
+        return _read_slab(data, _lend(self.slabs[slab], nbytes, self._free_slabs.append, slab))
+
+    def get(self, timeout: float = 0):
+        """The next `(key, batch)` result of any worker, raises if a worker died or `timeout` seconds passed."""
+        deadline = time.monotonic() + timeout if timeout > 0 else None
+        while True:
+            wait = _POLL_INTERVAL if deadline is None else min(_POLL_INTERVAL, deadline - time.monotonic())
+            try:
+                key, data, slab_info = self.result_queue.get(timeout=max(wait, 0))
+                return key, self._receive(key, data, slab_info)
+            except queue.Empty:
+                dead = [w for w in self.workers if not w.is_alive()]
+                if dead:
+                    self.shutdown()
+                    raise RuntimeError(f"DataLoader worker (pid {dead[0].pid}) exited unexpectedly "
+                                       f"with exit code {dead[0].exitcode}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise RuntimeError(f"DataLoader timed out after {timeout} seconds waiting for a batch")
+
+    def shutdown(self):
+        self._finalizer()
+
+    @property
+    def alive(self) -> bool:
+        return self._finalizer.alive
+
+# %% ../nbs/05_data.ipynb 12
+class BufferPool:
+    """
+    A pool of output buffers for `collate`, each one used again once the batch stacked into it is garbage collected.
+
+    Args:
+        max_bytes (int): The most bytes of free buffers the pool keeps, the others are freed.
+
+    Example:
+        >>> pool = BufferPool()
+        >>> dataloader = DataLoader(dataset, batch_size, collate_fn=functools.partial(collate, pool=pool))
+    """
+
+    def __init__(self, max_bytes: int = 1 << 30):
+        self.max_bytes = max_bytes
+        self.bytes_held = 0
+        self._free = collections.defaultdict(list)
+
+    def empty(self, shape: tuple, dtype) -> np.ndarray:
+        """An uninitialized array, on a free buffer of its size if there is one."""
+        dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        free = self._free[nbytes]
+        if free:
+            buf = free.pop()
+            self.bytes_held -= nbytes
+        else:
+            buf = np.empty(nbytes, np.uint8)
+        return np.ndarray(shape, dtype, buffer=_lend(buf, nbytes, self._release, buf))
+
+    def _release(self, buf):
+        if self.bytes_held + buf.nbytes <= self.max_bytes:
+            self._free[buf.nbytes].append(buf)
+            self.bytes_held += buf.nbytes
+
+def _stack(fields, pool: Optional[BufferPool]) -> Tensor:
+    arrays = [f.numpy() if isinstance(f, (Tensor, NDArray)) else np.asarray(f) for f in fields]
+    shape = arrays[0].shape
+    for a in arrays:
+        if a.shape != shape:
+            raise ValueError(f"can't stack fields of shapes {shape} and {a.shape} into a batch")
+    dtype = np.result_type(*arrays)
+    out = pool.empty((len(arrays),) + shape, dtype) if pool is not None else np.empty((len(arrays),) + shape, dtype)
+    np.stack(arrays, out=out)
+    return _tensor_view(out)
+
+def _stack_numbers(fields, pool: Optional[BufferPool]) -> Tensor:
+    kinds = {type(f) for f in fields}
+    dtype = np.bool_ if kinds == {bool} else np.int64 if kinds <= {bool, int} else np.float32
+    out = pool.empty((len(fields),), dtype) if pool is not None else np.empty((len(fields),), dtype)
+    out[:] = fields
+    return _tensor_view(out)
+
+def _collate(samples: list, pool: Optional[BufferPool]):
+    first = samples[0]
+    if isinstance(first, (Tensor, NDArray, np.ndarray, np.generic)):
+        return _stack(samples, pool)
+    if isinstance(first, (bool, int, float)):
+        return _stack_numbers(samples, pool)
+    if isinstance(first, dict):
+        return {k: _collate([s[k] for s in samples], pool) for k in first}
+    if isinstance(first, (tuple, list)):
+        if any(len(s) != len(first) for s in samples):
+            raise ValueError(f"every sample of a batch must have {len(first)} fields")
+        fields = [_collate(list(f), pool) for f in zip(*samples)]
+        return type(first)(*fields) if hasattr(first, '_fields') else type(first)(fields)
+    return list(samples)
+
+def collate(samples: list, pool: Optional[BufferPool] = None):
+    """
+    Stacks the samples of a batch into Tensors.
+
+    The samples are (named) tuples, lists or dicts of the same structure. Their arrays and Tensors are
+    stacked along a new first axis, and their numbers into a 1-d Tensor of bool, int64 or float32. The
+    other fields, strings for instance, are gathered in lists.
+
+    Each field is copied once, into an array sized for the whole batch, which is taken from `pool` if one is given.
+
+    Args:
+        samples (list): The samples of the batch.
+        pool (BufferPool): The pool of the output arrays.
+
+    Returns:
+        The batch, with the structure of a sample.
+
+    Example:
+        >>> x, y = collate([(np.zeros(3), 0), (np.ones(3), 1)])
+        >>> x.shape, y.numpy()
+        ((2, 3), array([0, 1]))
+    """
+    if not len(samples):
+        raise ValueError("can't collate an empty batch")
+    return _collate(list(samples), pool)
 
 class DataLoader:
     """
     A custom data loader class.
 
     Args:
-        ds (Dataset): The dataset to load.
+        ds (Dataset): The dataset to load, a map-style `Dataset` or an `IterableDataset`.
         bs (int): Batch size.
+        num_workers (int): Number of worker processes loading batches, 0 loads them in the main process.
+        collate_fn (callable): Merges the list of samples of a batch, `collate` for instance. By default the dataset
+            is indexed with the whole list of indices of a batch.
+        prefetch_factor (int): Number of batches loaded in advance per worker.
+        in_order (bool): Whether batches are yielded in the order of the batch sampler, or as soon as they are loaded.
+        worker_init_fn (callable): Called with the worker id in each worker process once it is started.
+        timeout (float): Seconds to wait for a batch from the workers before raising, 0 waits forever.
+        multiprocessing_context: The multiprocessing context or start method of the workers.
+        shared_memory (bool): Whether the workers send the arrays of their batches through shared memory instead of pickling them.
+        slab_bytes (int): Size of the shared-memory slab of a batch, by default sized from the first batch.
+        shuffle_buffer (int): Number of samples an `IterableDataset` is shuffled across, when `shuffle` is set.
+
+    The workers are started on the first epoch and kept for the next ones, until `close` is called
+    or the DataLoader is garbage collected. Each worker seeds `random` and `numpy.random` with its
+    own seed, drawn from the main process' `random` generator.
+
+    With `shared_memory`, a worker copies the numpy arrays and Tensors of a batch into a slab of
+    shared memory, and the main process gets them as views of the slab, with no further copy. The
+    slab is reused once these arrays are garbage collected, so a batch kept around holds its slab.
+
+    An `IterableDataset` has no sampler: each worker reads its shard of the stream, shuffles it through
+    a buffer of `shuffle_buffer` samples and merges the samples into batches with `collate_fn`, which
+    defaults to `collate`. The workers take turns yielding batches until their shards run out.
 
     Example:
-        >>> dataloader = DataLoader(dataset, batch_size)
+        >>> dataloader = DataLoader(dataset, batch_size, num_workers=4)
     """
 
     def __init__(self,
@@ -140,16 +922,43 @@ class DataLoader:
                  batch_sampler: BatchSampler = None,
                  num_workers: int = 0,
                  collate_fn: callable = None,
-                 drop_last: bool = False):
+                 drop_last: bool = False,
+                 prefetch_factor: int = 2,
+                 in_order: bool = True,
+                 worker_init_fn: Optional[Callable] = None,
+                 timeout: float = 0,
+                 multiprocessing_context=None,
+                 shared_memory: bool = False,
+                 slab_bytes: Optional[int] = None,
+                 shuffle_buffer: int = 1024):
 
+        if num_workers < 0:
+            raise ValueError(f"num_workers must be non-negative, got {num_workers}")
+        if prefetch_factor < 1:
+            raise ValueError(f"prefetch_factor must be at least 1, got {prefetch_factor}")
         self.dataset = dataset
         self.batch_size = batch_size
         self.shuffle = shuffle
-        self.sampler = sampler if sampler else Sampler(dataset, shuffle)
-        self.batch_sampler = batch_sampler if batch_sampler else BatchSampler(self.sampler, batch_size, drop_last)
-        self.num_workers = num_workers # --> TODO: implement a multiprocessing DataLoader :3
-        self.collate_fn = collate
+        if isinstance(dataset, IterableDataset):
+            if sampler is not None or batch_sampler is not None:
+                raise ValueError("an IterableDataset is streamed, it takes no sampler nor batch_sampler")
+            self.sampler = self.batch_sampler = None
+        else:
+            self.sampler = sampler if sampler else Sampler(dataset, shuffle)
+            self.batch_sampler = batch_sampler if batch_sampler else BatchSampler(self.sampler, batch_size, drop_last)
+        self.num_workers = num_workers
+        self.collate_fn = collate_fn
         self.drop_last = drop_last
+        self.prefetch_factor = prefetch_factor
+        self.in_order = in_order
+        self.worker_init_fn = worker_init_fn
+        self.timeout = timeout
+        self.multiprocessing_context = multiprocessing_context
+        self.shared_memory = shared_memory
+        self.slab_bytes = slab_bytes
+        self.shuffle_buffer = shuffle_buffer
+        self._pool = None
+        self._epoch = 0
 
     def __iter__(self):
         """
@@ -163,9 +972,180 @@ class DataLoader:
             >>>     # Process the batch
         """
         if self.num_workers:
-            with mp.Pool(self.num_workers) as ex:
-                yield from ex.map(self.dataset.__getitem__,  iter(self.batch_sampler))
+            return self._iter_workers()
+        fetcher = self._fetcher()
+        if isinstance(fetcher, _StreamFetcher):
+            return fetcher.batches()
+        return (fetcher(batch_idxs) for batch_idxs in self.batch_sampler)
+
+    def _fetcher(self):
+        if isinstance(self.dataset, IterableDataset):
+            return _StreamFetcher(self.dataset, self.collate_fn, self.batch_size, self.drop_last,
+                                  self.shuffle_buffer if self.shuffle else 0)
+        return _MapFetcher(self.dataset, self.collate_fn)
+
+    def _iter_workers(self):
+        if self._pool is None or not self._pool.alive:
+            # besides the batches in flight, as many can be held by the training loop before batches are pickled again
+            self._pool = _WorkerPool(self._fetcher(), self.num_workers, self.worker_init_fn,
+                                     self.multiprocessing_context, self.shared_memory, self.slab_bytes,
+                                     2 * self.prefetch_factor * self.num_workers)
+        pool = self._pool
+        # results are tagged with their epoch, those of an epoch that was not run to the end are dropped
+        self._epoch += 1
+        epoch = self._epoch
+        # the workers whose shard of an IterableDataset is not exhausted yet
+        active = set(range(self.num_workers))
+
+        def stream_tasks():
+            while active:
+                for worker_id in range(self.num_workers):
+                    if worker_id in active:
+                        yield worker_id, epoch
+
+        if self.batch_sampler is None:
+            tasks = enumerate(stream_tasks())
+        else:
+            tasks = enumerate(zip(itertools.cycle(range(self.num_workers)), self.batch_sampler))
+
+        def submit():
+            for idx, (worker_id, task) in tasks:
+                pool.put(worker_id, (epoch, idx, worker_id), task)
+                return True
+            return False
+
+        # at most `prefetch_factor` batches per worker are loading or waiting to be yielded
+        pending = 0
+        while pending < self.prefetch_factor * self.num_workers and submit():
+            pending += 1
+        ready, next_idx = {}, 0
+        while pending:
+            if next_idx in ready:
+                data = ready.pop(next_idx)
+            else:
+                (result_epoch, idx, worker_id), data = pool.get(self.timeout)
+                if self._epoch != epoch:
+                    raise RuntimeError("a new epoch of this DataLoader was started before this one finished")
+                if result_epoch != epoch:
+                    continue
+                if data is _StreamEnd:
+                    active.discard(worker_id)
+                if self.in_order and idx != next_idx:
+                    ready[idx] = data
+                    continue
+            next_idx += 1
+            pending -= 1
+            if isinstance(data, _ExceptionWrapper):
+                data.reraise()
+            if submit():
+                pending += 1
+            if data is not _StreamEnd:
+                yield data
+
+    def close(self):
+        """Shut the worker processes down, the next epoch starts new ones."""
+        if getattr(self, '_pool', None) is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __del__(self):
+        self.close()
+
+# %% ../nbs/05_data.ipynb 19
+# below this many indices per run of consecutive ones on average, a batch is gathered with a fancy index
+# rather than with a copy per run
+_MIN_RUN = 8
+
+class MemmapDataset(Dataset):
+    """
+    A dataset of arrays stored in files, mapped with `np.memmap` so that only the batches drawn are read into memory.
+
+    Each field of a sample is a row of one array: a `.npy` file, a raw file of `dtype` samples of `shape`,
+    or an array such as a `np.memmap`. The arrays must have as many rows. The files are mapped again,
+    rather than pickled, when the dataset is sent to spawned DataLoader workers.
+
+    Indexed with a list of indices, as it is by `DataLoader` without a `collate_fn`, the rows are read
+    in increasing order, with one copy per run of consecutive indices, and come back as Tensors in the
+    order of the indices.
+
+    Args:
+        *files: The `.npy` files, raw files or arrays of the fields.
+        dtype: The dtype of the raw files.
+        shape (tuple): The shape of a sample of the raw files.
+        offset (int): The bytes skipped at the start of the raw files.
+        transforms (list): Functions applied in turn to every item or batch.
+
+    Example:
+        >>> ds = MemmapDataset('features.npy', 'labels.npy')
+        >>> x, y = ds[[3, 1, 2]]
+    """
+
+    def __init__(self, *files, dtype=None, shape: tuple = (), offset: int = 0, transforms: Optional[List] = None):
+        super().__init__(transforms)
+        if not files:
+            raise ValueError("MemmapDataset needs at least one file")
+        self.files = files
+        self.dtype = dtype
+        self.shape = tuple(shape)
+        self.offset = offset
+        self.arrays = [self._map(f) for f in files]
+        for i, a in enumerate(self.arrays):
+            if len(a) != len(self.arrays[0]):
+                raise ValueError(f"every field must have {len(self.arrays[0])} rows, field {i} has {len(a)}")
+
+    def _map(self, file):
+        if not isinstance(file, (str, os.PathLike)):
+            return file
+        if os.fspath(file).endswith('.npy'):
+            array = np.load(file, mmap_mode='r')
+        elif self.dtype is None:
+            raise ValueError(f"the dtype of the raw file {file!r} is needed")
         else:
-            yield from (self.dataset[batch_idxs] for batch_idxs in self.batch_sampler)
+            array = np.memmap(file, dtype=self.dtype, mode='r', offset=self.offset).reshape((-1,) + self.shape)
+        # indexing a np.memmap goes through Python, a plain view of the same mapping doesn't
+        return array.view(np.ndarray)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['arrays'] = [None if isinstance(f, (str, os.PathLike)) else a for f, a in zip(self.files, self.arrays)]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.arrays = [self._map(f) if a is None else a for f, a in zip(self.files, self.arrays)]
 
+    def __len__(self) -> int:
+        return len(self.arrays[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer, slice)):
+            fields = [np.array(a[index]) for a in self.arrays]
+        else:
+            fields = self._gather(np.asarray(index, dtype=np.int64))
+        batch = tuple(_tensor_view(f) for f in fields)
+        return self.apply_transforms(batch if len(batch) > 1 else batch[0])
 
+    def _gather(self, idxs: np.ndarray) -> List[np.ndarray]:
+        n = len(self)
+        if idxs.ndim != 1:
+            raise IndexError(f"a batch of indices must be 1-d, got shape {idxs.shape}")
+        if len(idxs) and (idxs.min() < -n or idxs.max() >= n):
+            raise IndexError(f"index out of range for a dataset of {n} samples")
+        idxs = np.where(idxs < 0, idxs + n, idxs)
+        order = np.argsort(idxs, kind='stable')
+        sorted_idxs = idxs[order]
+        in_order = np.array_equal(order, np.arange(len(idxs)))
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(sorted_idxs) != 1) + 1))
+        ends = np.concatenate((starts[1:], [len(idxs)]))
+        fields = []
+        for a in self.arrays:
+            out = np.empty((len(idxs),) + a.shape[1:], a.dtype)
+            if len(starts) * _MIN_RUN <= len(idxs):
+                for start, end in zip(starts.tolist(), ends.tolist()):
+                    first = int(sorted_idxs[start])
+                    rows = slice(start, end) if in_order else order[start:end]
+                    out[rows] = a[first:first + end - start]
+            else:
+                out[order] = a[sorted_idxs]
+            fields.append(out)
+        return fields
@@ -1,7 +1,7 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/06_ndarray.ipynb.
 
 # %% auto 0
-__all__ = ['BackendDevice', 'cpu_numpy', 'default_device', 'NDArray']
+__all__ = ['BackendDevice', 'cpu_numpy', 'cpu', 'default_device', 'broadcast_shapes', 'NDArray']
 
 # %% ../nbs/06_ndarray.ipynb 2
 import math
@@ -9,7 +9,10 @@ import numpy as np
 from . import ndarray_backend_numpy
 from typing import Optional, Sequence, Tuple, Union, Callable, Any
 from .utility import *
-# from . import ndarray_backend_cpu
+try:
+    from minima import ndarray_backend_cpu
+except ImportError:
+    ndarray_backend_cpu = None
 
 # %% ../nbs/06_ndarray.ipynb 3
 class BackendDevice:
@@ -32,22 +35,20 @@ class BackendDevice:
         return self.mod is not None
 
     def randn(self, *shape, dtype="float32"):
-        return NDArray(numpy.random.randn(*shape).astype(dtype), device=self)
+        return NDArray(np.random.randn(*shape), device=self, dtype=dtype)
 
     def rand(self, *shape, dtype="float32"):
-        return NDArray(numpy.random.rand(*shape).astype(dtype), device=self)
+        return NDArray(np.random.rand(*shape), device=self, dtype=dtype)
 
     def one_hot(self, n, i, dtype="float32"):
-        return NDArray(numpy.eye(n, dtype=dtype)[i], device=self)
+        return NDArray(np.eye(n)[i], device=self, dtype=dtype)
 
     def empty(self, shape, dtype="float32"):
         dtype = "float32" if dtype is None else dtype
-        assert dtype == "float32"
-        return NDArray.make(shape, device=self)
+        return NDArray.make(shape, device=self, dtype=dtype)
 
     def full(self, shape, fill_value, dtype="float32"):
         dtype = "float32" if dtype is None else dtype
-        assert dtype == "float32"
         arr = self.empty(shape, dtype)
         arr.fill(fill_value)
         return arr
@@ -56,10 +57,34 @@ def cpu_numpy():
     """Return numpy device"""
     return BackendDevice('cpu_numpy', ndarray_backend_numpy)
 
+def cpu():
+    """Return cpu device, or the numpy device if the compiled backend is not available"""
+    if ndarray_backend_cpu is None:
+        return cpu_numpy()
+    return BackendDevice('cpu', ndarray_backend_cpu)
+
 def default_device():
     return cpu_numpy()
 
 # %% ../nbs/06_ndarray.ipynb 4
+def broadcast_shapes(*shapes):
+    """
+    The shape that arrays of `shapes` broadcast to, following numpy's rules: shapes are aligned on
+    their last dimension, and every dimension must either match or be 1.
+
+    Raises:
+        ValueError if the shapes cannot be broadcast together
+    """
+    ndim = max((len(shape) for shape in shapes), default=0)
+    result = []
+    for dims in zip(*[(1,) * (ndim - len(shape)) + tuple(shape) for shape in shapes]):
+        sizes = set(dims) - {1}
+        if len(sizes) > 1:
+            raise ValueError(f"shapes {shapes} cannot be broadcast together")
+        result.append(sizes.pop() if sizes else 1)
+    return tuple(result)
+
+# %% ../nbs/06_ndarray.ipynb 5
 class NDArray:
 
     """
@@ -75,6 +100,8 @@ class NDArray:
     device : Optional[BackendDevice]
         The device on which the array computations should be performed. 
         If None, the default device is used.
+    dtype : Optional[str]
+        The storage type of the elements, "float32", "float16" or "bfloat16".
 
     Attributes
     ----------
@@ -93,7 +120,8 @@ class NDArray:
     def __init__(
         self,
         value: Union['NDArray', np.ndarray, Sequence], # The value on which to create the NDArray from
-        device: Optional[BackendDevice] = None # The device on which the array computations are performed.
+        device: Optional[BackendDevice] = None, # The device on which the array computations are performed.
+        dtype: Optional[str] = None # The storage type of the elements.
     ) -> None:
         """
         Constructs a new NDArray instance from an existing `NDArray`, numpy array, or a Python sequence. 
@@ -109,18 +137,25 @@ class NDArray:
         device : Optional[BackendDevice]
             The device on which the array computations are performed. Defaults to the device of the input value 
             if it's an NDArray, or to the default device otherwise.
+
+        dtype : Optional[str]
+            The storage type of the elements, "float32", "float16" or "bfloat16". Defaults to the dtype of the
+            input value if it is one of those, or to "float32" otherwise.
         """
         
         if isinstance(value, NDArray): # copy of existing NDArray
             if device is None: device = value._device
-            self._init(value.to(device) + 0.0)
+            copy = value.to(device) + 0.0
+            self._init(copy if dtype is None or dtype == copy.dtype else copy.astype(dtype))
         elif isinstance(value, np.ndarray): # copy of existing np array
             device = device if device is not None else default_device()
-            array = self.make(value.shape, device=device)
+            if dtype is None:
+                dtype = value.dtype.name if value.dtype.name in FLOAT_DTYPES else "float32"
+            array = self.make(value.shape, device=device, dtype=dtype)
             array._device.from_numpy(np.ascontiguousarray(value), array._handle)
             self._init(array)
         else:
-            array = NDArray(np.array(value), device=device)
+            array = NDArray(np.array(value), device=device, dtype=dtype)
             self._init(array)
 
     def _init(self, other) -> None:
@@ -145,7 +180,8 @@ class NDArray:
         strides: Optional[Sequence[int]] = None, # The strides of the new array. If None, compact strides are computed.
         device: Optional[BackendDevice] = None, # The device on which the new array computations should be performed. If None, the default device is used.
         offset: Optional[int] = None, # The offset in the underlying buffer of the new array. If None, it defaults to 0.
-        handle: Optional[Any] = None # The underlying buffer that should hold the data. If None, a new buffer is allocated.
+        handle: Optional[Any] = None, # The underlying buffer that should hold the data. If None, a new buffer is allocated.
+        dtype: str = "float32" # The storage type of the elements of a new buffer.
     ) -> 'NDArray':
         """
         Constructs a new NDArray with the specified shape, strides, device, offset, and handle.
@@ -162,6 +198,8 @@ class NDArray:
             The offset in the underlying buffer of the new array. If None, it defaults to 0.
         handle : Optional[Buffer]
             The underlying buffer that should hold the data. If None, a new buffer is allocated.
+        dtype : str
+            The storage type of the elements of the new buffer, ignored when `handle` is given.
 
         Returns
         -------
@@ -172,12 +210,14 @@ class NDArray:
         array._shape = tuple(shape)
         array._strides = NDArray.compact_strides(shape) if strides is None else strides
         array._device = default_device() if device is None else device
-        array._offset = offset
-        array._handle = array._device.Array(prod(shape)) if handle is None else handle
+        array._offset = 0 if offset is None else offset
+        array._handle = array._device.Array(prod(shape), dtype) if handle is None else handle
         return array
 
     @staticmethod
     def compact_strides(shape) -> Tuple:
+        if len(shape) == 0:
+            return ()
         res = [1] + [prod(shape[-i:]) for i in range(1, len(shape))]
         return tuple(res[::-1])
 
@@ -195,13 +235,13 @@ class NDArray:
         """
         if self._is_compact():
             return self
-        out = NDArray.make(shape=self._shape, device=self._device)
+        out = NDArray.make(shape=self._shape, device=self._device, dtype=self.dtype)
         self._device.compact(self._handle, out._handle, self._shape, self._strides, self._offset)
         return out
         
     def as_strided(self, shape, strides) -> 'NDArray':
         assert len(shape) == len(strides)
-        return NDArray.make(shape=shape, strides=strides, handle=self._handle)
+        return NDArray.make(shape=shape, strides=strides, device=self._device, offset=self._offset, handle=self._handle)
 
     def flat(self) -> 'NDArray':
         return self.reshape((self.size, ))
@@ -247,8 +287,18 @@ class NDArray:
 
     @property
     def dtype(self) -> str:
-        # only support float32 for now
-        return "float32"
+        # the buffer knows the type of its elements, views share it
+        return self._handle.dtype
+
+    def astype(self, dtype: str) -> 'NDArray':
+        """
+        Returns a compact copy of this array with elements of `dtype`, "float32", "float16" or "bfloat16",
+        rounded to nearest.
+        """
+        out = NDArray.make(self._shape, device=self._device, dtype=dtype)
+        if out.size > 0:
+            self._device.cast(self.compact()._handle, out._handle)
+        return out
 
     @property
     def ndim(self) -> int:
@@ -270,9 +320,14 @@ class NDArray:
 
     ### Elementwise functions
 
-    def log(self):
+    def log(self, out: Optional['NDArray'] = None):
         """
-        Computes the natural logarithm element-wise for the NDArray. 
+        Computes the natural logarithm element-wise for the NDArray.
+
+        Parameters
+        ----------
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
@@ -280,13 +335,18 @@ class NDArray:
             A new NDArray with the natural logarithm applied element-wise. The shape of the returned array matches
             the original NDArray.
         """
-        out = NDArray.make(self._shape, device=self._device)
-        self._device.ewise_log(self.compact()._handle, out._handle)
-        return out
+        result = self._output(self._shape, out, self)
+        self._device.ewise_log(self.compact()._handle, result._handle)
+        return self._store(result, out)
 
-    def exp(self):
+    def exp(self, out: Optional['NDArray'] = None):
         """
         Computes the exponential function element-wise for the NDArray.
+
+        Parameters
+        ----------
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
@@ -295,13 +355,18 @@ class NDArray:
             the original NDArray.
         """
         
-        out = NDArray.make(self._shape, device=self._device)
-        self._device.ewise_exp(self.compact()._handle, out._handle)
-        return out
+        result = self._output(self._shape, out, self)
+        self._device.ewise_exp(self.compact()._handle, result._handle)
+        return self._store(result, out)
 
-    def tanh(self):
+    def tanh(self, out: Optional['NDArray'] = None):
         """
         Computes the hyperbolic tangent element-wise for the NDArray.
+
+        Parameters
+        ----------
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
@@ -310,9 +375,9 @@ class NDArray:
             the original NDArray.
         """
         
-        out = NDArray.make(self._shape, device=self._device)
-        self._device.ewise_tanh(self.compact()._handle, out._handle)
-        return out
+        result = self._output(self._shape, out, self)
+        self._device.ewise_tanh(self.compact()._handle, result._handle)
+        return self._store(result, out)
 
     def reshape(self, new_shape):
         """
@@ -332,8 +397,9 @@ class NDArray:
         
         if prod(new_shape) != prod(self._shape):
             raise ValueError("Invalid reshape")
-        strides = self._strides if not NDArray.compact_strides(new_shape) == self._strides else NDArray.compact_strides(new_shape)
-        return self.as_strided(shape=new_shape, strides=strides)
+        if self._strides != NDArray.compact_strides(self._shape):
+            raise ValueError("Cannot reshape a non-compact array, call `compact` first")
+        return self.as_strided(shape=new_shape, strides=NDArray.compact_strides(new_shape))
 
 
     def permute(self, new_axes):
@@ -363,9 +429,10 @@ class NDArray:
         """
         Broadcast an array to a new shape.  new_shape's elements must be the
         same as the original shape, except for dimensions in the self where
-        the size = 1 (which can then be broadcast to any size).  As with the
-        previous calls, this will not copy memory, and just achieves
-        broadcasting by manipulating the strides.
+        the size = 1 (which can then be broadcast to any size).  As in numpy,
+        new_shape may also have more dimensions than self, the missing leading
+        dimensions are broadcast.  As with the previous calls, this will not
+        copy memory, and just achieves broadcasting by manipulating the strides.
         Raises:
             assertion error if new_shape[i] != shape[i] for all i where
             shape[i] != 1
@@ -376,16 +443,67 @@ class NDArray:
             point to the same memory as the original array.
         """
         
-        for old_shape_i, new_shape_i in zip(self._shape, new_shape):
+        new_shape = tuple(new_shape)
+        assert len(new_shape) >= self.ndim
+        # the leading dimensions that self does not have are read with a zero stride
+        old_shape = (1,) * (len(new_shape) - self.ndim) + self._shape
+        old_strides = (0,) * (len(new_shape) - self.ndim) + self._strides
+        for old_shape_i, new_shape_i in zip(old_shape, new_shape):
             if old_shape_i != 1:
                 assert new_shape_i == old_shape_i
-        new_strides = tuple(0 if old_shape_i == 1 else stride_i for old_shape_i, stride_i in zip(self._shape, self._strides))
+        new_strides = tuple(0 if old_shape_i == 1 else stride_i for old_shape_i, stride_i in zip(old_shape, old_strides))
         return self.as_strided(shape=new_shape, strides=new_strides)
 
-    def _ewise_or_scalar(self, other: Union['NDArray', float], ewise_fn: Callable, scalr_fn: Callable) -> 'NDArray':
+    def _output(self, shape, out: Optional['NDArray'], *operands) -> 'NDArray':
+        """
+        Returns the array an operation with a result of `shape` writes into. This is `out` itself when the backend
+        can write straight into it, i.e. when it is compact and does not overlap an operand read in a different
+        order, and a new array otherwise, which `_store` then copies into `out`.
+
+        Raises
+        ------
+        ValueError
+            If `out` does not have the shape of the result, or is on another device.
+        """
+        dtype = self._result_dtype(*operands)
+        if out is None:
+            return NDArray.make(shape, device=self._device, dtype=dtype)
+        if out._shape != tuple(shape):
+            raise ValueError(f"out has shape {out._shape}, but the result has shape {tuple(shape)}")
+        if out._device != self._device:
+            raise ValueError(f"out is on {out._device}, but the operands are on {self._device}")
+        # an operand viewing the same memory as `out` is only safe to overwrite element by element when it is read in
+        # exactly the order `out` is written
+        overlaps = any(isinstance(x, NDArray) and x._handle is out._handle and
+                       (x._shape, x._strides, x._offset) != (out._shape, out._strides, out._offset) for x in operands)
+        if not out._is_compact() or overlaps or out.dtype != dtype:
+            return NDArray.make(shape, device=self._device, dtype=dtype)
+        return out
+
+    @staticmethod
+    def _result_dtype(*operands) -> str:
+        """The dtype of the result of an operation: the dtype of its array operands, or float32 when they differ."""
+        dtypes = {x.dtype for x in operands if isinstance(x, NDArray)}
+        return dtypes.pop() if len(dtypes) == 1 else "float32"
+
+    @staticmethod
+    def _store(result: 'NDArray', out: Optional['NDArray']) -> 'NDArray':
+        """Copies `result` into `out` when `_output` could not hand `out` itself to the backend, and returns `out`."""
+        if out is None or result is out:
+            return result
+        if result.size > 0:
+            out._device.ewise_setitem(result._handle, out._handle, out._shape, out._strides, out._offset)
+        return out
+
+    def _ewise_or_scalar(self, other: Union['NDArray', float], ewise_fn: Callable, scalr_fn: Callable, strided_fn: Callable,
+                         out: Optional['NDArray'] = None) -> 'NDArray':
         """
         This private method applies an element-wise function (`ewise_fn`) to two `NDArray` instances, or a scalar function (`scalr_fn`) 
-        to this `NDArray` and a scalar value. It returns a new `NDArray` instance with the results.
+        to this `NDArray` and a scalar value. It returns a new `NDArray` instance with the results, or `out` when it is given.
+
+        Two `NDArray` operands broadcast against each other as in numpy. Unless both are compact and of the same shape,
+        they are passed to `strided_fn` as views of the broadcast shape, where broadcast dimensions have a zero stride,
+        so only the output is allocated.
     
         Parameters
         ----------
@@ -400,26 +518,40 @@ class NDArray:
         scalr_fn : Callable
             A function to apply if `other` is a scalar. This function should take an `NDArray` handle and a scalar, and 
             output a handle.
+
+        strided_fn : Callable
+            The strided variant of `ewise_fn`, taking the output shape and the strides and offset of each operand
+            after the two handles and the output handle.
+
+        out : Optional[NDArray]
+            The array to write the result into, which must have the broadcast shape. It may be one of the operands.
     
         Returns
         -------
         NDArray
-            A new `NDArray` instance with the results of the operation.
+            The `NDArray` instance holding the results of the operation.
     
         Raises
         ------
-        AssertionError
-            If `other` is an `NDArray` but does not have the same shape as `self`.
-        """
-        out = NDArray.make(shape=self._shape, device=self._device)
-        if isinstance(other, NDArray):
-            assert self._shape == other._shape, f'operands could not be added together with shapes {self._shape} {other._shape}'
-            ewise_fn(self.compact()._handle, other.compact()._handle, out._handle)
-        else:
-            scalr_fn(self.compact()._handle, other, out._handle)
-        return out
-
-    def __add__(self, other: Union['NDArray', float]) -> 'NDArray':
+        ValueError
+            If `other` is an `NDArray` whose shape cannot be broadcast against the shape of `self`, or if `out`
+            does not have the shape of the result.
+        """
+        if not isinstance(other, NDArray):
+            result = self._output(self._shape, out, self)
+            scalr_fn(self.compact()._handle, other, result._handle)
+            return self._store(result, out)
+
+        shape = broadcast_shapes(self._shape, other._shape)
+        result = self._output(shape, out, self, other)
+        if self._shape == other._shape and self._is_compact() and other._is_compact():
+            ewise_fn(self._handle, other._handle, result._handle)
+        elif result.size > 0:
+            a, b = self.broadcast_to(shape), other.broadcast_to(shape)
+            strided_fn(a._handle, b._handle, result._handle, shape, a._strides, a._offset, b._strides, b._offset)
+        return self._store(result, out)
+
+    def add(self, other: Union['NDArray', float], out: Optional['NDArray'] = None) -> 'NDArray':
         """
         Performs element-wise addition between this array and `other`. If `other` is not an NDArray, it is treated as a scalar.
 
@@ -427,6 +559,8 @@ class NDArray:
         ----------
         other : NDArray or scalar
             The other operand in the addition.
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
 
         Returns
         -------
@@ -435,27 +569,31 @@ class NDArray:
 
         Raises
         ------
-        AssertionError
-            If `other` is an NDArray and does not have the same shape as this array.
+        ValueError
+            If `other` is an NDArray whose shape cannot be broadcast against the shape of this array.
         """
-        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_add, scalr_fn=self._device.scalar_add)
+        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_add, scalr_fn=self._device.scalar_add,
+                                     strided_fn=self._device.ewise_add_strided, out=out)
 
-    def __sub__(self, other) -> 'NDArray':
+    def sub(self, other, out: Optional['NDArray'] = None) -> 'NDArray':
         """
         Implements the subtract operation. This method performs element-wise subtraction between two NDArrays
-        or an NDArray and a scalar.
+        or an NDArray and a scalar, in a single pass of the backend's subtract kernels.
     
         Parameters
         ----------
         other : NDArray or scalar
             The array or scalar to subtract from the current NDArray.
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
         NDArray
             The resultant NDArray after performing subtraction.
         """
-        return self + (-other)
+        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_sub, scalr_fn=self._device.scalar_sub,
+                                     strided_fn=self._device.ewise_sub_strided, out=out)
 
     def __rsub__(self, other) -> 'NDArray':
         """
@@ -472,9 +610,11 @@ class NDArray:
             The resultant NDArray after performing subtraction.
         """
         
-        return (-self) + other
+        out = NDArray.make(self._shape, device=self._device, dtype=self.dtype)
+        self._device.scalar_rsub(self.compact()._handle, other, out._handle)
+        return out
 
-    def __mul__(self, other) -> 'NDArray':
+    def mul(self, other, out: Optional['NDArray'] = None) -> 'NDArray':
         """
         Implements the multiply operation. This method performs element-wise multiplication between two NDArrays
         or an NDArray and a scalar.
@@ -483,15 +623,18 @@ class NDArray:
         ----------
         other : NDArray or scalar
             The array or scalar to multiply with the current NDArray.
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
         NDArray
             The resultant NDArray after performing multiplication.
         """
-        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_mul, scalr_fn=self._device.scalar_mul)
+        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_mul, scalr_fn=self._device.scalar_mul,
+                                     strided_fn=self._device.ewise_mul_strided, out=out)
 
-    def __truediv__(self,  other) -> 'NDArray':
+    def div(self,  other, out: Optional['NDArray'] = None) -> 'NDArray':
         """
         Implements the true divide operation. This method performs element-wise division between two NDArrays
         or an NDArray and a scalar.
@@ -500,22 +643,41 @@ class NDArray:
         ----------
         other : NDArray or scalar
             The array or scalar to divide the current NDArray by.
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
         NDArray
             The resultant NDArray after performing division.
         """
-        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_div, scalr_fn=self._device.scalar_div)
+        return self._ewise_or_scalar(other, ewise_fn=self._device.ewise_div, scalr_fn=self._device.scalar_div,
+                                     strided_fn=self._device.ewise_div_strided, out=out)
+
+    def iadd(self, other) -> 'NDArray':
+        """Adds `other` to this array in place, without allocating, and returns it."""
+        return self.add(other, out=self)
+
+    def isub(self, other) -> 'NDArray':
+        """Subtracts `other` from this array in place, without allocating, and returns it."""
+        return self.sub(other, out=self)
+
+    def imul(self, other) -> 'NDArray':
+        """Multiplies this array by `other` in place, without allocating, and returns it."""
+        return self.mul(other, out=self)
+
+    def idiv(self, other) -> 'NDArray':
+        """Divides this array by `other` in place, without allocating, and returns it."""
+        return self.div(other, out=self)
 
-    def __neg__(self):
+    def neg(self, out: Optional['NDArray'] = None) -> 'NDArray':
         """
         Implements the negation operation. This method performs element-wise negation for self(NDArray).
 
         Parameters
         ----------
-        self : NDArray
-            The array to negate.
+        out : NDArray, optional
+            The array to write the result into, instead of a new one.
     
         Returns
         -------
@@ -523,24 +685,34 @@ class NDArray:
             The resultant NDArray after performing negation.
         """
         
-        return self * (-1)
-
-    def __pow__(self, scalar) -> 'NDArray':
-        out = NDArray.make(self._shape, self._device)
-        self._device.scalr_power(self.compact()._handle, scalar, out._handle)
-        return out
-
-    __radd__ = __add__
-    __rmul__ = __mul__
-
-    def maximum(self, other):
-        return self.ewise_or_scalar(other, self._device.ewise_maximum, self._device.scalar_maximum)
+        return self.mul(-1, out=out)
+
+    def power(self, scalar, out: Optional['NDArray'] = None) -> 'NDArray':
+        """Raises every element to the power `scalar`, into `out` when it is given."""
+        result = self._output(self._shape, out, self)
+        self._device.scalar_power(self.compact()._handle, scalar, result._handle)
+        return self._store(result, out)
+
+    __add__ = __radd__ = add
+    __sub__ = sub
+    __mul__ = __rmul__ = mul
+    __truediv__ = div
+    __neg__ = neg
+    __pow__ = power
+    __iadd__ = iadd
+    __isub__ = isub
+    __imul__ = imul
+    __itruediv__ = idiv
+
+    def maximum(self, other, out: Optional['NDArray'] = None):
+        return self._ewise_or_scalar(other, self._device.ewise_maximum, self._device.scalar_maximum,
+                                     self._device.ewise_maximum_strided, out=out)
 
     def __eq__(self, other):
-        return self.ewise_or_scalar(other, self._device.ewise_eq, self._device.scalar_eq)
+        return self._ewise_or_scalar(other, self._device.ewise_eq, self._device.scalar_eq, self._device.ewise_eq_strided)
 
     def __ge__(self, other):
-        return self.ewise_or_scalar(other, self._device.ewise_ge, self._device.scalar_ge)
+        return self._ewise_or_scalar(other, self._device.ewise_ge, self._device.scalar_ge, self._device.ewise_ge_strided)
 
     def __ne__(self, other):
         return 1 - (self == other)
@@ -658,103 +830,159 @@ class NDArray:
                 view._offset,
             )
 
-    def reduce_view_out(self, axis):
-        """
-        Prepares and returns a view of the array and an output array, set up 
-        for performing reduction functions.
-        """
+    def _reduce_axes(self, axis):
+        """Normalizes `axis` (None, an int or a tuple of ints, possibly negative) to a sorted tuple of axes."""
         if axis is None:
-            # Reshape the array into 1D if we're reducing over all axes.
-            new_shape = (1,) * (self.ndim - 1) + (prod(self._shape),)
-            view = self.reshape(new_shape)
-    
-            # Prepare an output array with one element for each dimension.
-            output_shape = (1,) * self.ndim
-            out = NDArray.make(output_shape, device=self._device)
+            return tuple(range(self.ndim))
+        axes = (axis,) if isinstance(axis, int) else tuple(axis)
+        normalized = []
+        for a in axes:
+            if not -self.ndim <= a < self.ndim:
+                raise ValueError(f"axis {a} is out of bounds for an array of dimension {self.ndim}")
+            normalized.append(a % self.ndim)
+        if len(set(normalized)) != len(normalized):
+            raise ValueError(f"repeated axis in {axis}")
+        return tuple(sorted(normalized))
+
+    def _reduce_view(self, axis, keepdims):
+        """
+        Returns a view of the array with the reduced axes permuted to the end, the number of reduced
+        axes, and the shape of the result.
+
+        The view shares the array's memory, the backends' strided reductions read it in place.
+        """
+        axes = self._reduce_axes(axis)
+        kept = tuple(a for a in range(self.ndim) if a not in axes)
+        view = self.permute(kept + axes)
+        if keepdims:
+            out_shape = tuple(1 if i in axes else s for i, s in enumerate(self._shape))
         else:
-            # If we're reducing over a specific axis, bring that axis to the end.
-            permute_order = tuple(a for a in range(self.ndim) if a != axis) + (axis,)
-            view = self.permute(permute_order)
-    
-            # Prepare an output array with the same shape as the original, 
-            # but with 1 in place of the reduction axis.
-            output_shape = tuple(1 if i == axis else s for i, s in enumerate(self._shape))
-            out = NDArray.make(output_shape, device=self._device)
-        return view, out
+            out_shape = tuple(self._shape[a] for a in kept)
+        return view, len(axes), out_shape
 
-    def reduce(self, operation, axis=None):
+    def reduce(self, operation, axis=None, keepdims=True):
         """
-        Performs a reduction operation ('sum' or 'max') over the given axis, 
+        Performs a reduction operation ('sum' or 'max') over the given axis or tuple of axes, 
         or over the entire array if no axis is provided.
+
+        The reduced axes are kept with size 1 unless `keepdims` is False.
         """
-        # Prepare the view and output array.
-        view, out = self.reduce_view_out(axis)
-        
-        # Perform the operation.
         if operation == 'sum':
-            self._device.reduce_sum(view.compact()._handle, out._handle, view._shape[-1])
+            fn = self._device.reduce_sum_strided
         elif operation == 'max':
-            self._device.reduce_max(view.compact()._handle, out._handle, view._shape[-1])
+            fn = self._device.reduce_max_strided
         else:
             raise ValueError(f"Unknown operation: {operation}")
-    
+
+        view, reduce_ndim, out_shape = self._reduce_view(axis, keepdims)
+        out = NDArray.make(out_shape, device=self._device, dtype=self.dtype)
+        if out.size == 0:
+            return out
+        if prod(view._shape[view.ndim - reduce_ndim:]) == 0:
+            if operation == 'max':
+                raise ValueError("max of an empty reduction has no identity")
+            out.fill(0.0)
+            return out
+        fn(view._handle, out._handle, view._shape, view._strides, view._offset, reduce_ndim)
         return out
     
-    def sum(self, axis=None):
-        """Performs a sum operation over the given axis, or over the entire array if no axis is provided."""
-        return self.reduce('sum', axis)
+    def sum(self, axis=None, keepdims=True):
+        """Performs a sum operation over the given axes, or over the entire array if no axis is provided."""
+        return self.reduce('sum', axis, keepdims)
     
-    def max(self, axis=None):
-        """Finds the maximum value over the given axis, or over the entire array if no axis is provided."""
-        return self.reduce('max', axis)
+    def max(self, axis=None, keepdims=True):
+        """Finds the maximum value over the given axes, or over the entire array if no axis is provided."""
+        return self.reduce('max', axis, keepdims)
+
+    def mean_var(self, axis=None, keepdims=True):
+        """
+        Computes the mean and the (population) variance over the given axes together, in one pass
+        over the array.
+        """
+        view, reduce_ndim, out_shape = self._reduce_view(axis, keepdims)
+        mean = NDArray.make(out_shape, device=self._device, dtype=self.dtype)
+        var = NDArray.make(out_shape, device=self._device, dtype=self.dtype)
+        if mean.size > 0:
+            if prod(view._shape[view.ndim - reduce_ndim:]) == 0:
+                raise ValueError("mean of an empty reduction is undefined")
+            self._device.reduce_mean_var_strided(view._handle, mean._handle, var._handle,
+                                                 view._shape, view._strides, view._offset, reduce_ndim)
+        return mean, var
+
+    def mean(self, axis=None, keepdims=True):
+        """Computes the mean over the given axes, or over the entire array if no axis is provided."""
+        return self.sum(axis, keepdims) / prod(self._shape[a] for a in self._reduce_axes(axis))
+
+    def var(self, axis=None, keepdims=True):
+        """Computes the (population) variance over the given axes, see `mean_var`."""
+        return self.mean_var(axis, keepdims)[1]
+
+    @staticmethod
+    def _check_target(target: 'NDArray') -> None:
+        if target.dtype != "float32":
+            raise ValueError(f"targets must be float32 class indices, got {target.dtype}, which rounds large indices")
+
+    def log_softmax_nll(self, target: 'NDArray'):
+        """
+        Cross-entropy of the rows of this (batch, classes) array of logits against the class indices
+        in `target`, without materializing the log-softmax.
+
+        Returns the loss of each row, and the log-sum-exp of each row for `log_softmax_nll_backward`.
+        `target` must be float32, which holds every class index below 2**24: float16 already rounds the
+        indices above 2048, and bfloat16 those above 256.
+        """
+        if self.ndim != 2 or target.size != self._shape[0]:
+            raise ValueError(f"expected (batch, classes) logits and one target per row, got {self._shape} and {target.shape}")
+        self._check_target(target)
+        batch, classes = self._shape
+        loss = NDArray.make((batch,), device=self._device, dtype=self.dtype)
+        lse = NDArray.make((batch,), device=self._device, dtype=self.dtype)
+        if batch > 0:
+            self._device.log_softmax_nll(self.compact()._handle, target.compact()._handle,
+                                         loss._handle, lse._handle, batch, classes)
+        return loss, lse
+
+    def log_softmax_nll_backward(self, target: 'NDArray', lse: 'NDArray', grad_loss: 'NDArray') -> 'NDArray':
+        """
+        Gradient of `log_softmax_nll` with respect to these logits, given the gradient of each row's loss.
+        `target` must be float32, as in `log_softmax_nll`.
+        """
+        self._check_target(target)
+        batch, classes = self._shape
+        out = NDArray.make(self._shape, device=self._device, dtype=self.dtype)
+        if batch > 0:
+            self._device.log_softmax_nll_backward(self.compact()._handle, target.compact()._handle, lse.compact()._handle,
+                                                  grad_loss.compact()._handle, out._handle, batch, classes)
+        return out
 
     def __matmul__(self, other):
-        """Perform matrix multiplication of two arrays."""
-    
-        # Ensuring the arrays are 2D and have matching dimensions for multiplication
-        assert self.ndim == 2 and other.ndim == 2
-        assert self.shape[1] == other.shape[0]
-    
-        # Retrieve the dimensions of the two matrices
-        m, n, p = self.shape[0], self.shape[1], other.shape[1]
-    
-        def tile_matrix(matrix, tile_size):
-            """Function to tile a matrix based on a given tile size."""
-            return matrix.as_strided(
-                (matrix.shape[0] // tile_size, matrix.shape[1] // tile_size, tile_size, tile_size),
-                (matrix.shape[1] * tile_size, tile_size, self.shape[1], 1),
-            )
-    
-        if hasattr(self.device, "matmul_tiled") and all(
-            d % self.device.__tile_size__ == 0 for d in (m, n, p)
-        ):
-            # The device supports tiled multiplication and the dimensions of the matrices are divisible by the tile size
-    
-            # Determine the tile size
-            tile_size = self.device.__tile_size__
-    
-            # Tile the matrices
-            tiled_self = tile_matrix(self.compact(), tile_size).compact()
-            tiled_other = tile_matrix(other.compact(), tile_size).compact()
-    
-            # Create an output array for the result
-            output = NDArray.make((tiled_self.shape[0], tiled_other.shape[1], tile_size, tile_size), device=self.device)
-    
-            # Perform the tiled matrix multiplication
-            self.device.matmul_tiled(tiled_self._handle, tiled_other._handle, output._handle, m, n, p)
-    
-            # Rearrange and reshape the output to get the final result
-            return output.permute((0, 2, 1, 3)).compact().reshape((m, p))
+        """
+        Perform matrix multiplication of two arrays.
 
-        else:
-            # The device does not support tiled multiplication or the dimensions of the matrices are not divisible by the tile size
-    
-            # Create an output array for the result
-            output = NDArray.make((m, p), device=self.device)
+        As in numpy, arrays with more than two dimensions are stacks of matrices in their last two
+        dimensions, and the leading (batch) dimensions are broadcast against each other. Broadcast
+        and non-compact operands are read in place through their strides, never copied.
+        """
     
-            # Perform regular matrix multiplication
-            self.device.matmul(self.compact()._handle, other.compact()._handle, output._handle, m, n, p)
+        # Ensuring the arrays are at least 2D and have matching dimensions for multiplication
+        assert self.ndim >= 2 and other.ndim >= 2
+        assert self.shape[-1] == other.shape[-2]
     
-            return output
+        # Retrieve the dimensions of the matrices
+        m, n, p = self.shape[-2], self.shape[-1], other.shape[-1]
 
+        if self.ndim == 2 and other.ndim == 2 and self._is_compact() and other._is_compact():
+            # The backends take care of blocking for the caches themselves, any shape goes straight to `matmul`
+            output = NDArray.make((m, p), device=self.device, dtype=self._result_dtype(self, other))
+            self.device.matmul(self._handle, other._handle, output._handle, m, n, p)
+            return output
 
+        # One strided batch kernel, the batch dimensions of both operands are zero-stride views
+        batch_shape = broadcast_shapes(self.shape[:-2], other.shape[:-2])
+        a = self.broadcast_to(batch_shape + (m, n))
+        b = other.broadcast_to(batch_shape + (n, p))
+        output = NDArray.make(batch_shape + (m, p), device=self.device, dtype=self._result_dtype(self, other))
+        if output.size > 0:
+            self.device.matmul_batched(a._handle, b._handle, output._handle, batch_shape,
+                                       a._strides, a._offset, b._strides, b._offset, m, n, p)
+        return output
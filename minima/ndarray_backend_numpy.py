@@ -1,23 +1,57 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/07_ndarray_backend_numpy.ipynb.
 
 # %% auto 0
-__all__ = ['Array', 'to_numpy', 'from_numpy', 'fill', 'compact', 'ewise_setitem', 'scalar_setitem', 'ewise_add', 'scalar_add',
-           'ewise_mul', 'scalar_mul', 'ewise_div', 'scalar_div', 'scalar_power', 'ewise_maximum', 'scalar_maximum',
-           'ewise_eq', 'scalar_eq', 'ewise_ge', 'scalar_ge', 'ewise_log', 'ewise_exp', 'ewise_tanh', 'reduce_max',
-           'reduce_sum', 'matmul']
+__all__ = ['Array', 'empty_cache', 'set_cache_limit', 'get_cache_limit', 'memory_stats', 'to_numpy', 'from_numpy', 'fill', 'cast',
+           'compact', 'ewise_setitem', 'scalar_setitem', 'ewise_add', 'scalar_add', 'ewise_sub', 'scalar_sub',
+           'scalar_rsub', 'ewise_mul', 'scalar_mul', 'ewise_div', 'scalar_div', 'scalar_power', 'ewise_maximum',
+           'scalar_maximum', 'ewise_eq', 'scalar_eq', 'ewise_ge', 'scalar_ge', 'ewise_add_strided', 'ewise_sub_strided',
+           'ewise_mul_strided', 'ewise_div_strided', 'ewise_maximum_strided', 'ewise_eq_strided', 'ewise_ge_strided',
+           'ewise_log', 'ewise_exp', 'ewise_tanh', 'reduce_max', 'reduce_sum', 'reduce_sum_strided',
+           'reduce_max_strided', 'reduce_mean_var_strided', 'log_softmax_nll', 'log_softmax_nll_backward', 'matmul',
+           'matmul_batched']
 
 # %% ../nbs/07_ndarray_backend_numpy.ipynb 2
+import os
+import weakref
 import numpy as np
+from .utility import float_dtype, numpy_dtype
 
 # %% ../nbs/07_ndarray_backend_numpy.ipynb 3
 __device_name__ = "numpy"
-_datatype = np.float32
-_datetype_size = np.dtype(_datatype).itemsize
+
+def _accumulator(a):
+    "The dtype reductions of `a` accumulate in, float32 for the 16-bit floats and numpy's default otherwise."
+    return np.float32 if a.dtype.itemsize < 4 else None
+
+def _matmul(a, b, out):
+    "`a @ b` written into `out`, computed in float32 when either is a 16-bit float."
+    if a.dtype.itemsize < 4 or b.dtype.itemsize < 4:
+        np.copyto(out, np.matmul(a.astype(np.float32), b.astype(np.float32)), casting='unsafe')
+    else:
+        np.matmul(a, b, out=out)
 
 # %% ../nbs/07_ndarray_backend_numpy.ipynb 4
 class Array:
-    def __init__(self, size):
-        self.array = np.empty(size, dtype=np.float32)
+    # unset when the constructor raised, before taking a block
+    _block = None
+
+    def __init__(self, size, dtype="float32"):
+        self.dtype = float_dtype(dtype)
+        np_dtype = numpy_dtype(self.dtype)
+        # one entry per numpy view returned by `to_numpy` that is still alive, popped by its finalizer
+        self._views = []
+        # a block of bytes of the caching allocator, which can be larger than `size` elements
+        self._block = _allocator.allocate(size * np_dtype.itemsize)
+        self.array = self._block[:size * np_dtype.itemsize].view(np_dtype)
+
+    def __del__(self):
+        block, self._block = self._block, None
+        if block is None:
+            return
+        del self.array
+        # a block still viewed by numpy arrays is left to them, and freed by numpy along with the last one
+        if _allocator is not None and not self._views:
+            _allocator.release(block)
 
     def  __repr__(self):
         return self.array.__repr__()
@@ -27,6 +61,73 @@ class Array:
         return self.array.size
 
 # %% ../nbs/07_ndarray_backend_numpy.ipynb 6
+class _CachingAllocator:
+    """Size-bucketed free lists of blocks of bytes, with the same buckets as the allocator of the cpu backend."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.free_blocks = {}
+        self.hits = self.misses = self.bytes_held = 0
+
+    @staticmethod
+    def round_size(nbytes):
+        "The bucket of a request of `nbytes` bytes: multiples of 512 bytes up to 1 MiB, then of a quarter of its power of two."
+        if nbytes <= 1 << 20:
+            step = 512
+        else:
+            step = (1 << (nbytes.bit_length() - 1)) // 4
+        return max(512, -(-nbytes // step) * step)
+
+    def allocate(self, nbytes):
+        capacity = self.round_size(nbytes)
+        blocks = self.free_blocks.get(capacity)
+        if blocks:
+            self.hits += 1
+            self.bytes_held -= capacity
+            return blocks.pop()
+        self.misses += 1
+        return np.empty(capacity, dtype=np.uint8)
+
+    def release(self, block):
+        nbytes = block.nbytes
+        if self.bytes_held + nbytes <= self.limit:
+            self.free_blocks.setdefault(block.size, []).append(block)
+            self.bytes_held += nbytes
+
+    def trim(self, limit):
+        for capacity in list(self.free_blocks):
+            blocks = self.free_blocks[capacity]
+            while blocks and self.bytes_held > limit:
+                self.bytes_held -= blocks.pop().nbytes
+            if not blocks:
+                del self.free_blocks[capacity]
+
+_allocator = _CachingAllocator(int(os.environ.get("MINIMA_CACHE_LIMIT", 1 << 30)))
+
+def empty_cache():
+    "Frees every buffer held by the caching allocator."
+    _allocator.trim(0)
+
+def set_cache_limit(limit):
+    "Sets the most bytes of free buffers the caching allocator holds, 0 disables it."
+    _allocator.limit = limit
+    _allocator.trim(limit)
+
+def get_cache_limit():
+    "The most bytes of free buffers the caching allocator holds."
+    return _allocator.limit
+
+def memory_stats():
+    "Allocations served from the cache (`hits`) and from numpy (`misses`), and the bytes of free buffers held."
+    return {'hits': _allocator.hits, 'misses': _allocator.misses, 'bytes_held': _allocator.bytes_held}
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 9
+def _strided(a, shape, strides, offset):
+    "The view of `a.array` with `shape` and `strides` in elements, from `offset`, for the kernels."
+    return np.lib.stride_tricks.as_strided(
+        a.array[offset:], shape, tuple([s * a.array.itemsize for s in strides])
+    )
+
 def to_numpy(a, shape, strides, offset):
     """
     Converts a contiguous 1D array into an N-dimensional array using numpy stride tricks.
@@ -48,23 +149,24 @@ def to_numpy(a, shape, strides, offset):
     Returns
     -------
     numpy.ndarray
-        N-dimensional array 'view' of the input 1D array.
+        N-dimensional array 'view' of the input 1D array. Its buffer is not recycled while the view is alive.
 
     Examples
     --------
     >>> import numpy as np
-    >>> _datetype_size = np.array([1]).dtype.itemsize
     >>> array_1D = np.array([1, 2, 3, 4, 5, 6])
     >>> to_numpy(array_1D, (2, 3), (3, 1), 0)
     array([[1, 2, 3],
            [4, 5, 6]])
     """
-    return np.lib.stride_tricks.as_strided(
-        a.array[offset:], shape, tuple([s * _datetype_size for s in strides])
-    )
+    view = _strided(a, shape, strides, offset)
+    # views of `view` keep it alive, as its base is not an ndarray, so it dies with the last view of the buffer
+    a._views.append(None)
+    weakref.finalize(view, a._views.pop)
+    return view
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 10
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 15
 def from_numpy(a: np.ndarray, out) -> None:
     """
     Assigns a flattened version of the input N-dimensional array to another array.
@@ -100,7 +202,7 @@ def from_numpy(a: np.ndarray, out) -> None:
     out.array[:] = a.flatten()
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 16
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 21
 def fill(out: Array, val) -> None:
     """
     Fills an Array object with a specific value.
@@ -129,7 +231,30 @@ def fill(out: Array, val) -> None:
     out.array.fill(val)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 18
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 23
+def cast(a: Array, out: Array) -> None:
+    """
+    Copies the elements of an Array object into another one of another dtype, rounding to nearest.
+
+    Parameters
+    ----------
+    a : Array
+        The Array object to convert.
+    out : Array
+        The Array object receiving the converted elements, of the same size as `a`.
+
+    Examples
+    --------
+    >>> a = Array(3)
+    >>> a.array[:] = np.array([1, 1 / 3, 70000])
+    >>> out = Array(3, dtype="float16")
+    >>> cast(a, out)
+    >>> print(out)
+    array([1.    , 0.3333,    inf], dtype=float16)
+    """
+    np.copyto(out.array, a.array, casting='unsafe')
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 25
 def compact(a, out: Array, shape, strides, offset):
     """
     Transforms a 1D array into an N-dimensional array, flattens it, and assigns it to an Array object.
@@ -166,9 +291,10 @@ def compact(a, out: Array, shape, strides, offset):
     array([1., 2., 3., 4., 5., 6.], dtype=float32)
     """
     
-    out.array[:] = to_numpy(a, shape, strides, offset).flatten()
+    # copy straight from the strided view into `out`, without an intermediate flattened copy
+    np.copyto(out.array.reshape(shape), _strided(a, shape, strides, offset))
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 20
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 27
 def ewise_setitem(a: Array, out: Array, shape, strides, offset):
     """
     Modifies a section of an Array object to be equivalent to another reshaped array, on an element-wise basis.
@@ -207,9 +333,9 @@ def ewise_setitem(a: Array, out: Array, shape, strides, offset):
     array([1., 2., 3., 4., 5., 6., 0., 0., 0.], dtype=float32)
     """
     
-    to_numpy(out, shape, strides, offset)[:] = a.array.reshape(shape)
+    _strided(out, shape, strides, offset)[:] = a.array.reshape(shape)
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 28
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 35
 def scalar_setitem(val, out: Array, shape, strides, offset):
     """
     Fills a section of an Array object with a specific scalar value.
@@ -246,10 +372,10 @@ def scalar_setitem(val, out: Array, shape, strides, offset):
     array([0., 0., 0., 0., 0., 0., 7., 8., 9.], dtype=float32)
     """
     
-    to_numpy(out, shape, strides, offset)[:] = val
+    _strided(out, shape, strides, offset)[:] = val
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 30
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 37
 def ewise_add(a: Array, b: Array, out: Array):
     """
     Performs an element-wise addition of two Array objects and assigns the result to a third Array object.
@@ -279,10 +405,10 @@ def ewise_add(a: Array, b: Array, out: Array):
     >>> print(out)
     array([5., 7., 9.], dtype=float32)
     """
-    out.array[:] = a.array + b.array
+    np.add(a.array, b.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 32
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 39
 def scalar_add(a: Array, val, out: Array):
     """
     Adds a scalar value to an Array object and assigns the result to another Array object.
@@ -312,10 +438,102 @@ def scalar_add(a: Array, val, out: Array):
     >>> print(out)
     array([6., 7., 8.], dtype=float32)
     """
-    out.array[:] = a.array + val
+    np.add(a.array, val, out=out.array)
+
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 41
+def ewise_sub(a: Array, b: Array, out: Array):
+    """
+    Performs an element-wise subtraction of two Array objects and assigns the result to a third Array object.
+
+    This function subtracts the underlying numpy array of `b` from that of `a` on an element-wise basis,
+    writing the result directly into the underlying numpy array of `out`.
+
+    Parameters
+    ----------
+    a : Array
+        The Array object to subtract from.
+    b : Array
+        The Array object to be subtracted.
+    out : Array
+        The Array object whose underlying numpy array is to be assigned the result.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> a = Array(3)
+    >>> a.array[:] = np.array([1, 2, 3])
+    >>> b = Array(3)
+    >>> b.array[:] = np.array([4, 6, 8])
+    >>> out = Array(3)
+    >>> ewise_sub(a, b, out)
+    >>> print(out)
+    array([-3., -4., -5.], dtype=float32)
+    """
+    np.subtract(a.array, b.array, out=out.array)
 
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 43
+def scalar_sub(a: Array, val, out: Array):
+    """
+    Subtracts a scalar value from an Array object and assigns the result to another Array object.
+
+    Parameters
+    ----------
+    a : Array
+        The Array object to subtract from.
+    val : scalar
+        The scalar value to be subtracted from `a.array`.
+    out : Array
+        The Array object whose underlying numpy array is to be assigned the result.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> a = Array(3)
+    >>> a.array[:] = np.array([1, 2, 3])
+    >>> out = Array(3)
+    >>> scalar_sub(a, 5, out)
+    >>> print(out)
+    array([-4., -3., -2.], dtype=float32)
+    """
+    np.subtract(a.array, val, out=out.array)
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 45
+def scalar_rsub(a: Array, val, out: Array):
+    """
+    Subtracts an Array object from a scalar value and assigns the result to another Array object.
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 34
+    Parameters
+    ----------
+    a : Array
+        The Array object to be subtracted.
+    val : scalar
+        The scalar value `a.array` is subtracted from.
+    out : Array
+        The Array object whose underlying numpy array is to be assigned the result.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> a = Array(3)
+    >>> a.array[:] = np.array([1, 2, 3])
+    >>> out = Array(3)
+    >>> scalar_rsub(a, 5, out)
+    >>> print(out)
+    array([4., 3., 2.], dtype=float32)
+    """
+    np.subtract(val, a.array, out=out.array)
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 47
 def ewise_mul(a: Array, b: Array, out: Array):
     """
     Performs an element-wise multiplication of two Array objects and assigns the result to a third Array object.
@@ -345,10 +563,10 @@ def ewise_mul(a: Array, b: Array, out: Array):
     >>> print(out)
     array([4., 10., 18.], dtype=float32)
     """
-    out.array[:] = a.array * b.array
+    np.multiply(a.array, b.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 36
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 49
 def scalar_mul(a: Array, val, out: Array):
     """
     Multiplies an Array object by a scalar value and assigns the result to another Array object.
@@ -378,10 +596,10 @@ def scalar_mul(a: Array, val, out: Array):
     >>> print(out)
     array([5., 10., 15.], dtype=float32)
     """
-    out.array[:] = a.array * val
+    np.multiply(a.array, val, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 38
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 51
 def ewise_div(a: Array, b: Array, out: Array):
     """
     Performs an element-wise division of two Array objects and assigns the result to a third Array object.
@@ -411,10 +629,10 @@ def ewise_div(a: Array, b: Array, out: Array):
     >>> print(out)
     array([0.25, 0.4 , 0.5 ], dtype=float32)
     """
-    out.array[:] = a.array / b.array
+    np.divide(a.array, b.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 40
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 53
 def scalar_div(a: Array, val, out: Array):
     """
     Divides an Array object by a scalar value and assigns the result to another Array object.
@@ -444,10 +662,10 @@ def scalar_div(a: Array, val, out: Array):
     >>> print(out)
     array([0.5, 1., 1.5], dtype=float32)
     """
-    out.array[:] = a.array / val
+    np.divide(a.array, val, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 42
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 55
 def scalar_power(a: Array, val, out: Array):
     """
     Raises an Array object to the power of a scalar value and assigns the result to another Array object.
@@ -477,10 +695,10 @@ def scalar_power(a: Array, val, out: Array):
     >>> print(out)
     array([1., 4., 9.], dtype=float32)
     """
-    out.array[:] = a.array ** val
+    np.power(a.array, val, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 44
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 57
 def ewise_maximum(a: Array, b: Array, out: Array):
     """
     Computes the element-wise maximum of two Array objects and assigns the result to a third Array object.
@@ -510,10 +728,10 @@ def ewise_maximum(a: Array, b: Array, out: Array):
     >>> print(out)
     array([4., 4., 6.], dtype=float32)
     """
-    out.array[:] = np.maximum(a.array, b.array)
+    np.maximum(a.array, b.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 46
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 59
 def scalar_maximum(a: Array, val, out: Array):
     """
     Computes the maximum of an Array object and a scalar value, and assigns the result to another Array object.
@@ -543,9 +761,9 @@ def scalar_maximum(a: Array, val, out: Array):
     >>> print(out)
     array([2., 2., 3.], dtype=float32)
     """
-    out.array[:] = np.maximum(a.array, val)
+    np.maximum(a.array, val, out=out.array)
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 48
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 61
 def ewise_eq(a: Array, b: Array, out: Array):
     """
     Performs an element-wise comparison for equality between two Array objects and assigns the result to a third Array object.
@@ -575,10 +793,10 @@ def ewise_eq(a: Array, b: Array, out: Array):
     >>> print(out)
     array([1., 1., 0.], dtype=float32)
     """
-    out.array[:] = (a.array == b.array).astype(np.float32)
+    np.equal(a.array, b.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 50
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 63
 def scalar_eq(a: Array, val, out: Array):
     """
     Compares an Array object with a scalar value for equality and assigns the result to another Array object.
@@ -608,10 +826,10 @@ def scalar_eq(a: Array, val, out: Array):
     >>> print(out)
     array([0., 1., 0.], dtype=float32)
     """
-    out.array[:] = (a.array == val).astype(np.float32)
+    np.equal(a.array, val, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 52
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 65
 def ewise_ge(a: Array, b: Array, out: Array):
     """
     Performs an element-wise comparison to check if elements of one Array object are greater than or equal to those of another Array object. The result is assigned to a third Array object.
@@ -641,10 +859,10 @@ def ewise_ge(a: Array, b: Array, out: Array):
     >>> print(out)
     array([1., 1., 1.], dtype=float32)
     """
-    out.array[:] = (a.array >= b.array).astype(np.float32)
+    np.greater_equal(a.array, b.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 54
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 67
 def scalar_ge(a: Array, val, out: Array):
     """
     Compares an Array object with a scalar value to check if elements in the Array object are greater than or equal to the scalar. The result is assigned to another Array object.
@@ -674,10 +892,73 @@ def scalar_ge(a: Array, val, out: Array):
     >>> print(out)
     array([0., 1., 1.], dtype=float32)
     """
-    out.array[:] = (a.array >= val).astype(np.float32)
+    np.greater_equal(a.array, val, out=out.array)
+
 
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 69
+def _ewise_strided(ufunc, a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """
+    Applies the numpy `ufunc` to strided views of `a` and `b`, writing straight into `out`.
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 56
+    Parameters
+    ----------
+    ufunc : numpy.ufunc
+        The binary operation.
+    a, b : Array
+        The operands.
+    out : Array
+        The Array object receiving the compact result of shape `shape`.
+    shape : tuple of ints
+        The shape of the result, which both operands are broadcast to.
+    a_strides, b_strides : tuple of ints
+        The strides of `a` and `b`, zero along broadcast dimensions.
+    a_offset, b_offset : int
+        The offsets of `a` and `b`.
+
+    Examples
+    --------
+    >>> a = Array(3)
+    >>> a.array[:] = np.array([1, 2, 3])
+    >>> b = Array(2)
+    >>> b.array[:] = np.array([10, 20])
+    >>> out = Array(6)
+    >>> _ewise_strided(np.add, a, b, out, (2, 3), (0, 1), 0, (1, 0), 0)
+    >>> print(out)
+    array([11., 12., 13., 21., 22., 23.], dtype=float32)
+    """
+    ufunc(_strided(a, shape, a_strides, a_offset), _strided(b, shape, b_strides, b_offset),
+          out=out.array.reshape(shape), casting='unsafe')
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 70
+def ewise_add_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """Adds two strided operands element-wise, see `_ewise_strided`."""
+    _ewise_strided(np.add, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+def ewise_sub_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """Subtracts the strided operand `b` from `a` element-wise, see `_ewise_strided`."""
+    _ewise_strided(np.subtract, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+def ewise_mul_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """Multiplies two strided operands element-wise, see `_ewise_strided`."""
+    _ewise_strided(np.multiply, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+def ewise_div_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """Divides the strided operand `a` by `b` element-wise, see `_ewise_strided`."""
+    _ewise_strided(np.divide, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+def ewise_maximum_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """Element-wise maximum of two strided operands, see `_ewise_strided`."""
+    _ewise_strided(np.maximum, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+def ewise_eq_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """1.0 where two strided operands are equal and 0.0 elsewhere, see `_ewise_strided`."""
+    _ewise_strided(np.equal, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+def ewise_ge_strided(a: Array, b: Array, out: Array, shape, a_strides, a_offset, b_strides, b_offset):
+    """1.0 where the strided operand `a` is greater or equal to `b` and 0.0 elsewhere, see `_ewise_strided`."""
+    _ewise_strided(np.greater_equal, a, b, out, shape, a_strides, a_offset, b_strides, b_offset)
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 73
 def ewise_log(a: Array, out: Array):
     """
     Computes the natural logarithm of each element in an Array object and assigns the result to another Array object.
@@ -705,10 +986,10 @@ def ewise_log(a: Array, out: Array):
     >>> print(out)
     array([0., 1., 2.], dtype=float32)
     """
-    out.array[:] = np.log(a.array)
+    np.log(a.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 58
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 75
 def ewise_exp(a: Array, out: Array):
     """
     Computes the exponential of each element in an Array object and assigns the result to another Array object.
@@ -736,10 +1017,10 @@ def ewise_exp(a: Array, out: Array):
     >>> print(out)
     array([1., 2.7182817, 7.389056], dtype=float32)
     """
-    out.array[:] = np.exp(a.array)
+    np.exp(a.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 64
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 81
 def ewise_tanh(a: Array, out: Array):
     """
     Computes the hyperbolic tangent of each element in an Array object and assigns the result to another Array object.
@@ -767,10 +1048,10 @@ def ewise_tanh(a: Array, out: Array):
     >>> print(out)
     array([0.        , 0.46211717, 0.7615942 ], dtype=float32)
     """
-    out.array[:] = np.tanh(a.array)
+    np.tanh(a.array, out=out.array)
 
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 69
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 86
 def reduce_max(a: Array, out: Array, reduce_size: int):
     """
     Computes the maximum of every `reduce_size` elements in an Array object and assigns the result to another Array object.
@@ -801,9 +1082,9 @@ def reduce_max(a: Array, out: Array, reduce_size: int):
     >>> print(out)
     array([3., 6.], dtype=float32)
     """
-    out.array[:] = a.array[:].reshape(-1, reduce_size).max(axis=1)
+    np.max(a.array.reshape(-1, reduce_size), axis=1, out=out.array)
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 73
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 90
 def reduce_sum(a: Array, out: Array, reduce_size: int):
     """
     Computes the sum of every `reduce_size` elements in an Array object and assigns the result to another Array object.
@@ -834,9 +1115,180 @@ def reduce_sum(a: Array, out: Array, reduce_size: int):
     >>> print(out)
     array([ 6., 15.], dtype=float32)
     """
-    out.array[:] = a.array[:].reshape(-1, reduce_size).sum(axis=1)
+    np.sum(a.array.reshape(-1, reduce_size), axis=1, dtype=_accumulator(a.array), out=out.array)
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 92
+def reduce_sum_strided(a: Array, out: Array, shape, strides, offset, reduce_ndim: int):
+    """
+    Sums the strided view of `a` over its last `reduce_ndim` dimensions, writing straight into `out`.
+
+    The view is read in place, so a reduction over any set of axes only needs those axes permuted
+    to the end of the view rather than a compact copy.
+
+    Parameters
+    ----------
+    a : Array
+        The Array object to reduce.
+    out : Array
+        The Array object receiving the compact result over the leading dimensions of the view.
+    shape : tuple of ints
+        The shape of the view.
+    strides : tuple of ints
+        The strides of the view.
+    offset : int
+        The offset of the view.
+    reduce_ndim : int
+        The number of trailing dimensions to reduce.
+
+    Examples
+    --------
+    >>> a = Array(6)
+    >>> a.array[:] = np.array([1, 2, 3, 4, 5, 6])
+    >>> out = Array(3)
+    >>> reduce_sum_strided(a, out, (3, 2), (1, 3), 0, 1)
+    >>> print(out)
+    array([5., 7., 9.], dtype=float32)
+    """
+    view = _strided(a, shape, strides, offset)
+    np.sum(view, axis=tuple(range(len(shape) - reduce_ndim, len(shape))), dtype=_accumulator(view),
+           out=out.array.reshape(shape[:len(shape) - reduce_ndim]))
 
-# %% ../nbs/07_ndarray_backend_numpy.ipynb 78
+def reduce_max_strided(a: Array, out: Array, shape, strides, offset, reduce_ndim: int):
+    """Maximum of the strided view of `a` over its last `reduce_ndim` dimensions, see `reduce_sum_strided`."""
+    view = _strided(a, shape, strides, offset)
+    np.max(view, axis=tuple(range(len(shape) - reduce_ndim, len(shape))),
+           out=out.array.reshape(shape[:len(shape) - reduce_ndim]))
+
+# views are reduced to their moments in blocks of about this many elements, so temporaries stay small for any shape
+_MEAN_VAR_BLOCK = 1 << 16
+
+def reduce_mean_var_strided(a: Array, mean: Array, var: Array, shape, strides, offset, reduce_ndim: int):
+    """
+    Mean and population variance of the strided view of `a` over its last `reduce_ndim` dimensions,
+    see `reduce_sum_strided`. As in the cpu backend the view is read once: running sums of its elements
+    and of their squares, shifted by the first element of each reduction, are accumulated in float64
+    over blocks of `_MEAN_VAR_BLOCK` elements.
+
+    Examples
+    --------
+    >>> a = Array(4)
+    >>> a.array[:] = np.array([1, 2, 3, 5])
+    >>> mean, var = Array(2), Array(2)
+    >>> reduce_mean_var_strided(a, mean, var, (2, 2), (2, 1), 0, 1)
+    >>> print(mean, var)
+    array([1.5, 4. ], dtype=float32) array([0.25, 1.  ], dtype=float32)
+    """
+    view = _strided(a, shape, strides, offset)
+    ndim = len(shape)
+    axis, kept = tuple(range(ndim - reduce_ndim, ndim)), shape[:ndim - reduce_ndim]
+    n = int(np.prod(shape[ndim - reduce_ndim:]))
+    shift = view[(Ellipsis,) + (slice(0, 1),) * reduce_ndim]
+    total, sum_sq = np.zeros(kept), np.zeros(kept)
+    # the blocks are slices of the outermost dimension in memory whose slices fit in a block, so they are
+    # read in memory order, or else of the longest dimension, which keeps them small whatever the shape
+    fits = [d for d in range(ndim) if view.size <= _MEAN_VAR_BLOCK * shape[d]]
+    split = (max(fits, key=lambda d: abs(strides[d])) if fits
+             else max(range(ndim), key=lambda d: shape[d], default=None))
+    if split is None:
+        blocks = [(Ellipsis,)]
+    else:
+        step = max(1, _MEAN_VAR_BLOCK * shape[split] // max(view.size, 1))
+        blocks = [(slice(None),) * split + (slice(start, start + step),) for start in range(0, shape[split], step)]
+    for block in blocks:
+        out = () if split is None or split in axis else block
+        # the shift keeps sum_sq / n - m^2 from cancelling when the mean is large against the spread
+        d = np.subtract(view[block], shift[out], dtype=_accumulator(view))
+        total[out] += d.sum(axis=axis)
+        sum_sq[out] += np.square(d, out=d).sum(axis=axis)
+    m = total / n
+    np.add(shift.reshape(kept), m, out=mean.array.reshape(kept), casting='unsafe')
+    np.maximum(sum_sq / n - m * m, 0, out=var.array.reshape(kept), casting='unsafe')
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 95
+def _check_targets(target: np.ndarray, classes: int):
+    if not (np.all((target >= 0) & (target < classes)) and np.all(target == np.floor(target))):
+        raise ValueError("Targets must be class indices in [0, classes)")
+
+# rows are processed in blocks of about this many elements, so that temporaries stay small for any number of classes
+_LOG_SOFTMAX_BLOCK = 1 << 16
+
+def log_softmax_nll(logits: Array, target: Array, loss: Array, lse: Array, batch: int, classes: int):
+    """
+    Cross-entropy of rows of logits against class indices, `logsumexp(z_i) - z_i[t_i]`.
+
+    The log-softmax is never materialized: every row is reduced to its log-sum-exp, shifted by its
+    maximum, a block of rows at a time.
+
+    Parameters
+    ----------
+    logits : Array
+        The batch x classes logits.
+    target : Array
+        The class index of each row, stored as floats.
+    loss : Array
+        The Array object receiving the loss of each row.
+    lse : Array
+        The Array object receiving the log-sum-exp of each row, for `log_softmax_nll_backward`.
+    batch : int
+        The number of rows.
+    classes : int
+        The number of classes.
+
+    Examples
+    --------
+    >>> logits = Array(4)
+    >>> logits.array[:] = np.array([0, 0, 1000, 0])
+    >>> target = Array(2)
+    >>> target.array[:] = np.array([1, 1])
+    >>> loss, lse = Array(2), Array(2)
+    >>> log_softmax_nll(logits, target, loss, lse, 2, 2)
+    >>> print(loss)
+    array([6.931472e-01, 1.000000e+03], dtype=float32)
+    """
+    z = logits.array[:batch * classes].reshape(batch, classes)
+    t = target.array[:batch]
+    _check_targets(t, classes)
+    step = max(1, _LOG_SOFTMAX_BLOCK // max(classes, 1))
+    for start in range(0, batch, step):
+        block = z[start:start + step].astype(np.float32, copy=False)
+        row_max = block.max(axis=1)
+        shifted = np.exp(block - row_max[:, None])
+        np.add(np.log(shifted.sum(axis=1)), row_max, out=lse.array[start:start + len(block)])
+    np.subtract(lse.array[:batch], z[np.arange(batch), t.astype(np.int64)], out=loss.array[:batch])
+
+def log_softmax_nll_backward(logits: Array, target: Array, lse: Array, grad_loss: Array, out: Array,
+                             batch: int, classes: int):
+    """
+    Gradient of `log_softmax_nll` with respect to the logits, `g_i * (softmax(z_i) - onehot(t_i))`,
+    computed in place in `out`.
+
+    Parameters
+    ----------
+    logits : Array
+        The batch x classes logits.
+    target : Array
+        The class index of each row, stored as floats.
+    lse : Array
+        The log-sum-exp of each row computed by `log_softmax_nll`.
+    grad_loss : Array
+        The gradient of each row's loss.
+    out : Array
+        The Array object receiving the batch x classes gradient.
+    batch : int
+        The number of rows.
+    classes : int
+        The number of classes.
+    """
+    z = logits.array[:batch * classes].reshape(batch, classes)
+    t = target.array[:batch]
+    _check_targets(t, classes)
+    grad = out.array[:batch * classes].reshape(batch, classes)
+    np.subtract(z, lse.array[:batch, None], out=grad)
+    np.exp(grad, out=grad)
+    grad[np.arange(batch), t.astype(np.int64)] -= 1
+    grad *= grad_loss.array[:batch, None]
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 101
 def matmul(a: Array, b: Array, out: Array, m: int, n: int, p: int):
     """
     Performs matrix multiplication between two Array objects and assigns the result to another Array object.
@@ -869,4 +1321,46 @@ def matmul(a: Array, b: Array, out: Array, m: int, n: int, p: int):
     >>> print(out)
     array([ 58.,  64., 139., 154.], dtype=float32)
     """
-    out.array[:] = (a.array.reshape(m, n) @ b.array.reshape(n, p)).reshape(-1)
+    _matmul(a.array.reshape(m, n), b.array.reshape(n, p), out.array.reshape(m, p))
+
+# %% ../nbs/07_ndarray_backend_numpy.ipynb 104
+def matmul_batched(a: Array, b: Array, out: Array, batch_shape, a_strides, a_offset, b_strides, b_offset, m: int, n: int, p: int):
+    """
+    Multiplies two stacks of strided matrices, broadcasting over the batch dimensions.
+
+    `a` and `b` are read through `to_numpy` views of shape `batch_shape + (m, n)` and `batch_shape + (n, p)`,
+    where a batch dimension that is broadcast has a zero stride, so neither operand is copied or compacted.
+    The products are written straight into `out`.
+
+    Parameters
+    ----------
+    a, b : Array
+        The Array objects to be multiplied.
+    out : Array
+        The Array object receiving the compact result, of shape `batch_shape + (m, p)`.
+    batch_shape : tuple of ints
+        The broadcast shape of the batch dimensions.
+    a_strides, b_strides : tuple of ints
+        The strides of `a` and `b`, one per batch dimension followed by the row and column strides.
+    a_offset, b_offset : int
+        The offsets of `a` and `b`.
+    m, n, p : int
+        The dimensions of each product.
+
+    Returns
+    -------
+    None
+
+    Examples
+    --------
+    >>> a = Array(6)
+    >>> a.array[:] = np.array([1, 2, 3, 4, 5, 6])
+    >>> out = Array(8)
+    >>> matmul_batched(a, a, out, (2,), (0, 3, 1), 0, (3, 2, 1), 0, 2, 1, 2)
+    >>> print(out)
+    array([ 1.,  2.,  4.,  8.,  4.,  5., 16., 20.], dtype=float32)
+    """
+    batch_shape = tuple(batch_shape)
+    _matmul(_strided(a, batch_shape + (m, n), a_strides, a_offset),
+            _strided(b, batch_shape + (n, p), b_strides, b_offset),
+            out.array.reshape(batch_shape + (m, p)))
@@ -1,8 +1,8 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/03_nn.ipynb.
 
 # %% auto 0
-__all__ = ['Parameter', 'Module', 'Sequential', 'Linear', 'Flatten', 'ReLU', 'Sigmoid', 'CrossEntropyLoss', 'Softmax',
-           'LayerNorm1d', 'BatchNorm1d', 'Dropout', 'Residual', 'Identity']
+__all__ = ['Parameter', 'Module', 'ParameterArena', 'Sequential', 'Linear', 'Flatten', 'ReLU', 'Sigmoid', 'CrossEntropyLoss',
+           'Softmax', 'LayerNorm1d', 'BatchNorm1d', 'Dropout', 'Residual', 'Identity']
 
 # %% ../nbs/03_nn.ipynb 2
 from typing import List, Callable, Any, Tuple
@@ -10,8 +10,9 @@ from .autograd import Tensor
 from . import operators
 import minima.init as init
 import numpy as np
+import weakref
 import minima as mi
-import torch
+from .utility import float_dtype, numpy_dtype
 
 # %% ../nbs/03_nn.ipynb 3
 class Parameter(Tensor):
@@ -22,7 +23,44 @@ class Parameter(Tensor):
     `Module` s - when they're assigned as Module attributes they are automatically added
     to the list of its parameters, and will appear in `Module.parameters()` iterator.
     Another difference is that parameters can't be volatile and that they require gradient by default.
+
+    Once their module is flattened by `Module.flatten_parameters`, the data and the gradient of a parameter
+    are views of its `ParameterArena`: assigning either copies the new values into the arena.
+    Such an assignment keeps the data the same array, so `_version` counts the assignments to the data.
     """
+    arena = None
+    _data_view = None
+    _grad_view = None
+    _grad = None
+    _version = 0
+
+    @property
+    def data(self):
+        return self.detach()
+
+    @data.setter
+    def data(self, value):
+        Tensor.data.fset(self, value)
+        self._version += 1
+        if self._data_view is not None and self.cached_data is not self._data_view:
+            self._data_view[...] = self.cached_data
+            self.cached_data = self._data_view
+
+    @property
+    def grad(self):
+        return self._grad
+
+    @grad.setter
+    def grad(self, value):
+        view = self._grad_view
+        if view is not None:
+            # the arena holds zeros for the parameters without a gradient, so that it can be reduced as a whole
+            if value is None:
+                view[...] = 0
+            elif value.compute_cached_data() is not view:
+                view[...] = value.cached_data
+                value = self.create_detached_tensor(view)
+        self._grad = value
 
 # %% ../nbs/03_nn.ipynb 4
 def _unpack_params(value: object) -> List[Tensor]:
@@ -56,6 +94,32 @@ def _unpack_params(value: object) -> List[Tensor]:
         return [item for v in value for item in _unpack_params(v)]
     return []
 
+def _containers(value: object) -> List[Tuple[object, Tuple[int, ...]]]:
+    """
+    The lists and dicts that `_unpack_params` walks from `value`, each with the ids of the items it holds,
+    which change when one of them is mutated in place.
+    """
+    if isinstance(value, Parameter):
+        return []
+    if isinstance(value, Module):
+        return [c for v in value.__dict__.values() for c in _containers(v)]
+    if isinstance(value, dict):
+        return [(value, tuple(map(id, value.values())))] + [c for v in value.values() for c in _containers(v)]
+    if isinstance(value, (list, tuple)):
+        own = [(value, tuple(map(id, value)))] if isinstance(value, list) else []
+        return own + [c for v in value for c in _containers(v)]
+    return []
+
+def _holds_params(value: object) -> bool:
+    """Whether `value` is a `Parameter` or a `Module`, or a `dict`, `list` or `tuple` holding one."""
+    if isinstance(value, (Parameter, Module)):
+        return True
+    if isinstance(value, dict):
+        return any(_holds_params(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_holds_params(v) for v in value)
+    return False
+
 # %% ../nbs/03_nn.ipynb 5
 def _child_modules(value: object) -> List["Module"]:
     """
@@ -95,6 +159,10 @@ def _child_modules(value: object) -> List["Module"]:
         return []
 
 # %% ../nbs/03_nn.ipynb 6
+# bumped by every assignment that may add or remove parameters, which invalidates the caches of `Module.parameters`
+_PARAMS_VERSION = 0
+_PARAMS_CACHE = weakref.WeakKeyDictionary()
+
 class Module:
     
     """
@@ -107,6 +175,8 @@ class Module:
 
     Methods:
     - `parameters()`: Returns a list of all `Parameter` instances in the module.
+    - `flatten_parameters()`: Moves the parameters and their gradients into one contiguous `ParameterArena`.
+    - `astype(dtype)`: Converts the parameters to another dtype, e.g. 16-bit floats for mixed-precision training.
     - `_children()`: Returns a list of all child `Module` instances.
     - `eval()`: Switches the module and all its children to evaluation mode.
     - `train()`: Switches the module and all its children back to training mode.
@@ -118,12 +188,60 @@ class Module:
         self.forward_hooks = []
         self.backward_hooks = []
 
+    def __setattr__(self, name, value):
+        global _PARAMS_VERSION
+        if _holds_params(value) or _holds_params(self.__dict__.get(name)):
+            _PARAMS_VERSION += 1
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        global _PARAMS_VERSION
+        if _holds_params(self.__dict__.get(name)):
+            _PARAMS_VERSION += 1
+        object.__delattr__(self, name)
+
     def parameters(self) -> List[Parameter]:
         """
         Returns a list of all `Parameter` instances in the module.
         This is done by unpacking the parameters from the module's dictionary.
+
+        A parameter reachable through several attributes is listed once. The list is cached until an
+        attribute holding parameters or modules is assigned or deleted, on any module, or one of the lists
+        and dicts it was collected from is mutated in place.
         """
-        return _unpack_params(self.__dict__)
+        version, containers, params = _PARAMS_CACHE.get(self, (None, None, None))
+        if version != _PARAMS_VERSION or any(tuple(map(id, c.values() if isinstance(c, dict) else c)) != ids
+                                             for c, ids in containers):
+            seen = set()
+            params = [p for p in _unpack_params(self.__dict__) if id(p) not in seen and not seen.add(id(p))]
+            _PARAMS_CACHE[self] = (_PARAMS_VERSION, _containers(self), params)
+        return list(params)
+
+    def flatten_parameters(self) -> "ParameterArena":
+        """
+        Moves the parameters of the module and their gradients into one `ParameterArena`, and returns it.
+
+        Optimizers built on the module afterwards with `foreach=True` step the arena directly.
+        """
+        return ParameterArena(self.parameters())
+
+    def astype(self, dtype) -> "Module":
+        """
+        Converts the parameters of the module to `dtype`, "float32", "float16" or "bfloat16", and returns the module.
+
+        Their gradients are dropped, and parameters that were in a `ParameterArena` are moved into a new
+        one of `dtype`. Optimizers keep float32 master weights for 16-bit parameters, so build them afterwards.
+        """
+        dtype = numpy_dtype(float_dtype(dtype))
+        params = self.parameters()
+        flattened = any(p.arena is not None for p in params)
+        for p in params:
+            p.arena, p._data_view, p._grad_view = None, None, None
+            p.cached_data = p.compute_cached_data().astype(dtype)
+            p.grad = None
+        if flattened:
+            ParameterArena(params)
+        return self
 
     def _children(self) -> List["Module"]:
         """
@@ -240,6 +358,52 @@ class Module:
 
 
 # %% ../nbs/03_nn.ipynb 8
+class ParameterArena:
+    """
+    Contiguous storage of parameters and of their gradients.
+
+    `data` and `grad` hold the parameters back to back, in the order of `params`. The data of each
+    parameter becomes a view of its slice of `data`, and the gradients assigned to it are copied into its
+    slice of `grad`, which holds zeros while the parameter has no gradient. Gradients are copied detached,
+    and the next backward pass overwrites them.
+
+    Attributes:
+    - `params` (list of `Parameter`): The parameters, each one once.
+    - `offsets` (list of int): The start of the slice of each parameter, followed by the total size.
+    - `data`, `grad` (numpy arrays): The flat buffers.
+    - `views`, `grad_views` (lists of numpy arrays): The slices of each parameter, in its shape.
+    """
+    def __init__(
+        self,
+        params # The parameters to move into the arena, of a single dtype.
+    ):
+        seen = set()
+        self.params = [p for p in params if id(p) not in seen and not seen.add(id(p))]
+        dtypes = {p.dtype for p in self.params}
+        if len(dtypes) > 1:
+            raise ValueError(f"an arena holds parameters of a single dtype, got {sorted(map(str, dtypes))}")
+        dtype = dtypes.pop() if dtypes else np.float32
+        sizes = [int(np.prod(p.shape)) for p in self.params]
+        self.offsets = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))).tolist()
+        self.data = np.empty(self.offsets[-1], dtype)
+        self.grad = np.zeros_like(self.data)
+        self.views, self.grad_views = [], []
+        for p, start, stop in zip(self.params, self.offsets, self.offsets[1:]):
+            view, grad_view = self.data[start:stop].reshape(p.shape), self.grad[start:stop].reshape(p.shape)
+            view[...] = p.compute_cached_data()
+            p.arena, p._data_view, p._grad_view = self, view, grad_view
+            p.cached_data = view
+            p.grad = p.grad
+            self.views.append(view)
+            self.grad_views.append(grad_view)
+
+    def __len__(self):
+        return self.offsets[-1]
+
+    def __repr__(self):
+        return f'ParameterArena(params={len(self.params)}, size={len(self)}, dtype={self.data.dtype})'
+
+# %% ../nbs/03_nn.ipynb 10
 class Sequential(Module):
     """
     A sequential container in Minima.
@@ -298,7 +462,7 @@ class Sequential(Module):
         raise StopIteration()
 
 
-# %% ../nbs/03_nn.ipynb 9
+# %% ../nbs/03_nn.ipynb 11
 class Linear(Module):
     """
     A class representing a fully connected (linear) layer in a neural network.
@@ -342,7 +506,7 @@ class Linear(Module):
         self.dtype = dtype
 
         self.weight = Parameter(init.kaiming_uniform(fan_in=in_features, fan_out=out_features, device=device, dtype=dtype))
-        self.bias = (Parameter(init.kaiming_uniform(fan_in=out_features, fan_out=1, device=device, dtype=dtype)).reshape((1, out_features))
+        self.bias = (Parameter(init.kaiming_uniform(fan_in=out_features, fan_out=1, device=device, dtype=dtype).reshape((1, out_features)))
                      if bias else None)
         
     def __repr__(self) -> str:
@@ -364,10 +528,10 @@ class Linear(Module):
         """
         
         out = X @ self.weight
-        out = out + self.bias.broadcast_to(out.shape) if self.bias else out
+        out = out + self.bias.broadcast_to(out.shape) if self.bias is not None else out
         return out
 
-# %% ../nbs/03_nn.ipynb 14
+# %% ../nbs/03_nn.ipynb 19
 class Flatten(Module):
     """
     A `Flatten` module in Minima.
@@ -393,17 +557,17 @@ class Flatten(Module):
         return X.reshape((X.shape[0], -1))
 
 
-# %% ../nbs/03_nn.ipynb 15
+# %% ../nbs/03_nn.ipynb 20
 class ReLU(Module):
     def forward(self, x: Tensor) -> Tensor:
         return operators.relu(x)
 
-# %% ../nbs/03_nn.ipynb 16
+# %% ../nbs/03_nn.ipynb 21
 class Sigmoid(Module):
     def forward(self, x: Tensor) -> Tensor:
         return 1 / (1 + operators.exp(-x))
 
-# %% ../nbs/03_nn.ipynb 26
+# %% ../nbs/03_nn.ipynb 32
 class CrossEntropyLoss(Module):
     """
     Cross-entropy loss module in Minima.
@@ -438,20 +602,18 @@ class CrossEntropyLoss(Module):
         Returns:
             Tensor: A single tensor that is the average cross-entropy loss.
         """
-        log_sum_exp_logits = operators.summation(operators.logsumexp(input, axes=(1, )))
-        true_class_logits_sum = operators.summation(input * init.one_hot(input.shape[1], target))
-        return (log_sum_exp_logits - true_class_logits_sum) / input.shape[0]
+        # the fused op takes the class indices as they are and keeps only O(batch) values for the backward pass
+        return operators.summation(operators.log_softmax_nll(input, target)) / input.shape[0]
 
-# %% ../nbs/03_nn.ipynb 27
+# %% ../nbs/03_nn.ipynb 33
 class Softmax(Module):
     """
-    Cross-entropy loss module in Minima.
+    Softmax module in Minima.
 
-    This module computes the Cross Entropy Loss between the input logits and the target classes. 
-    It's useful in classification tasks where the model outputs probabilities for each class.
+    This module rescales the input logits along a dimension into probabilities that sum to one.
 
     Methods:
-    - `forward(input: Tensor, target: Tensor) -> Tensor`: Calculates the cross-entropy loss between the input (logits) and the target (class indices).
+    - `forward(input: Tensor, dim: int = 1) -> Tensor`: Calculates the softmax of the input along `dim`.
 
     Example:
     ```python
@@ -459,31 +621,31 @@ class Softmax(Module):
         Linear(10, 20),
         ReLU(),
         Linear(20, 10),
+        Softmax(),
     )
-    loss_fn = CrossEntropyLoss()
-    output = model(input_tensor)  # compute model output
-    loss = loss_fn(output, target_tensor)  # compute loss
+    probs = model(input_tensor)  # compute class probabilities
     ```
     """
 
     def forward(self, input: Tensor, dim=1) -> Tensor:
         """
-        Computes the Cross Entropy Loss between the input logits and the target class indices.
+        Computes the softmax of the input along `dim`.
 
         Args:
             input (Tensor): The input tensor. The logits, typically of shape (batch_size, num_classes).
-            target (Tensor): The target tensor. The correct class indices, typically of shape (batch_size).
+            dim (int): The dimension along which the probabilities sum to one.
 
         Returns:
-            Tensor: A single tensor that is the average cross-entropy loss.
+            Tensor: The probabilities, of the same shape as the input.
         """
+        # softmax doesn't change when a row is shifted, subtracting its maximum keeps exp from overflowing
+        shift = input.compute_cached_data().max(axis=dim, keepdims=True)
+        exps = operators.exp(input - operators.broadcast_to(Tensor(shift, requires_grad=False), input.shape))
+        exps_sum = operators.summation(exps, axes=(dim,))
+        return exps / operators.broadcast_to(operators.reshape(exps_sum, shape=shift.shape), shape=exps.shape)
 
-        # import pdb; pdb.set_trace()
-        exps = operators.exp(input)
-        exps_sum = operators.summation(exps, axes=(1,))
-        return exps / operators.broadcast_to(operators.reshape(exps_sum, shape=exps_sum.shape + (1,)), shape=exps.shape)
 
-# %% ../nbs/03_nn.ipynb 38
+# %% ../nbs/03_nn.ipynb 44
 class LayerNorm1d(Module):
     """
     1D Layer normalization module in Minima.
@@ -533,16 +695,11 @@ class LayerNorm1d(Module):
         Returns:
             Tensor: The output tensor after applying layer normalization.
         """
-        bs, fs = x.shape
-        axes = (-1,)
-        mean = x.sum(axes=axes).reshape((bs, 1)) / fs
-        x_centered = x - mean.broadcast_to(x.shape)
-        std = ((x_centered ** 2).sum(axes=axes).reshape((bs, 1)) / fs + self.eps) ** 0.5
-        x_normed = x_centered / std.broadcast_to(x.shape)
+        x_normed = operators.normalize(x, (-1,), self.eps)
         return self.weight.broadcast_to(x.shape) * x_normed + self.bias.broadcast_to(x.shape)
 
 
-# %% ../nbs/03_nn.ipynb 41
+# %% ../nbs/03_nn.ipynb 47
 class BatchNorm1d(Module):
     """
     1D Batch normalization module in Minima.
@@ -558,8 +715,14 @@ class BatchNorm1d(Module):
     - `running_mean` (Tensor): The running mean. Represents the mean of the features over batches. Initialized with zeros.
     - `running_std` (Tensor): The running standard deviation. Represents the standard deviation of the features over batches. Initialized with ones.
 
+    A training forward doesn't compute anything by itself, so in `LAZY_MODE` the normalization stays
+    in the fused graph of the batch. Its moments are folded into the running statistics when those
+    are next read, or at the next training forward. If the output of the batch is still pending then,
+    it is evaluated at that point.
+
     Methods:
-    - `update_stats(x: Tensor) -> Tuple[Tensor, Tensor]`: Calculates the mean and standard deviation of the input tensor.
+    - `update_stats(mean: Tensor, var: Tensor)`: Folds the mean and variance of a batch into the running statistics.
+      Called with the input `x` of a batch alone, it computes its moments first and returns them.
     - `forward(x: Tensor) -> Tensor`: Applies batch normalization to the input tensor.
 
     Example:
@@ -596,32 +759,65 @@ class BatchNorm1d(Module):
         self.weight = Parameter(init.ones(dim, device=device, dtype=dtype, requires_grad=True))
         self.bias = Parameter(init.zeros(dim, device=device, dtype=dtype, requires_grad=True))
         
-        self.running_mean = Tensor(init.zeros(dim, device=device, dtype=dtype))
-        self.running_std = Tensor(init.ones(dim, device=device, dtype=dtype))
-        
-    def update_stats(self, x: Tensor) -> Tuple[Tensor, Tensor]:
-        """
-        Updates the running mean and running variance of the input tensor.
+        self._running_mean = Tensor(init.zeros(dim, device=device, dtype=dtype))
+        self._running_std = Tensor(init.ones(dim, device=device, dtype=dtype))
+        # the Normalize op and the output of the last training batch, until its moments are folded in
+        self._pending = None
+
+    @property
+    def running_mean(self) -> Tensor:
+        self._fold_pending()
+        return self._running_mean
+
+    @running_mean.setter
+    def running_mean(self, value: Tensor):
+        self._fold_pending()
+        self._running_mean = value
+
+    @property
+    def running_std(self) -> Tensor:
+        self._fold_pending()
+        return self._running_std
+
+    @running_std.setter
+    def running_std(self, value: Tensor):
+        self._fold_pending()
+        self._running_std = value
+
+    def _fold_pending(self):
+        "Folds the moments of the last training batch into the running statistics, computing its output if needed."
+        if self._pending is None:
+            return
+        (op, x_normed), self._pending = self._pending, None
+        if getattr(op, 'mean', None) is None:
+            x_normed.compute_cached_data()
+        # the input may have been freed by a lean backward since, the moments have its dtype
+        moment = lambda m: Tensor(m.reshape(self.dim), device=self.weight.device, requires_grad=False)
+        self.update_stats(moment(op.mean), moment(op.var))
+
+    def update_stats(self, mean: Tensor, var: Tensor = None):
+        """
+        Updates the running mean and running variance with the moments of a batch.
         
         Parameters:
         ----------
-        x : Tensor
-            Input tensor.
-        
+        mean : Tensor
+            Mean of the batch, per feature, or the input of the batch when `var` is not given.
+        var : Tensor
+            Variance of the batch, per feature.
+
         Returns:
         ----------
         Tuple[Tensor, Tensor]
-            Mean and variance of the input tensor.
+            The mean and variance of the batch, computed when it was given as its input.
         """
-
-        bs, fs = x.shape
-        axes=(0,)
-        mean = x.sum(axes=axes) / bs
-        x_centered = x - mean.broadcast_to(x.shape)
-        std = ((x_centered ** 2).sum(axes=axes) / bs)
-        self.running_mean = self.momentum * mean.data  + (1 - self.momentum) * self.running_mean
-        self.running_std = self.momentum * std.data + (1 - self.momentum) * self.running_std
-        return mean,std
+        if var is None:
+            x = mean
+            moments = operators._mean_var(x.compute_cached_data(), (0,))
+            mean, var = (Tensor(m.reshape(self.dim), device=x.device, dtype=x.dtype, requires_grad=False) for m in moments)
+        self.running_mean = self.momentum * mean + (1 - self.momentum) * self.running_mean
+        self.running_std = self.momentum * var + (1 - self.momentum) * self.running_std
+        return mean, var
 
     def forward(self, x: Tensor) -> Tensor:
         """
@@ -641,13 +837,17 @@ class BatchNorm1d(Module):
         """
         
         if self.training:
-            mean, std = self.update_stats(x)
+            # both moments of the batch come from the one pass of the op, which keeps them for the running stats
+            self._fold_pending()
+            op = operators.Normalize((0,), self.eps)
+            x_normed = op(x)
+            self._pending = (op, x_normed)
         else:
-            mean, std = self.running_mean, self.running_std
-        x_normed = (x - mean.broadcast_to(x.shape)) / (std.broadcast_to(x.shape) + self.eps) ** .5
+            mean, var = self.running_mean, self.running_std
+            x_normed = (x - mean.broadcast_to(x.shape)) / (var.broadcast_to(x.shape) + self.eps) ** .5
         return self.weight.broadcast_to(x.shape) * x_normed + self.bias.broadcast_to(x.shape)
 
-# %% ../nbs/03_nn.ipynb 42
+# %% ../nbs/03_nn.ipynb 49
 class Dropout(Module):
     """
     Dropout Layer for a Neural Network.
@@ -700,7 +900,7 @@ class Dropout(Module):
         return x
 
 
-# %% ../nbs/03_nn.ipynb 43
+# %% ../nbs/03_nn.ipynb 50
 class Residual(Module):
     """
     Residual Layer for a Neural Network.
@@ -745,7 +945,7 @@ class Residual(Module):
         """
         return x + self.fn(x)
 
-# %% ../nbs/03_nn.ipynb 44
+# %% ../nbs/03_nn.ipynb 51
 class Identity(Module):
     def forward(self, x):
         return x
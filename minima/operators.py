@@ -4,7 +4,8 @@
 __all__ = ['EWiseAdd', 'add', 'AddScalar', 'add_scalar', 'EWiseMul', 'multiply', 'MulScalar', 'mul_scalar', 'EWiseDiv', 'divide',
            'DivScalar', 'divide_scalar', 'Negate', 'negate', 'Exp', 'exp', 'ReLU', 'relu', 'PowerScalar',
            'power_scalar', 'Transpose', 'transpose', 'Reshape', 'reshape', 'MatMul', 'matmul', 'Summation', 'summation',
-           'BroadcastTo', 'broadcast_to', 'LogSumExp', 'logsumexp']
+           'BroadcastTo', 'broadcast_to', 'LogSumExp', 'logsumexp', 'Normalize', 'normalize', 'LogSoftmaxNLL',
+           'log_softmax_nll', 'AsType', 'astype']
 
 # %% ../nbs/01_operators.ipynb 2
 """Operator implementations."""
@@ -16,12 +17,16 @@ from .autograd import Operator, Tensor, Value, TensorOp, Tuple, Union
 from collections import namedtuple
 from typing import NamedTuple
 import numpy
-import torch
+from .utility import numpy_dtype
 
 # NOTE: we will import numpy as the ARRAY_API
 # as the backend for our computations, this line will change in later homeworks
 import numpy as ARRAY_API
 
+def _is_half(x) -> bool:
+    "Whether `x` is a numpy array of 16-bit floats, which reductions and products accumulate in float32."
+    return isinstance(x, numpy.ndarray) and x.dtype.itemsize == 2 and x.dtype.kind in 'fV'
+
 # %% ../nbs/01_operators.ipynb 8
 class EWiseAdd(TensorOp):
     """
@@ -35,7 +40,9 @@ class EWiseAdd(TensorOp):
     >>> print(result)
     Tensor([5, 7, 9])
     """
-    
+    grad_reads_inputs = False
+    grad_reads_output = False
+
     def compute(self, a: NDArray, b: NDArray) -> NDArray:
         """
         Computes the element-wise sum of two tensors.
@@ -49,6 +56,12 @@ class EWiseAdd(TensorOp):
         """
         return a + b
 
+    def compute_into(self, a: NDArray, b: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the element-wise sum of two tensors into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.add(a, b, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, Tensor]:
         """
         Computes the gradient of the element-wise addition operation.
@@ -87,6 +100,9 @@ class AddScalar(TensorOp):
     >>> print(result)
     Tensor([6, 7, 8])
     """
+    grad_reads_inputs = False
+    grad_reads_output = False
+
     def __init__(self, scalar: Union[int, float]):
         """
         Initializes the operation with a scalar.
@@ -108,6 +124,12 @@ class AddScalar(TensorOp):
         """
         return a + self.scalar
 
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the sum of a tensor and the scalar into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.add(a, self.scalar, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor]:
         """
         Computes the gradient of the addition operation.
@@ -147,6 +169,8 @@ class EWiseMul(TensorOp):
     >>> print(result)
     Tensor([4, 10, 18])
     """
+    grad_reads_output = False
+
     def compute(self, a: NDArray, b: NDArray) -> NDArray:
         """
         Computes the element-wise product of two tensors.
@@ -160,6 +184,12 @@ class EWiseMul(TensorOp):
         """
         return a * b
 
+    def compute_into(self, a: NDArray, b: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the element-wise product of two tensors into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.multiply(a, b, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, Tensor]:
         """
         Computes the gradient of the element-wise multiplication operation.
@@ -199,6 +229,9 @@ class MulScalar(TensorOp):
     >>> print(result)
     Tensor([5, 10, 15])
     """
+    grad_reads_inputs = False
+    grad_reads_output = False
+
     def __init__(self, scalar: Union[int, float]):
         """
         Initializes the operation with a scalar.
@@ -220,6 +253,12 @@ class MulScalar(TensorOp):
         """
         return a * self.scalar
 
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the product of a tensor and the scalar into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.multiply(a, self.scalar, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor]:
         """
         Computes the gradient of the multiplication operation.
@@ -261,6 +300,7 @@ class EWiseDiv(TensorOp):
         array([0.25, 0.4, 0.5])
 
     """
+    grad_reads_output = False
 
     def compute(self, a: NDArray, b: NDArray) -> NDArray:
         """
@@ -275,6 +315,12 @@ class EWiseDiv(TensorOp):
         """
         return a / b
 
+    def compute_into(self, a: NDArray, b: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the element-wise division of two tensors into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.true_divide(a, b, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, Tensor]:
         """
         Computes the gradient of the element-wise division operation.
@@ -327,6 +373,8 @@ class DivScalar(TensorOp):
         array([0.5, 1.0, 1.5])
 
     """
+    grad_reads_inputs = False
+    grad_reads_output = False
 
     def __init__(self, scalar: Union[int, float]):
         """
@@ -349,6 +397,12 @@ class DivScalar(TensorOp):
         """
         return a / self.scalar
 
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the division of a tensor by the scalar into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.true_divide(a, self.scalar, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, ...]:
         """
         Computes the gradient of the division operation.
@@ -395,7 +449,9 @@ class Negate(TensorOp):
     >>> print(result)
     Tensor([-1, 2, -3])
     """
-    
+    grad_reads_inputs = False
+    grad_reads_output = False
+
     def compute(self, a: NDArray) -> NDArray:
         """
         Computes the negation of a tensor.
@@ -408,6 +464,12 @@ class Negate(TensorOp):
         """
         return -1 * a
 
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the negation of a tensor into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.negative(a, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor,]:
         """
         Computes the gradient of the negation operation.
@@ -452,7 +514,8 @@ class Exp(TensorOp):
     >>> print(result)
     Tensor([2.71828183, 7.3890561, 20.08553692])
     """
-    
+    grad_reads_inputs = False
+
     def compute(self, a: NDArray) -> NDArray:
         """
         Computes the exponential of a tensor.
@@ -463,8 +526,13 @@ class Exp(TensorOp):
         Returns:
         The exponential of a.
         """
-        self.out = ARRAY_API.exp(a)
-        return self.out
+        return ARRAY_API.exp(a)
+
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the exponential of a tensor into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.exp(a, out=out)
 
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor,]:
         """
@@ -477,7 +545,7 @@ class Exp(TensorOp):
         Returns:
         The gradients with respect to the inputs.
         """
-        return (out_grad * Tensor(self.out), )
+        return (out_grad * Tensor(node.compute_cached_data()), )
 
 def exp(a: Tensor) -> Tensor:
     """
@@ -509,7 +577,8 @@ class ReLU(TensorOp):
     >>> print(result)
     Tensor([1, 0, 3])
     """
-    
+    grad_reads_output = False
+
     def compute(self, a: NDArray) -> NDArray:
         """
         Computes the ReLU activation function on a tensor.
@@ -520,8 +589,13 @@ class ReLU(TensorOp):
         Returns:
         The result of applying ReLU to a.
         """
-        self.out = ARRAY_API.clip(a, a_min=0, a_max=None)
-        return self.out
+        return ARRAY_API.clip(a, a_min=0, a_max=None)
+
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the ReLU activation function on a tensor into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.clip(a, a_min=0, a_max=None, out=out)
 
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor,]:
         """
@@ -573,6 +647,7 @@ class PowerScalar(TensorOp):
         array([1, 4, 9])
 
     """
+    grad_reads_output = False
 
     def __init__(self, scalar: int):
         """
@@ -595,6 +670,12 @@ class PowerScalar(TensorOp):
         """
         return ARRAY_API.power(a, self.scalar)
 
+    def compute_into(self, a: NDArray, out: NDArray) -> NDArray:
+        """
+        Computes the power operation on the input tensor into `out`, which may be one of the inputs.
+        """
+        return ARRAY_API.power(a, self.scalar, out=out)
+
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, ]:
         """
         Computes the gradient of the power operation.
@@ -740,7 +821,7 @@ class Reshape(TensorOp):
         Returns:
             NDArray: The reshaped tensor.
         """
-        return ARRAY_API.reshape(a, newshape=self.shape)
+        return ARRAY_API.reshape(a, self.shape)
 
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, ...]:
         """
@@ -777,7 +858,7 @@ def reshape(a: Tensor, shape: Tuple[int, ...]) -> Tensor:
     return Reshape(shape)(a)
 
 
-# %% ../nbs/01_operators.ipynb 67
+# %% ../nbs/01_operators.ipynb 68
 class MatMul(TensorOp):
     """
     Tensor operation class that performs matrix multiplication.
@@ -804,6 +885,10 @@ class MatMul(TensorOp):
         Returns:
             NDArray: The product of a and b.
         """
+        if _is_half(a) or _is_half(b):
+            # numpy has no fast 16-bit matmul, and the products are better accumulated in float32 anyway
+            dtype = a.dtype if a.dtype == b.dtype else numpy.float32
+            return ARRAY_API.matmul(a.astype(numpy.float32), b.astype(numpy.float32)).astype(dtype)
         return ARRAY_API.matmul(a, b)
 
     
@@ -866,7 +951,7 @@ def matmul(a: Tensor, b: Tensor) -> Tensor:
     return MatMul()(a, b)
 
 
-# %% ../nbs/01_operators.ipynb 76
+# %% ../nbs/01_operators.ipynb 77
 class Summation(TensorOp):
     """
     Op to compute the sum of a tensor along specified axes.
@@ -898,6 +983,8 @@ class Summation(TensorOp):
         Returns:
         The sum of `a` along the specified axes.
         """
+        if _is_half(a):
+            return ARRAY_API.sum(a, self.axes, dtype=numpy.float32).astype(a.dtype)
         return ARRAY_API.sum(a, self.axes)
 
     def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor]:
@@ -949,7 +1036,7 @@ def summation(a: Tensor, axes: Optional[tuple] = None) -> Tensor:
     return Summation(axes)(a)
 
 
-# %% ../nbs/01_operators.ipynb 89
+# %% ../nbs/01_operators.ipynb 90
 class BroadcastTo(TensorOp):
     """
     Op to broadcast a tensor to a new shape.
@@ -1020,10 +1107,11 @@ def broadcast_to(a: Tensor, shape: Tuple[int, ...]) -> Tensor:
     return BroadcastTo(shape)(a)
 
 
-# %% ../nbs/01_operators.ipynb 101
+# %% ../nbs/01_operators.ipynb 102
 class LogSumExp(TensorOp):
     """
-    A Tensor operation class for performing LogSumExp computation.
+    A Tensor operation class for performing LogSumExp computation, in float32 for 16-bit inputs,
+    which `autocast` leaves as they are.
 
     Attributes
     ----------
@@ -1040,6 +1128,8 @@ class LogSumExp(TensorOp):
         Computes the gradient of the LogSumExp operation with respect to its input.
     """
     
+    autocast = False
+
     def __init__(self, axes: Optional[tuple] = None):
         """
         Initializes the LogSumExp operation with the specified axes.
@@ -1050,7 +1140,7 @@ class LogSumExp(TensorOp):
             The axes along which the operation is performed.
         """
         
-        self.axes = axes
+        self.axes = (axes,) if isinstance(axes, int) else axes
 
     def compute(self, Z):
         """
@@ -1067,8 +1157,14 @@ class LogSumExp(TensorOp):
             The result of the LogSumExp operation on the input tensor.
         """
         
-        max_z = ARRAY_API.max(Z, axis=self.axes, keepdims=True)
-        self.out = ARRAY_API.squeeze(ARRAY_API.log(ARRAY_API.sum(ARRAY_API.exp(Z - max_z), axis=self.axes, keepdims=True)) + max_z)
+        axes = tuple(range(Z.ndim)) if self.axes is None else tuple(a % Z.ndim for a in self.axes)
+        dtype = Z.dtype
+        if _is_half(Z):
+            Z = Z.astype(numpy.float32)
+        max_z = Z.max(axis=axes, keepdims=True)
+        out = (ARRAY_API.log(ARRAY_API.exp(Z - max_z).sum(axis=axes, keepdims=True)) + max_z).astype(dtype, copy=False)
+        # only the reduced axes are dropped, other axes of size 1 (e.g. a batch of one) stay
+        self.out = out.reshape(tuple(s for i, s in enumerate(Z.shape) if i not in axes))
         return self.out
     
     def gradient(self, out_grad, node):
@@ -1108,3 +1204,260 @@ class LogSumExp(TensorOp):
     
 def logsumexp(a, axes=None): 
     return LogSumExp(axes=axes)(a)
+
+# %% ../nbs/01_operators.ipynb 104
+# numpy arrays are normalized in blocks of about this many elements, so temporaries stay small for any shape
+_MEAN_VAR_BLOCK = 1 << 16
+
+def _mean_var(x, axes):
+    """
+    Mean and variance of `x` over `axes`, with the reduced axes kept, reading `x` once: running sums of `x`
+    and of its square, shifted by its first element along `axes`, over blocks of `_MEAN_VAR_BLOCK` elements
+    and accumulated in float64.
+    """
+    if hasattr(x, 'mean_var'):
+        return x.mean_var(axes, keepdims=True)
+    axes = tuple(axis % x.ndim for axis in axes)
+    n = int(numpy.prod([x.shape[axis] for axis in axes]))
+    shift = x[tuple(slice(0, 1) if axis in axes else slice(None) for axis in range(x.ndim))]
+    total, sum_sq = numpy.zeros(shift.shape), numpy.zeros(shift.shape)
+    # the blocks are slices of the outermost axis in memory whose slices fit in a block, so they are read
+    # in memory order, or else of the longest axis, which keeps them small whatever the axes
+    fits = [axis for axis in range(x.ndim) if x.size <= _MEAN_VAR_BLOCK * x.shape[axis]]
+    split = (max(fits, key=lambda axis: abs(x.strides[axis])) if fits
+             else max(range(x.ndim), key=lambda axis: x.shape[axis]))
+    step = max(1, _MEAN_VAR_BLOCK * x.shape[split] // max(x.size, 1))
+    for start in range(0, x.shape[split], step):
+        block = (slice(None),) * split + (slice(start, start + step),)
+        kept = () if split in axes else block
+        # the shift keeps sum_sq / n - m^2 from cancelling when the mean is large against the spread
+        d = numpy.subtract(x[block], shift[kept], dtype=numpy.float32 if _is_half(x) else None)
+        total[kept] += d.sum(axis=axes, keepdims=True)
+        sum_sq[kept] += numpy.square(d, out=d).sum(axis=axes, keepdims=True)
+    m = total / n
+    dtype = x.dtype if x.dtype.kind in 'fV' else numpy.float64
+    return (shift + m).astype(dtype), numpy.maximum(sum_sq / n - m * m, 0).astype(dtype)
+
+class Normalize(TensorOp):
+    """
+    Op to standardize a tensor over the specified axes, `(x - mean) / sqrt(var + eps)`.
+
+    Example:
+    >>> a = Tensor([[1., 3.], [2., 6.]])
+    >>> print(normalize(a, axes=(1,), eps=0.))
+    mi.Tensor([[-1.  1.]
+     [-1.  1.]])
+
+    Args:
+    - axes (tuple): The dimensions to normalize over.
+    - eps (float): Added to the variance for numerical stability.
+
+    After `compute`, `mean` and `var` hold the moments of the input, with the normalized axes kept
+    with size 1, for layers that track running statistics.
+    """
+    autocast = False
+
+    def __init__(self, axes: tuple, eps: float = 1e-5):
+        self.axes = axes
+        self.eps = eps
+
+    def compute(self, x: NDArray) -> NDArray:
+        """
+        Normalizes `x`, from its mean and variance computed together.
+
+        Args:
+        - x: The input tensor.
+
+        Returns:
+        The normalized tensor.
+        """
+        self.axes = tuple(a % x.ndim for a in self.axes)
+        self.mean, self.var = _mean_var(x, self.axes)
+        self.inv_std = (self.var + self.eps) ** -0.5
+        return (x - self.mean) * self.inv_std
+
+    def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor]:
+        """
+        Computes the gradient of the normalization, `inv_std * (g - mean(g) - y * mean(g * y))` for
+        the output `y`, without differentiating through the mean and the variance separately.
+
+        Args:
+        - out_grad: The gradient of the output of the operation.
+        - node: The node in the computational graph where the operation was performed.
+
+        Returns:
+        The gradient with respect to the input.
+        """
+        shape = node.shape
+        kept_shape = tuple(1 if i in self.axes else s for i, s in enumerate(shape))
+        n = int(numpy.prod([shape[a] for a in self.axes]))
+
+        def mean(t):
+            return broadcast_to(reshape(summation(t, self.axes), kept_shape), shape) / n
+
+        inv_std = broadcast_to(Tensor(self.inv_std), shape)
+        return (inv_std * (out_grad - mean(out_grad) - node * mean(out_grad * node)), )
+
+def normalize(a: Tensor, axes: tuple, eps: float = 1e-5) -> Tensor:
+    """
+    Standardizes `a` over `axes` to zero mean and unit variance.
+
+    Args:
+    - a: The input tensor.
+    - axes: The dimensions to normalize over.
+    - eps: Added to the variance for numerical stability.
+
+    Returns:
+    The normalized tensor.
+    """
+    return Normalize(axes, eps)(a)
+
+# %% ../nbs/01_operators.ipynb 107
+# rows of numpy logits are reduced in blocks of about this many elements, so temporaries stay small for any number of classes
+_LOG_SOFTMAX_BLOCK = 1 << 16
+
+def _log_softmax_nll(z, target):
+    """Loss and log-sum-exp of each row of the logits `z` against the class indices `target`."""
+    if hasattr(z, 'log_softmax_nll'):
+        return z.log_softmax_nll(target)
+    batch, classes = z.shape
+    t = target.astype(numpy.int64)
+    if ((t < 0) | (t >= classes) | (t != target)).any():
+        raise ValueError("Targets must be class indices in [0, classes)")
+    lse = numpy.empty(batch, dtype=z.dtype)
+    step = max(1, _LOG_SOFTMAX_BLOCK // max(classes, 1))
+    for start in range(0, batch, step):
+        block = z[start:start + step]
+        if _is_half(block):
+            block = block.astype(numpy.float32)
+        row_max = block.max(axis=1)
+        lse[start:start + len(block)] = numpy.log(numpy.exp(block - row_max[:, None]).sum(axis=1)) + row_max
+    return lse - z[numpy.arange(batch), t], lse
+
+def _log_softmax_nll_backward(z, target, lse, grad_loss):
+    """Gradient of `_log_softmax_nll` with respect to `z`, `grad_loss_i * (softmax(z_i) - onehot(target_i))`."""
+    if hasattr(z, 'log_softmax_nll_backward'):
+        return z.log_softmax_nll_backward(target, lse, grad_loss)
+    grad = numpy.subtract(z, lse[:, None])
+    numpy.exp(grad, out=grad)
+    grad[numpy.arange(z.shape[0]), target.astype(numpy.int64)] -= 1
+    grad *= grad_loss[:, None]
+    return grad
+
+class LogSoftmaxNLL(TensorOp):
+    """
+    Op to compute the cross-entropy of each row of logits against an integer class target, the
+    negative log-likelihood of the target under the log-softmax of the row.
+
+    Example:
+    >>> logits = Tensor([[0., 0.], [1000., 0.]])
+    >>> print(log_softmax_nll(logits, Tensor([1, 1])))
+    mi.Tensor([6.931472e-01 1.000000e+03])
+
+    Neither the log-softmax nor a one-hot matrix of the targets is built: the forward pass keeps one
+    log-sum-exp per row, from which the backward pass computes the gradient in a single pass.
+    The log-sum-exps of 16-bit logits are accumulated in float32, and `autocast` leaves the inputs as they are.
+    """
+    autocast = False
+
+    def compute(self, logits: NDArray, target: NDArray) -> NDArray:
+        """
+        Computes the loss of each row.
+
+        Args:
+        - logits: The (batch, classes) logits.
+        - target: The class index of each row.
+
+        Returns:
+        The (batch,) losses.
+        """
+        loss, self.lse = _log_softmax_nll(logits, target)
+        return loss
+
+    def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor, Tensor]:
+        """
+        Computes the gradient with respect to the logits, the targets get a zero gradient.
+
+        Args:
+        - out_grad: The gradient of the output of the operation.
+        - node: The node in the computational graph where the operation was performed.
+
+        Returns:
+        The gradients with respect to the inputs.
+        """
+        logits, target = node.children
+        target_data = target.compute_cached_data()
+        grad = _log_softmax_nll_backward(logits.compute_cached_data(), target_data, self.lse,
+                                         out_grad.compute_cached_data())
+        return (Tensor(grad), Tensor(ARRAY_API.zeros_like(target_data)))
+
+def log_softmax_nll(logits: Tensor, target: Tensor) -> Tensor:
+    """
+    Computes the cross-entropy of each row of `logits` against the class indices in `target`.
+
+    Args:
+    - logits: The (batch, classes) logits.
+    - target: The class index of each row.
+
+    Returns:
+    The loss of each row.
+    """
+    return LogSoftmaxNLL()(logits, target)
+
+# %% ../nbs/01_operators.ipynb 110
+class AsType(TensorOp):
+    """
+    Op to convert a tensor to another dtype, rounding to nearest.
+
+    Example:
+    >>> a = Tensor(numpy.array([1., 1 / 3]))
+    >>> print(astype(a, 'float16'))
+    mi.Tensor([1.     0.3333])
+
+    Args:
+    - dtype: The dtype to convert to, a numpy dtype or its name, "bfloat16" included.
+    """
+    autocast = False
+
+    def __init__(self, dtype):
+        self.dtype = dtype
+
+    def compute(self, a: NDArray) -> NDArray:
+        """
+        Converts `a`, without copying it when it already has the dtype.
+
+        Args:
+        - a: The input tensor.
+
+        Returns:
+        The converted tensor.
+        """
+        if isinstance(a, numpy.ndarray):
+            return a.astype(numpy_dtype(self.dtype), copy=False)
+        return a.astype(self.dtype)
+
+    def gradient(self, out_grad: Tensor, node: Tensor) -> Tuple[Tensor]:
+        """
+        Converts the gradient back to the dtype of the input.
+
+        Args:
+        - out_grad: The gradient of the output of the operation.
+        - node: The node in the computational graph where the operation was performed.
+
+        Returns:
+        The gradient with respect to the input.
+        """
+        return (astype(out_grad, node.children[0].dtype), )
+
+def astype(a: Tensor, dtype) -> Tensor:
+    """
+    Converts `a` to `dtype`.
+
+    Args:
+    - a: The input tensor.
+    - dtype: The dtype to convert to.
+
+    Returns:
+    The converted tensor.
+    """
+    return AsType(dtype)(a)
@@ -5,12 +5,81 @@ __all__ = ['Optimizer', 'SGD', 'AdaGrad', 'RMSProp', 'Adam']
 
 # %% ../nbs/04_optim.ipynb 2
 import minima as mi
-from .nn import Parameter
+from .nn import Parameter, ParameterArena
 from .autograd import Tensor
 from . import init
 import numpy as np
 
 # %% ../nbs/04_optim.ipynb 3
+class _FlatParams:
+    """
+    The parameters of an optimizer in a `ParameterArena`, along with the states of the optimizer in buffers
+    of the same layout, so that a step updates every parameter with a few vectorized operations.
+
+    The arena of a module flattened by `Module.flatten_parameters` is used as is, when the optimizer was
+    given the parameters of that module. Otherwise the parameters are moved into a new arena.
+
+    An arena of 16-bit floats is stepped through a float32 `master` copy, which the states and the scratch
+    buffer follow, and which is rounded back into the arena after each run. The gradients are copied into
+    float32 too, so that the update never computes in 16 bits, where e.g. squared gradients underflow.
+    """
+
+    def __init__(self, params, states):
+        params = list(params)
+        arena = params[0].arena if params else None
+        if arena is None or [id(p) for p in arena.params] != [id(p) for p in params]:
+            arena = ParameterArena(params)
+        self.arena = arena
+        self.master = arena.data.astype(np.float32) if arena.data.dtype.itemsize < 4 else None
+        self.master_grad = None if self.master is None else np.empty_like(self.master)
+        weights = arena.data if self.master is None else self.master
+        self.states = {name: np.zeros_like(weights) for name in states}
+        self.scratch = np.empty_like(weights)
+        # the `_version` of the data of each parameter when the master was last synced with it
+        self.versions = [p._version for p in arena.params]
+
+    def segments(self):
+        """
+        Syncs the parameters and gradients that are not views of the arena, and yields the
+        `(data, grad, *states, scratch)` slices of each run of parameters that have a gradient.
+        """
+        arena, master, runs = self.arena, self.master, []
+        for i, (p, view, grad_view) in enumerate(zip(arena.params, arena.views, arena.grad_views)):
+            replaced = p.cached_data is not view
+            if replaced:
+                view[...] = p.compute_cached_data()
+                p.cached_data = view
+            if master is not None and (replaced or p._version != self.versions[i]):
+                # the data was assigned, into the view when the parameter is flattened, so the master is stale
+                master[arena.offsets[i]:arena.offsets[i + 1]] = view.reshape(-1)
+            self.versions[i] = p._version
+            if p.grad is None:
+                continue
+            if p.grad.compute_cached_data() is not grad_view:
+                grad_view[...] = p.grad.cached_data
+            if runs and runs[-1][1] == i:
+                runs[-1][1] = i + 1
+            else:
+                runs.append([i, i + 1])
+        for first, last in runs:
+            s = slice(arena.offsets[first], arena.offsets[last])
+            if master is None:
+                weights, grad = arena.data[s], arena.grad[s]
+            else:
+                weights, grad = master[s], self.master_grad[s]
+                grad[...] = arena.grad[s]
+            yield (weights, grad, *(state[s] for state in self.states.values()), self.scratch[s])
+            if master is not None:
+                arena.data[s] = master[s]
+
+    def param_states(self, i):
+        """The views of the states of the `i`-th parameter, in its shape, with its `master` weights if any."""
+        s, shape = slice(self.arena.offsets[i], self.arena.offsets[i + 1]), self.arena.params[i].shape
+        states = {name: state[s].reshape(shape) for name, state in self.states.items()}
+        if self.master is not None:
+            states['master'] = self.master[s].reshape(shape)
+        return states
+
 class Optimizer:
     """
     Base class for all optimizers. Not meant to be instantiated directly.
@@ -24,6 +93,17 @@ class Optimizer:
     ----------
     params : Iterable
         The parameters of the model to be optimized.
+    foreach : bool, optional
+        Whether a step updates all the parameters at once, flattened into a `ParameterArena`, rather than
+        one by one. The data and gradients of the parameters then view the arena.
+
+    The states of the optimizer are numpy arrays outside of the autograd graph, updated in place along with
+    the data of the parameters, so that a step allocates nothing once the states exist. Subclasses name
+    their states per parameter in `state_names`, and the attributes saved by `state_dict` in `hyperparams`.
+
+    Parameters stored as 16-bit floats (see `Module.astype`) are updated through float32 `master` weights,
+    kept with their states, so that small updates are not rounded away, and from their gradients converted
+    to float32. Their data is the master rounded to the dtype of the parameter after each step.
 
     Raises
     ------
@@ -32,9 +112,108 @@ class Optimizer:
     """
     def __init__(
         self,
-        params # The parameters of the model to be optimized.
+        params, # The parameters of the model to be optimized.
+        foreach=False # Whether a step updates all the parameters at once.
+    ):
+        seen = set()
+        self.params = [p for p in params if id(p) not in seen and not seen.add(id(p))]
+        self.foreach = foreach
+        self.state = {}
+        self._scratch = {}
+        self._master_grads = {}
+        # the data, and its `_version`, each master copy was taken from, an assignment to the data of a
+        # parameter replaces its master
+        self._master_sources = {}
+        self._master_versions = {}
+        self._flat = None
+
+    state_names = ()
+    hyperparams = ('lr',)
+
+    def _flat_params(self) -> _FlatParams:
+        """The parameters flattened for foreach steps, with zero-initialized states, built on the first step."""
+        if self._flat is None:
+            self._flat = _FlatParams(self.params, self.state_names)
+        return self._flat
+
+    def _param_states(self, i):
+        """The states of the `i`-th parameter, zero-initialized on first use."""
+        if self.foreach:
+            return self._flat_params().param_states(i)
+        if i not in self.state:
+            data = self.params[i].compute_cached_data()
+            if data.dtype.itemsize < 4:
+                master = data.astype(np.float32)
+                self.state[i] = {name: np.zeros_like(master) for name in self.state_names}
+                self.state[i]['master'] = master
+                self._master_sources[i] = data
+                self._master_versions[i] = getattr(self.params[i], '_version', 0)
+            else:
+                self.state[i] = {name: np.zeros_like(data) for name in self.state_names}
+        return self.state[i]
+
+    def _segments(self):
+        """
+        Yields the `(data, grad, *states, scratch)` arrays a step updates in place: those of each parameter
+        that has a gradient or, with `foreach`, those of each run of such parameters in the flat buffers.
+        The `data` of 16-bit parameters is their master weights, copied back into them once updated.
+        """
+        if self.foreach:
+            yield from self._flat_params().segments()
+            return
+        for i, p in enumerate(self.params):
+            if p.grad is None:
+                continue
+            data, states = p.compute_cached_data(), self._param_states(i)
+            master = states.get('master')
+            version = getattr(p, '_version', 0)
+            if master is not None and (self._master_sources[i] is not data or self._master_versions[i] != version):
+                master[...] = data
+                self._master_sources[i], self._master_versions[i] = data, version
+            weights, grad = data, p.grad.compute_cached_data()
+            if master is not None:
+                if i not in self._master_grads:
+                    self._master_grads[i] = np.empty_like(master)
+                self._master_grads[i][...] = grad
+                weights, grad = master, self._master_grads[i]
+            if i not in self._scratch:
+                self._scratch[i] = np.empty_like(weights)
+            yield (weights, grad, *(states[name] for name in self.state_names), self._scratch[i])
+            if master is not None:
+                data[...] = master
+
+    def state_dict(self) -> dict:
+        """
+        Returns the state of the optimizer: its `hyperparams`, and under `'state'` the states of each
+        parameter by index. The arrays are the ones the optimizer updates, not copies.
+        """
+        if self.foreach:
+            state = {i: self._param_states(i) for i in range(len(self.params))}
+        else:
+            state = dict(self.state)
+        return {'state': state, **{name: getattr(self, name) for name in self.hyperparams}}
+
+    def load_state_dict(
+        self,
+        state_dict: dict # A state returned by `state_dict`, of an optimizer of the same class and parameters.
     ):
-        self.params = params
+        """Copies `state_dict` into the optimizer, in place of the states it already has."""
+        for i, states in state_dict['state'].items():
+            if not 0 <= i < len(self.params):
+                raise ValueError(f"state of parameter {i}, but the optimizer has {len(self.params)} parameters")
+            buffers = self._param_states(i)
+            if set(states) != set(buffers):
+                raise ValueError(f"expected the states {list(buffers)} of parameter {i}, got {list(states)}")
+            for name, buffer in buffers.items():
+                value = np.asarray(states[name])
+                if value.shape != buffer.shape:
+                    raise ValueError(f"state {name!r} of parameter {i} has shape {value.shape}, expected {buffer.shape}")
+                buffer[...] = value
+            if 'master' in buffers:
+                # in place, so that the master is not taken to be stale on the next step
+                self.params[i].compute_cached_data()[...] = buffers['master']
+        for name in self.hyperparams:
+            setattr(self, name, state_dict[name])
 
     def step(self):
         """
@@ -77,54 +256,57 @@ class SGD(Optimizer):
         The momentum factor.
     wd : float, optional
         The weight decay (L2 regularization).
+    foreach : bool, optional
+        Whether a step updates all the parameters at once, see `Optimizer`.
     """
     def __init__(
         self,
         params, # The parameters of the model to be optimized.
         lr=0.01, # The learning rate.
         momentum=0.0, # The momentum factor.
-        wd=0.0 # The weight decay (L2 regularization).
+        wd=0.0, # The weight decay (L2 regularization).
+        foreach=False, # Whether a step updates all the parameters at once.
     ):
-        super().__init__(params)
+        super().__init__(params, foreach)
 
         self.lr = lr
         self.momentum = momentum
-        self.u = {}
         self.wd = wd
 
+    state_names = ('u',)
+    hyperparams = ('lr', 'momentum', 'wd')
+
     def step(self):
         """
         Performs a single optimization step.
 
         This method uses the current gradients to adjust the parameters using stochastic gradient descent.
         """
-        for self.idx, p in enumerate(self.params):
-            self._reg_step(p)
-            self._opt_step(p)
+        for data, grad, u, scratch in self._segments():
+            self._reg_step(data)
+            self._opt_step(data, grad, u, scratch)
 
-    def _opt_step(self, p):
+    def _opt_step(self, data, grad, u, scratch):
         """
-        Performs the optimization step for a single parameter tensor.
+        Performs the optimization step for the data of a parameter, or of a run of flattened parameters, in place.
 
         If momentum is set, it applies momentum by using a running average of the previous gradients.
         """
-        # import pdb; pdb.set_trace()
-        # TODO: there is a bug (somewhere :3) -> The dtype of the given the grad tensor is (float64) is not the same as the dtype of the current tensor (float32). 
-        # will do a temp fix for now : Xd
-        grad = Tensor(p.grad, dtype='float32')
-        if self.idx not in self.u:
-            self.u[self.idx] = init.zeros(*p.shape)
-        self.u[self.idx] = self.momentum * self.u[self.idx] + (1 - self.momentum) * grad
-        p.data = p.data - self.lr * self.u[self.idx]
+        u *= self.momentum
+        np.multiply(grad, 1 - self.momentum, out=scratch)
+        u += scratch
+        np.multiply(u, self.lr, out=scratch)
+        data -= scratch
 
-    def _reg_step(self, p):
+    def _reg_step(self, data):
         """
-        Applies weight decay for a single parameter tensor.
+        Applies weight decay to the data of a parameter, in place.
 
         This form of L2 regularization can help prevent overfitting.
         """
         if self.wd != 0:
-            p.data *= (1 - self.lr * self.wd)
+            data *= 1 - self.lr * self.wd
+
 
 # %% ../nbs/04_optim.ipynb 10
 class AdaGrad(Optimizer):
@@ -145,6 +327,8 @@ class AdaGrad(Optimizer):
         The weight decay (L2 regularization).
     eps : float, optional
         A small constant for numerical stability.
+    foreach : bool, optional
+        Whether a step updates all the parameters at once, see `Optimizer`.
     """
     def __init__(
         self,
@@ -152,43 +336,50 @@ class AdaGrad(Optimizer):
         lr=0.001,  # The initial learning rate.
         wd=0.0,  # The weight decay (L2 regularization).
         eps=1e-7,  # A small constant for numerical stability.
+        foreach=False, # Whether a step updates all the parameters at once.
     ):
-        super().__init__(params)
+        super().__init__(params, foreach)
 
         self.lr = lr
-        self.cache = {}
         self.wd = wd
         self.eps = eps
 
+    state_names = ('cache',)
+    hyperparams = ('lr', 'wd', 'eps')
+
     def step(self):
         """
         Performs a single optimization step.
 
         This method uses the current gradients to adjust the parameters using AdaGrad algorithm.
         """
-        for self.idx, p in enumerate(self.params):
-            self._reg_step(p)
-            self._opt_step(p)
+        for data, grad, cache, scratch in self._segments():
+            self._reg_step(data)
+            self._opt_step(data, grad, cache, scratch)
 
-    def _opt_step(self, p):
+    def _opt_step(self, data, grad, cache, scratch):
         """
-        Performs the optimization step for a single parameter tensor.
+        Performs the optimization step for the data of a parameter, or of a run of flattened parameters, in place.
 
         It computes parameter-wise learning rates and updates the parameters accordingly.
         """
-        if self.idx not in self.cache:
-            self.cache[self.idx] = init.zeros(*p.shape)
-        self.cache[self.idx] += p.grad.data ** 2
-        p.data = p.data - (self.lr / (self.cache[self.idx] + self.eps) ** 0.5 ) * p.grad.data
-
-    def _reg_step(self, p):
+        np.multiply(grad, grad, out=scratch)
+        cache += scratch
+        np.add(cache, self.eps, out=scratch)
+        np.sqrt(scratch, out=scratch)
+        np.divide(grad, scratch, out=scratch)
+        scratch *= self.lr
+        data -= scratch
+
+    def _reg_step(self, data):
         """
-        Applies weight decay for a single parameter tensor.
+        Applies weight decay to the data of a parameter, in place.
 
         This form of L2 regularization can help prevent overfitting.
         """
         if self.wd != 0:
-            p.data *= (1 - self.lr * self.wd)
+            data *= 1 - self.lr * self.wd
+
 
 # %% ../nbs/04_optim.ipynb 13
 class RMSProp(Optimizer):
@@ -210,6 +401,8 @@ class RMSProp(Optimizer):
         A small constant for numerical stability.
     rho : float, optional
         The decay rate for the moving average of squared gradients.
+    foreach : bool, optional
+        Whether a step updates all the parameters at once, see `Optimizer`.
     """
     def __init__(
         self,
@@ -218,44 +411,53 @@ class RMSProp(Optimizer):
         wd=0.0,  # The weight decay (L2 regularization).
         eps=1e-7,  # A small constant for numerical stability.
         rho=0.9, # The decay rate for the moving average of squared gradients.
+        foreach=False, # Whether a step updates all the parameters at once.
     ):
-        super().__init__(params)
+        super().__init__(params, foreach)
 
         self.lr = lr
-        self.cache = {}
         self.wd = wd
         self.eps = eps
         self.rho = rho
 
+    state_names = ('cache',)
+    hyperparams = ('lr', 'wd', 'eps', 'rho')
+
     def step(self):
         """
         Performs a single optimization step.
 
         This method uses the current gradients to adjust the parameters using RMSProp algorithm.
         """
-        for self.idx, p in enumerate(self.params):
-            self._reg_step(p)
-            self._opt_step(p)
+        for data, grad, cache, scratch in self._segments():
+            self._reg_step(data)
+            self._opt_step(data, grad, cache, scratch)
 
-    def _opt_step(self, p):
+    def _opt_step(self, data, grad, cache, scratch):
         """
-        Performs the optimization step for a single parameter tensor.
+        Performs the optimization step for the data of a parameter, or of a run of flattened parameters, in place.
 
         It computes parameter-wise learning rates and updates the parameters accordingly.
         """
-        if self.idx not in self.cache:
-            self.cache[self.idx] = init.zeros(*p.shape)
-        self.cache[self.idx] = self.rho * self.cache[self.idx] + (1 - self.rho) * p.grad.data ** 2
-        p.data = p.data - (self.lr / (self.cache[self.idx] + self.eps) ** 0.5 ) * p.grad.data
-
-    def _reg_step(self, p):
+        cache *= self.rho
+        np.multiply(grad, grad, out=scratch)
+        scratch *= 1 - self.rho
+        cache += scratch
+        np.add(cache, self.eps, out=scratch)
+        np.sqrt(scratch, out=scratch)
+        np.divide(grad, scratch, out=scratch)
+        scratch *= self.lr
+        data -= scratch
+
+    def _reg_step(self, data):
         """
-        Applies weight decay for a single parameter tensor.
+        Applies weight decay to the data of a parameter, in place.
 
         This form of L2 regularization can help prevent overfitting.
         """
         if self.wd != 0:
-            p.data *= (1 - self.lr * self.wd)
+            data *= 1 - self.lr * self.wd
+
 
 # %% ../nbs/04_optim.ipynb 16
 class Adam(Optimizer):
@@ -280,15 +482,16 @@ class Adam(Optimizer):
         A small constant for numerical stability. Default is 1e-8.
     weight_decay : float, optional
         Weight decay (L2 penalty). Default is 0.
+    foreach : bool, optional
+        Whether a step updates all the parameters at once, see `Optimizer`.
 
     Attributes
     ----------
     t : int
         The time step for the Adam optimizer.
-    exp_avg : dict
-        The dictionary to store the exponential moving average of gradient values.
-    exp_avg_sq : dict
-        The dictionary to store the exponential moving average of squared gradient values.
+    state : dict
+        The states of each parameter by index: `exp_avg`, the exponential moving average of gradient values,
+        and `exp_avg_sq`, the exponential moving average of squared gradient values.
     """
     def __init__(
         self,
@@ -298,8 +501,9 @@ class Adam(Optimizer):
         beta2=0.999, # The exponential decay rate for the second moment estimates. Default is 0.999.
         eps=1e-8, # `eps` is $\hat{\epsilon}$ or $\epsilon$ based on `optimized_update`
         weight_decay=0.0, # is an instance of class `WeightDecay` defined in [`__init__.py`](index.html)
+        foreach=False, # Whether a step updates all the parameters at once.
     ):
-        super().__init__(params)
+        super().__init__(params, foreach)
         self.lr = lr
         self.beta1 = beta1
         self.beta2 = beta2
@@ -307,8 +511,8 @@ class Adam(Optimizer):
         self.wd = weight_decay
         self.t = 0
 
-        self.exp_avg = {}
-        self.exp_avg_sq = {}
+    state_names = ('exp_avg', 'exp_avg_sq')
+    hyperparams = ('lr', 'beta1', 'beta2', 'eps', 'wd', 't')
 
     def step(self):
         """
@@ -316,41 +520,44 @@ class Adam(Optimizer):
 
         This method updates the parameters based on the current gradient.
         """
-        for self.idx, p in enumerate(self.params):
-            self._reg_step(p)
-            self._opt_step(p)
+        self.t += 1
+        for data, grad, exp_avg, exp_avg_sq, scratch in self._segments():
+            self._reg_step(data)
+            self._opt_step(data, grad, exp_avg, exp_avg_sq, scratch)
 
-    def _opt_step(self, p):
+    def _opt_step(self, data, grad, exp_avg, exp_avg_sq, scratch):
         """
-        Performs the optimization step for a single parameter tensor.
+        Performs the optimization step for the data of a parameter, or of a run of flattened parameters, in place.
 
         The method updates the moving averages of the gradient (m) and the squared gradient (v), and then 
         computes the bias-corrected estimates of these two variables. These bias-corrected estimates are 
         then used to update the parameter.
         """
-        if self.idx not in self.exp_avg:
-            self.exp_avg[self.idx] = init.zeros(*p.shape)
-            self.exp_avg_sq[self.idx] = init.zeros(*p.shape)
-        
         # Update biased first and second moment estimates
-        self.exp_avg[self.idx] = self.beta1 * self.exp_avg[self.idx] + (1 - self.beta1) * p.grad.data
-        self.exp_avg_sq[self.idx] = self.beta2 * self.exp_avg_sq[self.idx] + (1 - self.beta2) * p.grad.data**2
-        
-        # Compute bias-corrected first and second moment estimates
-        exp_avg_hat = self.exp_avg[self.idx] / (1 - self.beta1 ** (self.idx + 1))
-        exp_avg_sq_hat = self.exp_avg_sq[self.idx] / (1 - self.beta2 ** (self.idx + 1))
-        p.data = p.data - self.lr * exp_avg_hat / (exp_avg_sq_hat ** 0.5 + self.eps)
-
-    def _reg_step(self, p):
+        exp_avg *= self.beta1
+        np.multiply(grad, 1 - self.beta1, out=scratch)
+        exp_avg += scratch
+        exp_avg_sq *= self.beta2
+        np.multiply(grad, grad, out=scratch)
+        scratch *= 1 - self.beta2
+        exp_avg_sq += scratch
+
+        # lr * (exp_avg / bias1) / (sqrt(exp_avg_sq / bias2) + eps), with the bias-corrected estimates
+        bias1, bias2 = 1 - self.beta1 ** self.t, 1 - self.beta2 ** self.t
+        np.divide(exp_avg_sq, bias2, out=scratch)
+        np.sqrt(scratch, out=scratch)
+        scratch += self.eps
+        np.divide(exp_avg, scratch, out=scratch)
+        scratch *= self.lr / bias1
+        data -= scratch
+
+    def _reg_step(self, data):
         """
-        Applies weight decay for a single parameter tensor.
+        Applies weight decay to the data of a parameter, in place.
 
         This form of L2 regularization can help prevent overfitting. It adjusts the parameter by 
         a small factor of its current value.
         """
         if self.wd != 0:
-            p.data *= (1 - self.lr * self.wd)
-        # all same :3
-        # p.data *= (1 - self.lr * self.weight_decay)
-        # p.data = p.data - self.lr * self.weight_decay * p.data
-        # p.data -= self.lr * self.weight_decay * p.data
+            data *= 1 - self.lr * self.wd
+
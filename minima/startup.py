@@ -0,0 +1,101 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/09_startup.ipynb.
+
+# %% auto 0
+__all__ = ['IMPORT_BUDGET_MS', 'HEAVY_MODULES', 'ImportCost', 'import_costs', 'total_ms', 'heavy_imports', 'report', 'main']
+
+# %% ../nbs/09_startup.ipynb 2
+import argparse
+import re
+import subprocess
+import sys
+from collections import namedtuple
+from typing import List
+
+# %% ../nbs/09_startup.ipynb 3
+IMPORT_BUDGET_MS = 1000
+HEAVY_MODULES = ('torch', 'fastcore')
+
+ImportCost = namedtuple('ImportCost', ['module', 'self_us', 'cumulative_us', 'depth'])
+
+_IMPORT_TIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)')
+
+# %% ../nbs/09_startup.ipynb 4
+def import_costs(module: str = 'minima') -> List[ImportCost]:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime` and parses the timings of everything
+    imported on its behalf, leaving out the modules loaded by the interpreter at startup.
+
+    Args:
+        module (str): The module to import.
+
+    Returns:
+        List[ImportCost]: One entry per imported module, in the order the imports finished.
+            Times are in microseconds and `depth` is the nesting level of the import.
+
+    Example:
+        >>> costs = import_costs('minima')
+        >>> costs[-1].module
+        'minima'
+    """
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise ImportError(f'importing {module} failed:\n{proc.stderr}')
+    costs = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            costs.append(ImportCost(name, int(self_us), int(cumulative_us), len(indent) // 2))
+    # the timings are printed in post-order, so `module` closes a run of deeper imports
+    end = next(i for i, c in enumerate(costs) if c.module == module and c.depth == 0)
+    start = end
+    while start > 0 and costs[start - 1].depth > 0: start -= 1
+    return costs[start:end + 1]
+
+# %% ../nbs/09_startup.ipynb 5
+def total_ms(costs: List[ImportCost], module: str = 'minima') -> float:
+    "The cumulative import time of `module` in milliseconds."
+    return next(c.cumulative_us for c in costs if c.module == module) / 1e3
+
+def heavy_imports(costs: List[ImportCost]) -> List[str]:
+    "The modules of `HEAVY_MODULES` that were loaded."
+    loaded = {c.module.split('.')[0] for c in costs}
+    return [m for m in HEAVY_MODULES if m in loaded]
+
+# %% ../nbs/09_startup.ipynb 6
+def report(module: str = 'minima', top: int = 10) -> str:
+    """
+    Builds a human readable report of the import cost of `module`.
+
+    It lists the self and cumulative time of every submodule of `module`, the `top` most expensive
+    third-party packages, and whether any of the `HEAVY_MODULES` were loaded.
+    """
+    costs = import_costs(module)
+    stdlib = set(getattr(sys, 'stdlib_module_names', ()))
+    own = [c for c in costs if c.module == module or c.module.startswith(module + '.')]
+    third_party = [c for c in costs if '.' not in c.module and c.module != module
+                   and c.module not in stdlib and not c.module.startswith('_')]
+
+    lines = [f'import {module}: {total_ms(costs, module):.1f} ms (budget {IMPORT_BUDGET_MS} ms)', '',
+             f"{'submodule':<32} {'self (ms)':>10} {'cumulative (ms)':>16}"]
+    for c in sorted(own, key=lambda c: c.self_us, reverse=True):
+        lines.append(f'{c.module:<32} {c.self_us / 1e3:>10.1f} {c.cumulative_us / 1e3:>16.1f}')
+    lines += ['', f"{'package':<32} {'cumulative (ms)':>27}"]
+    for c in sorted(third_party, key=lambda c: c.cumulative_us, reverse=True)[:top]:
+        lines.append(f'{c.module:<32} {c.cumulative_us / 1e3:>27.1f}')
+    heavy = heavy_imports(costs)
+    lines += ['', f"heavy modules loaded: {', '.join(heavy) if heavy else 'none'}"]
+    return '\n'.join(lines)
+
+# %% ../nbs/09_startup.ipynb 7
+def main():
+    parser = argparse.ArgumentParser(description='Report the import cost of minima.')
+    parser.add_argument('--module', default='minima')
+    parser.add_argument('--top', type=int, default=10)
+    # unknown arguments are ignored so that this also runs inside a notebook kernel
+    args, _ = parser.parse_known_args()
+    print(report(args.module, args.top))
+
+if __name__ == '__main__':
+    main()
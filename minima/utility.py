@@ -1,13 +1,39 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: ../nbs/08_utility.ipynb.
 
 # %% auto 0
-__all__ = ['prod']
+__all__ = ['FLOAT_DTYPES', 'prod', 'numpy_dtype', 'float_dtype']
 
 # %% ../nbs/08_utility.ipynb 2
 import operator
 import math
 from functools import reduce
+import numpy as np
+try:
+    import ml_dtypes
+except ImportError:
+    ml_dtypes = None
 
 # %% ../nbs/08_utility.ipynb 3
 def prod(x):
     return reduce(operator.mul, x, 1)
+
+# %% ../nbs/08_utility.ipynb 4
+FLOAT_DTYPES = ('float32', 'float16', 'bfloat16')
+
+def numpy_dtype(dtype) -> np.dtype:
+    """
+    The numpy dtype named `dtype`, or `dtype` itself if it is one already. numpy has no bfloat16, which
+    comes from the optional `ml_dtypes` package.
+    """
+    if isinstance(dtype, str) and dtype == 'bfloat16':
+        if ml_dtypes is None:
+            raise ImportError("bfloat16 needs the ml_dtypes package, install it with `pip install ml_dtypes`")
+        return np.dtype(ml_dtypes.bfloat16)
+    return np.dtype(dtype)
+
+def float_dtype(dtype) -> str:
+    """The name of `dtype`, which must be one of the floating point types of `FLOAT_DTYPES`."""
+    name = dtype if isinstance(dtype, str) else np.dtype(dtype).name
+    if name not in FLOAT_DTYPES:
+        raise ValueError(f"unsupported dtype {name}, expected one of {FLOAT_DTYPES}")
+    return name
@@ -1,6 +1,8 @@
 from pkg_resources import parse_version
 from configparser import ConfigParser
 import setuptools, shlex
+try: from pybind11.setup_helpers import Pybind11Extension, build_ext
+except ImportError: Pybind11Extension = None
 assert parse_version(setuptools.__version__)>=parse_version('36.2')
 
 # note: all settings are in settings.ini; edit there, not here
@@ -30,6 +32,19 @@ min_python = cfg['min_python']
 lic = licenses.get(cfg['license'].lower(), (cfg['license'], None))
 dev_requirements = (cfg.get('dev_requirements') or '').split()
 
+# the compiled cpu backend is optional, minima falls back to the numpy backend without it
+ext_modules = [] if Pybind11Extension is None else [
+    Pybind11Extension(
+        f"{cfg.get('lib_path')}.ndarray_backend_cpu",
+        ['src/cpu_backend/ndarray_backend_cpu.cc', 'src/cpu_backend/operations.cc', 'src/cpu_backend/aligned_array.cc',
+         'src/cpu_backend/thread_pool.cc', 'src/cpu_backend/gemm.cc', 'src/cpu_backend/allocator.cc'],
+        include_dirs=['include'],
+        extra_compile_args=['-O3', '-ffp-contract=fast'],
+        cxx_std=17,
+    )
+]
+cmdclass = {} if Pybind11Extension is None else {'build_ext': build_ext}
+
 setuptools.setup(
     name = cfg['lib_name'],
     license = lic[0],
@@ -40,6 +55,8 @@ setuptools.setup(
     ] + ['Programming Language :: Python :: '+o for o in py_versions[py_versions.index(min_python):]] + (['License :: ' + lic[1] ] if lic[1] else []),
     url = cfg['git_url'],
     packages = setuptools.find_packages(),
+    ext_modules = ext_modules,
+    cmdclass = cmdclass,
     include_package_data = True,
     install_requires = requirements,
     extras_require={ 'dev': dev_requirements },
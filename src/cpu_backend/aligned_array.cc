@@ -1,16 +1,17 @@
 #include "../../include/cpu_backend/aligned_buffer.h"
+#include "../../include/cpu_backend/allocator.h"
 
 namespace minima {
 namespace cpu {
 
-AlignedBuffer::AlignedBuffer(const size_t& size) {
-  int ret = posix_memalign(reinterpret_cast<void**>(&buffer_), kAlignment, size * kElemSize);
-  if (ret != 0) throw std::bad_alloc();
+AlignedBuffer::AlignedBuffer(const size_t& size, DType dtype) {
+  buffer_ = allocator().Allocate(size * ElemSize(dtype), &capacity_);
   this->size_ = size;
+  this->dtype_ = dtype;
 }
 
 AlignedBuffer::~AlignedBuffer() {
-  free(this->buffer_);
+  allocator().Free(this->buffer_, capacity_);
 }
 
 size_t AlignedBuffer::PtrAsInt() const {
@@ -20,7 +21,7 @@ size_t AlignedBuffer::PtrAsInt() const {
 std::ostream& operator<< (std::ostream& out, const AlignedBuffer& aligned_buffer) {
     out << "[";
     for (size_t i = 0; i < aligned_buffer.size_; ++i) {
-        out << aligned_buffer.buffer_[i];
+        out << aligned_buffer.get_element(i);
         if (i != aligned_buffer.size_ - 1) out << ", ";
     }
     out << "]";
@@ -31,9 +32,17 @@ size_t AlignedBuffer::size() const {
     return this->size_;
 }
 
+DType AlignedBuffer::dtype() const {
+  return dtype_;
+}
+
 void AlignedBuffer::set_element(size_t index, ScalarT value) {
   if (index < size_) {
-    buffer_[index] = value;
+    switch (dtype_) {
+      case DType::kFloat16: static_cast<uint16_t*>(buffer_)[index] = FloatToHalf(value); break;
+      case DType::kBFloat16: static_cast<uint16_t*>(buffer_)[index] = FloatToBFloat16(value); break;
+      default: static_cast<ScalarT*>(buffer_)[index] = value;
+    }
   } else {
     throw std::out_of_range("Index out of range");
   }
@@ -41,13 +50,21 @@ void AlignedBuffer::set_element(size_t index, ScalarT value) {
 
 ScalarT AlignedBuffer::get_element(size_t index) const {
   if (index < size_) {
-    return buffer_[index];
+    switch (dtype_) {
+      case DType::kFloat16: return HalfToFloat(static_cast<const uint16_t*>(buffer_)[index]);
+      case DType::kBFloat16: return BFloat16ToFloat(static_cast<const uint16_t*>(buffer_)[index]);
+      default: return static_cast<const ScalarT*>(buffer_)[index];
+    }
   } else {
     throw std::out_of_range("Index out of range");
   }
 }
 
 ScalarT* AlignedBuffer::data() const {
+  return static_cast<ScalarT*>(buffer_);
+}
+
+void* AlignedBuffer::raw() const {
   return buffer_;
 }
 
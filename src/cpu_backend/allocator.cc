@@ -0,0 +1,132 @@
+#include "../../include/cpu_backend/allocator.h"
+#include "../../include/cpu_backend/aligned_buffer.h"
+
+#include <algorithm>
+#include <cstdlib>
+#include <iterator>
+#include <new>
+
+namespace minima {
+namespace cpu {
+
+namespace {
+
+constexpr size_t kSmallBucket = 512;
+constexpr size_t kLargeSize = size_t{1} << 20;
+
+size_t default_cache_limit() {
+  if (const char* env = std::getenv("MINIMA_CACHE_LIMIT")) {
+    char* end = nullptr;
+    unsigned long long limit = std::strtoull(env, &end, 10);
+    if (end != env) return static_cast<size_t>(limit);
+  }
+  return size_t{1} << 30;
+}
+
+}  // namespace
+
+CachingAllocator::CachingAllocator(size_t limit) : limit_(limit) {}
+
+CachingAllocator::~CachingAllocator() {
+  EmptyCache();
+}
+
+size_t CachingAllocator::RoundSize(size_t bytes) {
+  if (bytes <= kLargeSize) return std::max(kSmallBucket, (bytes + kSmallBucket - 1) / kSmallBucket * kSmallBucket);
+  size_t power = kLargeSize;
+  while (power <= bytes / 2) power *= 2;
+  const size_t step = power / 4;
+  return (bytes + step - 1) / step * step;
+}
+
+void* CachingAllocator::Allocate(size_t bytes, size_t* capacity) {
+  *capacity = RoundSize(bytes);
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    auto it = free_blocks_.find(*capacity);
+    if (it != free_blocks_.end() && !it->second.empty()) {
+      void* ptr = it->second.back();
+      it->second.pop_back();
+      stats_.bytes_held -= *capacity;
+      ++stats_.hits;
+      return ptr;
+    }
+    ++stats_.misses;
+  }
+
+  void* ptr = nullptr;
+  if (posix_memalign(&ptr, kAlignment, *capacity) != 0) {
+    // the cached blocks of other sizes may be what stands between us and the allocation
+    EmptyCache();
+    if (posix_memalign(&ptr, kAlignment, *capacity) != 0) throw std::bad_alloc();
+  }
+  return ptr;
+}
+
+void CachingAllocator::Free(void* ptr, size_t capacity) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    if (stats_.bytes_held + capacity <= limit_) {
+      free_blocks_[capacity].push_back(ptr);
+      stats_.bytes_held += capacity;
+      return;
+    }
+  }
+  free(ptr);
+}
+
+void CachingAllocator::EmptyCache() {
+  TrimTo(0);
+}
+
+void CachingAllocator::TrimTo(size_t limit) {
+  std::lock_guard<std::mutex> lock(mutex_);
+  for (auto it = free_blocks_.begin(); it != free_blocks_.end() && stats_.bytes_held > limit;) {
+    std::vector<void*>& blocks = it->second;
+    while (!blocks.empty() && stats_.bytes_held > limit) {
+      free(blocks.back());
+      blocks.pop_back();
+      stats_.bytes_held -= it->first;
+    }
+    it = blocks.empty() ? free_blocks_.erase(it) : std::next(it);
+  }
+}
+
+void CachingAllocator::set_limit(size_t limit) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    limit_ = limit;
+  }
+  TrimTo(limit);
+}
+
+size_t CachingAllocator::limit() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return limit_;
+}
+
+AllocatorStats CachingAllocator::stats() const {
+  std::lock_guard<std::mutex> lock(mutex_);
+  return stats_;
+}
+
+CachingAllocator& allocator() {
+  // never destroyed, buffers owned by Python objects may still be freed during interpreter shutdown
+  static CachingAllocator* instance = new CachingAllocator(default_cache_limit());
+  return *instance;
+}
+
+void empty_cache() {
+  allocator().EmptyCache();
+}
+
+void set_cache_limit(size_t limit) {
+  allocator().set_limit(limit);
+}
+
+size_t get_cache_limit() {
+  return allocator().limit();
+}
+
+}  // namespace cpu
+}  // namespace minima
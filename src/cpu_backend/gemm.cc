@@ -0,0 +1,164 @@
+#include "../../include/cpu_backend/gemm.h"
+#include "../../include/cpu_backend/thread_pool.h"
+
+#include <algorithm>
+#include <cstring>
+#include <vector>
+
+namespace minima {
+namespace cpu {
+
+namespace {
+
+// Register block of the micro-kernel: kMR x kNR accumulators, 12 AVX2 registers.
+constexpr size_t kMR = 6;
+constexpr size_t kNR = 16;
+
+// Cache blocks: a kKC x kNR panel of B stays in L1, a kMC x kKC block of A in L2, and a kKC x kNC
+// block of B in L3.
+constexpr size_t kKC = 256;
+constexpr size_t kMC = 96;
+constexpr size_t kNC = 4096;
+
+// Products with fewer flops than this run on the calling thread.
+constexpr size_t kParallelFlops = size_t{1} << 21;
+
+// Copies the kc x nc block of B at `b` into panels of kNR columns, each stored row by row,
+// padding the last panel with zeros.
+void pack_b(size_t kc, size_t nc, const float* b, size_t row_stride, size_t col_stride, float* packed) {
+  for (size_t j0 = 0; j0 < nc; j0 += kNR) {
+    const size_t nr = std::min(kNR, nc - j0);
+    for (size_t k = 0; k < kc; ++k) {
+      const float* row = b + k * row_stride + j0 * col_stride;
+      if (col_stride == 1) {
+        std::copy(row, row + nr, packed);
+      } else {
+        for (size_t j = 0; j < nr; ++j) packed[j] = row[j * col_stride];
+      }
+      std::fill(packed + nr, packed + kNR, 0.0f);
+      packed += kNR;
+    }
+  }
+}
+
+// Copies the mc x kc block of A at `a` into panels of kMR rows, each stored column by column,
+// padding the last panel with zeros.
+void pack_a(size_t mc, size_t kc, const float* a, size_t row_stride, size_t col_stride, float* packed) {
+  for (size_t i0 = 0; i0 < mc; i0 += kMR) {
+    const size_t mr = std::min(kMR, mc - i0);
+    for (size_t k = 0; k < kc; ++k) {
+      const float* col = a + i0 * row_stride + k * col_stride;
+      for (size_t i = 0; i < mr; ++i) packed[i] = col[i * row_stride];
+      std::fill(packed + mr, packed + kMR, 0.0f);
+      packed += kMR;
+    }
+  }
+}
+
+// Computes the kMR x kNR product of a packed panel of A and a packed panel of B with vectors of
+// `W` floats, `NB` columns at a time, and stores or accumulates its top-left mr x nr corner into C.
+template <size_t W, size_t NB>
+inline __attribute__((always_inline))
+void micro_kernel_impl(size_t kc, const float* __restrict__ a, const float* __restrict__ b,
+                       float* __restrict__ c, size_t c_row_stride, size_t mr, size_t nr, bool accumulate) {
+  typedef float vec __attribute__((vector_size(sizeof(float) * W)));
+  typedef float unaligned_vec __attribute__((vector_size(sizeof(float) * W), aligned(4)));
+  constexpr size_t kNV = NB / W;
+
+  for (size_t j0 = 0; j0 < nr; j0 += NB) {
+    vec acc[kMR][kNV] = {};
+    for (size_t k = 0; k < kc; ++k) {
+      vec b_k[kNV];
+      for (size_t v = 0; v < kNV; ++v) b_k[v] = *reinterpret_cast<const unaligned_vec*>(b + k * kNR + j0 + W * v);
+      for (size_t i = 0; i < kMR; ++i) {
+        const vec a_ik = vec{} + a[k * kMR + i];
+        for (size_t v = 0; v < kNV; ++v) acc[i][v] += a_ik * b_k[v];
+      }
+    }
+
+    float result[kMR][NB];
+    std::memcpy(result, acc, sizeof(result));
+    const size_t cols = std::min(NB, nr - j0);
+    for (size_t i = 0; i < mr; ++i) {
+      float* row = c + i * c_row_stride + j0;
+      if (accumulate) {
+        for (size_t j = 0; j < cols; ++j) row[j] += result[i][j];
+      } else {
+        for (size_t j = 0; j < cols; ++j) row[j] = result[i][j];
+      }
+    }
+  }
+}
+
+using MicroKernel = void (*)(size_t, const float*, const float*, float*, size_t, size_t, size_t, bool);
+
+// 128-bit vectors (SSE, NEON), the 16 columns are done in two passes to keep the 12 accumulators
+// in registers.
+void micro_kernel_generic(size_t kc, const float* a, const float* b, float* c, size_t c_row_stride,
+                          size_t mr, size_t nr, bool accumulate) {
+  micro_kernel_impl<4, 8>(kc, a, b, c, c_row_stride, mr, nr, accumulate);
+}
+
+#if defined(__GNUC__) && defined(__x86_64__)
+// 256-bit vectors with fused multiply-adds, picked at runtime so the extension stays portable.
+__attribute__((target("avx2,fma")))
+void micro_kernel_avx2(size_t kc, const float* a, const float* b, float* c, size_t c_row_stride,
+                       size_t mr, size_t nr, bool accumulate) {
+  micro_kernel_impl<8, 16>(kc, a, b, c, c_row_stride, mr, nr, accumulate);
+}
+#endif
+
+MicroKernel select_micro_kernel() {
+#if defined(__GNUC__) && defined(__x86_64__)
+  __builtin_cpu_init();
+  if (__builtin_cpu_supports("avx2") && __builtin_cpu_supports("fma")) return micro_kernel_avx2;
+#endif
+  return micro_kernel_generic;
+}
+
+const MicroKernel micro_kernel = select_micro_kernel();
+
+}  // namespace
+
+void gemm(size_t m, size_t n, size_t p,
+          const float* a, size_t a_row_stride, size_t a_col_stride,
+          const float* b, size_t b_row_stride, size_t b_col_stride,
+          float* c, size_t c_row_stride) {
+  if (m == 0 || p == 0) return;
+  if (n == 0) {
+    for (size_t i = 0; i < m; ++i) std::fill(c + i * c_row_stride, c + i * c_row_stride + p, 0.0f);
+    return;
+  }
+
+  const size_t max_nc = std::min(kNC, (p + kNR - 1) / kNR * kNR);
+  std::vector<float> packed_b(std::min(kKC, n) * max_nc);
+  // rows of C are only split across threads when the product is worth it
+  const size_t min_parallel = 2 * m * n * p < kParallelFlops ? m + 1 : 2 * kMR;
+
+  for (size_t jc = 0; jc < p; jc += kNC) {
+    const size_t nc = std::min(kNC, p - jc);
+    for (size_t pc = 0; pc < n; pc += kKC) {
+      const size_t kc = std::min(kKC, n - pc);
+      pack_b(kc, nc, b + pc * b_row_stride + jc * b_col_stride, b_row_stride, b_col_stride, packed_b.data());
+      const float* pb = packed_b.data();
+
+      parallel_for(m, [&, nc, kc, pc, jc, pb](size_t row_begin, size_t row_end) {
+        std::vector<float> packed_a(kMC * kc);
+        for (size_t ic = row_begin; ic < row_end; ic += kMC) {
+          const size_t mc = std::min(kMC, row_end - ic);
+          pack_a(mc, kc, a + ic * a_row_stride + pc * a_col_stride, a_row_stride, a_col_stride, packed_a.data());
+          for (size_t jr = 0; jr < nc; jr += kNR) {
+            for (size_t ir = 0; ir < mc; ir += kMR) {
+              micro_kernel(kc, packed_a.data() + ir * kc, pb + jr * kc,
+                           c + (ic + ir) * c_row_stride + jc + jr, c_row_stride,
+                           std::min(kMR, mc - ir), std::min(kNR, nc - jr), pc > 0);
+            }
+          }
+        }
+      }, min_parallel);
+    }
+  }
+}
+
+}  // namespace cpu
+}  // namespace minima
@@ -0,0 +1,152 @@
+#include <pybind11/numpy.h>
+#include <pybind11/pybind11.h>
+#include <pybind11/stl.h>
+
+#include <cstring>
+#include <functional>
+#include <numeric>
+#include <sstream>
+
+#include "../../include/cpu_backend/allocator.h"
+#include "../../include/cpu_backend/operations.h"
+#include "../../include/cpu_backend/thread_pool.h"
+
+namespace py = pybind11;
+using minima::cpu::AlignedBuffer;
+using minima::cpu::DType;
+using minima::cpu::ScalarT;
+
+/**
+ * @brief The numpy dtype of the elements of a buffer, bfloat16 comes from the `ml_dtypes` package.
+ */
+py::dtype numpy_dtype(DType dtype) {
+  switch (dtype) {
+    case DType::kFloat16: return py::dtype("float16");
+    case DType::kBFloat16: return py::dtype::from_args(py::module_::import("ml_dtypes").attr("bfloat16"));
+    default: return py::dtype::of<ScalarT>();
+  }
+}
+
+/**
+ * @brief Copy a strided view of a buffer into a new numpy array.
+ *
+ * @param a The buffer to read from.
+ * @param shape The shape of the view.
+ * @param strides The strides of the view, in elements.
+ * @param offset The offset of the view, in elements.
+ *
+ * @return A numpy array that owns a copy of the view.
+ */
+py::array to_numpy(const AlignedBuffer& a, const std::vector<size_t>& shape,
+                   const std::vector<size_t>& strides, size_t offset) {
+  const size_t elem_size = minima::cpu::ElemSize(a.dtype());
+  std::vector<size_t> numpy_strides = strides;
+  for (auto& s : numpy_strides) s *= elem_size;
+  // without a base object numpy copies the data, so the array outlives the buffer
+  return py::array(numpy_dtype(a.dtype()), shape, numpy_strides, static_cast<const char*>(a.raw()) + offset * elem_size);
+}
+
+/**
+ * @brief Copy a numpy array into a compact buffer.
+ *
+ * @param a The array to copy, cast to a C-contiguous array of the dtype of `out` if needed.
+ * @param out The buffer to write to, of the same size as `a`.
+ */
+void from_numpy(py::array a, AlignedBuffer* out) {
+  if (static_cast<size_t>(a.size()) != out->size()) {
+    throw std::invalid_argument("Size mismatch between input and output arrays");
+  }
+  py::array compact = py::module_::import("numpy").attr("ascontiguousarray")(a, numpy_dtype(out->dtype()));
+  std::memcpy(out->raw(), compact.data(), out->size() * minima::cpu::ElemSize(out->dtype()));
+}
+
+PYBIND11_MODULE(ndarray_backend_cpu, m) {
+  namespace cpu = minima::cpu;
+
+  m.attr("__device_name__") = "cpu";
+
+  py::class_<AlignedBuffer>(m, "Array")
+      .def(py::init([](size_t size, const std::string& dtype) {
+             return new AlignedBuffer(size, minima::cpu::ParseDType(dtype));
+           }), py::arg("size"), py::arg("dtype") = "float32", py::return_value_policy::take_ownership)
+      .def("ptr", &AlignedBuffer::PtrAsInt)
+      .def_property_readonly("size", &AlignedBuffer::size)
+      .def_property_readonly("dtype", [](const AlignedBuffer& a) { return minima::cpu::DTypeName(a.dtype()); })
+      .def("__repr__", [](const AlignedBuffer& a) {
+        std::ostringstream out;
+        out << a;
+        return out.str();
+      });
+
+  m.def("set_num_threads", cpu::set_num_threads);
+  m.def("get_num_threads", cpu::get_num_threads);
+  m.def("set_parallel_threshold", cpu::set_parallel_threshold);
+  m.def("get_parallel_threshold", cpu::get_parallel_threshold);
+
+  m.def("empty_cache", cpu::empty_cache);
+  m.def("set_cache_limit", cpu::set_cache_limit);
+  m.def("get_cache_limit", cpu::get_cache_limit);
+  m.def("memory_stats", []() {
+    const cpu::AllocatorStats stats = cpu::allocator().stats();
+    py::dict out;
+    out["hits"] = stats.hits;
+    out["misses"] = stats.misses;
+    out["bytes_held"] = stats.bytes_held;
+    return out;
+  });
+
+  m.def("to_numpy", to_numpy);
+  m.def("from_numpy", from_numpy);
+  m.def("cast", cpu::cast);
+
+  m.def("fill", cpu::fill);
+  m.def("compact", cpu::compact);
+  m.def("ewise_setitem", cpu::ewise_setitem);
+  // same argument order as the numpy backend, the kernel also needs the number of elements
+  m.def("scalar_setitem", [](ScalarT val, AlignedBuffer* out, const std::vector<uint32_t>& shape,
+                             const std::vector<uint32_t>& strides, size_t offset) {
+    size_t size = std::accumulate(shape.begin(), shape.end(), size_t{1}, std::multiplies<size_t>());
+    cpu::scalar_setitem(size, val, out, shape, strides, offset);
+  });
+
+  m.def("ewise_add", cpu::ewise_add);
+  m.def("scalar_add", cpu::scalar_add);
+  m.def("ewise_sub", cpu::ewise_sub);
+  m.def("scalar_sub", cpu::scalar_sub);
+  m.def("scalar_rsub", cpu::scalar_rsub);
+  m.def("ewise_mul", cpu::ewise_mul);
+  m.def("scalar_mul", cpu::scalar_mul);
+  m.def("ewise_div", cpu::ewise_div);
+  m.def("scalar_div", cpu::scalar_div);
+  m.def("scalar_power", cpu::scalar_power);
+
+  m.def("ewise_maximum", cpu::ewise_maximum);
+  m.def("scalar_maximum", cpu::scalar_maximum);
+  m.def("ewise_eq", cpu::ewise_eq);
+  m.def("scalar_eq", cpu::scalar_eq);
+  m.def("ewise_ge", cpu::ewise_ge);
+  m.def("scalar_ge", cpu::scalar_ge);
+
+  m.def("ewise_add_strided", cpu::ewise_add_strided);
+  m.def("ewise_sub_strided", cpu::ewise_sub_strided);
+  m.def("ewise_mul_strided", cpu::ewise_mul_strided);
+  m.def("ewise_div_strided", cpu::ewise_div_strided);
+  m.def("ewise_maximum_strided", cpu::ewise_maximum_strided);
+  m.def("ewise_eq_strided", cpu::ewise_eq_strided);
+  m.def("ewise_ge_strided", cpu::ewise_ge_strided);
+
+  m.def("ewise_log", cpu::ewise_log);
+  m.def("ewise_exp", cpu::ewise_exp);
+  m.def("ewise_tanh", cpu::ewise_tanh);
+
+  m.def("matmul", cpu::matmul);
+  m.def("matmul_batched", cpu::matmul_batched);
+
+  m.def("reduce_max", cpu::reduce_max);
+  m.def("reduce_sum", cpu::reduce_sum);
+  m.def("reduce_sum_strided", cpu::reduce_sum_strided);
+  m.def("reduce_max_strided", cpu::reduce_max_strided);
+  m.def("reduce_mean_var_strided", cpu::reduce_mean_var_strided);
+  m.def("log_softmax_nll", cpu::log_softmax_nll);
+  m.def("log_softmax_nll_backward", cpu::log_softmax_nll_backward);
+}
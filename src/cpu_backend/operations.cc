@@ -1,96 +1,511 @@
 #include "../../include/cpu_backend/operations.h"
+#include "../../include/cpu_backend/gemm.h"
+#include "../../include/cpu_backend/thread_pool.h"
+#include <algorithm>
+#include <cassert>
+#include <cmath>
+#include <cstring>
+#include <functional>
+#include <mutex>
 #include <numeric>
+#include <stdexcept>
 #include <vector>
 
+namespace {
+
+using minima::cpu::DType;
+
+// The kernels read and write 16-bit buffers in place. Elements are converted through float32 a chunk
+// at a time, which keeps the dtype dispatch out of the inner loops and never stages a whole buffer.
+constexpr size_t kCastChunk = 256;
+
+void load_floats(const void* src, DType dtype, size_t n, float* out) {
+  const uint16_t* half = static_cast<const uint16_t*>(src);
+  switch (dtype) {
+    case DType::kFloat16: for (size_t i = 0; i < n; ++i) out[i] = minima::cpu::HalfToFloat(half[i]); break;
+    case DType::kBFloat16: for (size_t i = 0; i < n; ++i) out[i] = minima::cpu::BFloat16ToFloat(half[i]); break;
+    default: std::memcpy(out, src, n * sizeof(float));
+  }
+}
+
+void store_floats(const float* values, size_t n, DType dtype, void* dst) {
+  uint16_t* half = static_cast<uint16_t*>(dst);
+  switch (dtype) {
+    case DType::kFloat16: for (size_t i = 0; i < n; ++i) half[i] = minima::cpu::FloatToHalf(values[i]); break;
+    case DType::kBFloat16: for (size_t i = 0; i < n; ++i) half[i] = minima::cpu::FloatToBFloat16(values[i]); break;
+    default: std::memcpy(dst, values, n * sizeof(float));
+  }
+}
+
+// Loads the `n` elements `stride` apart from element `index` of `src` into `out`.
+void load_strided(const void* src, DType dtype, size_t index, size_t stride, size_t n, float* out) {
+  const size_t elem_size = minima::cpu::ElemSize(dtype);
+  const char* base = static_cast<const char*>(src) + index * elem_size;
+  if (stride == 1) {
+    load_floats(base, dtype, n, out);
+  } else if (stride == 0) {
+    load_floats(base, dtype, 1, out);
+    std::fill(out + 1, out + n, out[0]);
+  } else {
+    for (size_t i = 0; i < n; ++i) load_floats(base + i * stride * elem_size, dtype, 1, out + i);
+  }
+}
+
+// The bits of `value` stored as a 16-bit `dtype`.
+uint16_t half_bits(float value, DType dtype) {
+  return dtype == DType::kFloat16 ? minima::cpu::FloatToHalf(value) : minima::cpu::FloatToBFloat16(value);
+}
+
+// The element types that kernels read in place, converting every element to float32 as they go.
+struct Float32Elems {
+  using T = float;
+  static float Load(float x) { return x; }
+};
+
+struct Float16Elems {
+  using T = uint16_t;
+  static float Load(uint16_t x) { return minima::cpu::HalfToFloat(x); }
+};
+
+struct BFloat16Elems {
+  using T = uint16_t;
+  static float Load(uint16_t x) { return minima::cpu::BFloat16ToFloat(x); }
+};
+
+// Calls `fn` with the element type of `dtype`, so that the kernel it runs is compiled for each type.
+template <typename Fn>
+void dispatch_elems(DType dtype, Fn fn) {
+  switch (dtype) {
+    case DType::kFloat16: fn(Float16Elems{}); break;
+    case DType::kBFloat16: fn(BFloat16Elems{}); break;
+    default: fn(Float32Elems{});
+  }
+}
+
+bool all_float32(std::initializer_list<const minima::cpu::AlignedBuffer*> buffers) {
+  return std::all_of(buffers.begin(), buffers.end(), [](const auto* b) { return b->dtype() == DType::kFloat32; });
+}
+
+}  // namespace
+
 void minima::cpu::fill(AlignedBuffer *out, const ScalarT &value) {
-  for (size_t i = 0; i < out->size(); i++) {
-    out->set_element(i, value);
+  if (out->dtype() != DType::kFloat32) {
+    uint16_t* po = static_cast<uint16_t*>(out->raw());
+    const uint16_t bits = half_bits(value, out->dtype());
+    parallel_for(out->size(), [=](size_t begin, size_t end) {
+      std::fill(po + begin, po + end, bits);
+    });
+    return;
   }
+  ScalarT* po = out->data();
+  parallel_for(out->size(), [=](size_t begin, size_t end) {
+    std::fill(po + begin, po + end, value);
+  });
 }
 
-// Helper function to calculate the index in stride-based representation
-size_t calculate_index(const std::vector<uint32_t> &indices,
-                       const std::vector<uint32_t> &strides,
-                       size_t offset = 0) {
-    return std::inner_product(indices.begin(), indices.end(), strides.begin(), offset);
+namespace {
+
+// Converts the first `size` elements of `a` into `out`, across the thread pool.
+void convert(const minima::cpu::AlignedBuffer& a, minima::cpu::AlignedBuffer* out, size_t size) {
+  const char* src = static_cast<const char*>(a.raw());
+  char* dst = static_cast<char*>(out->raw());
+  const DType from = a.dtype(), to = out->dtype();
+  const size_t from_size = minima::cpu::ElemSize(from), to_size = minima::cpu::ElemSize(to);
+  minima::cpu::parallel_for(size, [=](size_t begin, size_t end) {
+    float chunk[kCastChunk];
+    for (size_t i = begin; i < end; i += kCastChunk) {
+      const size_t n = std::min(kCastChunk, end - i);
+      load_floats(src + i * from_size, from, n, chunk);
+      store_floats(chunk, n, to, dst + i * to_size);
+    }
+  });
 }
 
-// Helper function to increment the multidimensional index
-void increment_indices(std::vector<uint32_t>& indices, 
-                       const std::vector<uint32_t>& shape) {
-    // Start from the last dimension
-    for (size_t dim = shape.size() - 1; dim >= 0; --dim) {
-        // If the index in this dimension is less than its maximum
-        // (shape[dim] - 1), it means we can still increment the index
-        // in this dimension
-        if (indices[dim] < shape[dim] - 1) {
-            ++indices[dim];
-            break;
-        } else {
-            // For all dimensions that can't be incremented further,
-            // their indices are reset to 0 (like an odometer)
-            indices[dim] = 0;
+}  // namespace
+
+void minima::cpu::cast(const AlignedBuffer& a, AlignedBuffer* out) {
+  if (a.size() != out->size()) throw std::invalid_argument("Size mismatch between input and output arrays");
+  convert(a, out, a.size());
+}
+
+namespace {
+
+using minima::cpu::ScalarT;
+
+// Tiles used to copy blocks whose columns are at least a cache line apart, so that the lines of the
+// strided side are reused across the rows of a tile instead of being evicted after a single element.
+constexpr size_t kCopyTileRows = 64;
+constexpr size_t kCopyTileCols = 32;
+constexpr size_t kCacheLineBytes = 64;
+
+// A strided view reduced to its essential rank: unit dimensions are dropped, dimensions that are
+// contiguous with the next one are merged, and the result is padded to at least two dimensions.
+struct StridedLayout {
+  std::vector<size_t> shape;
+  std::vector<size_t> strides;
+};
+
+StridedLayout collapse(const std::vector<uint32_t>& shape, const std::vector<uint32_t>& strides) {
+  StridedLayout layout;
+  for (size_t i = 0; i < shape.size(); ++i) {
+    if (shape[i] == 1) continue;
+    if (!layout.shape.empty() && layout.strides.back() == size_t{strides[i]} * shape[i]) {
+      layout.shape.back() *= shape[i];
+      layout.strides.back() = strides[i];
+    } else {
+      layout.shape.push_back(shape[i]);
+      layout.strides.push_back(strides[i]);
+    }
+  }
+  while (layout.shape.size() < 2) {
+    layout.shape.insert(layout.shape.begin(), 1);
+    layout.strides.insert(layout.strides.begin(), 0);
+  }
+  return layout;
+}
+
+// Throws if a view of `shape`, `strides` and `offset` reaches past the end of a buffer of `size` elements.
+void check_bounds(const std::vector<uint32_t>& shape, const std::vector<uint32_t>& strides,
+                  size_t offset, size_t size) {
+  size_t last = offset;
+  for (size_t i = 0; i < shape.size(); ++i) {
+    if (shape[i] == 0) return;
+    last += size_t{strides[i]} * (shape[i] - 1);
+  }
+  if (last >= size) throw std::out_of_range("Index out of range");
+}
+
+// Calls `block(strided_offset, compact_offset)` for every 2-D block made of the last two dimensions
+// of `layout`. The outer dimensions are walked with incremental offsets, without index arithmetic
+// per element.
+template <typename BlockFn>
+void for_each_block(const StridedLayout& layout, BlockFn block) {
+  const size_t outer_rank = layout.shape.size() - 2;
+  const size_t block_size = layout.shape[outer_rank] * layout.shape[outer_rank + 1];
+  if (outer_rank == 0) {
+    block(0, 0);
+    return;
+  }
+  if (outer_rank == 1) {
+    for (size_t i = 0; i < layout.shape[0]; ++i) block(i * layout.strides[0], i * block_size);
+    return;
+  }
+  const size_t n_blocks = std::accumulate(layout.shape.begin(), layout.shape.begin() + outer_rank,
+                                          size_t{1}, std::multiplies<size_t>());
+  std::vector<size_t> index(outer_rank, 0);
+  size_t offset = 0;
+  for (size_t b = 0; b < n_blocks; ++b) {
+    block(offset, b * block_size);
+    for (size_t dim = outer_rank; dim-- > 0;) {
+      if (++index[dim] < layout.shape[dim]) {
+        offset += layout.strides[dim];
+        break;
+      }
+      offset -= layout.strides[dim] * (layout.shape[dim] - 1);
+      index[dim] = 0;
+    }
+  }
+}
+
+// Copies a `rows` x `cols` block between a strided view and a compact buffer, in the direction given
+// by `kToCompact`. Contiguous rows are copied with memcpy, broadcast rows are filled, rows with a short
+// stride are streamed, and transposed-like layouts are copied in tiles.
+template <bool kToCompact, typename T>
+void copy_block(T* strided, T* compact, size_t rows, size_t cols,
+                size_t row_stride, size_t col_stride) {
+  if (col_stride == 1) {
+    for (size_t i = 0; i < rows; ++i) {
+      T* s = strided + i * row_stride;
+      T* c = compact + i * cols;
+      if (kToCompact) std::memcpy(c, s, cols * sizeof(T));
+      else std::memcpy(s, c, cols * sizeof(T));
+    }
+    return;
+  }
+  if (kToCompact && col_stride == 0) {
+    for (size_t i = 0; i < rows; ++i) std::fill(compact + i * cols, compact + (i + 1) * cols, strided[i * row_stride]);
+    return;
+  }
+  const bool short_stride = col_stride * sizeof(T) < kCacheLineBytes;
+  const size_t tile_rows = short_stride ? 1 : kCopyTileRows;
+  const size_t tile_cols = short_stride ? cols : kCopyTileCols;
+  for (size_t i0 = 0; i0 < rows; i0 += tile_rows) {
+    const size_t i1 = std::min(i0 + tile_rows, rows);
+    for (size_t j0 = 0; j0 < cols; j0 += tile_cols) {
+      const size_t j1 = std::min(j0 + tile_cols, cols);
+      for (size_t i = i0; i < i1; ++i) {
+        T* s = strided + i * row_stride;
+        T* c = compact + i * cols;
+        for (size_t j = j0; j < j1; ++j) {
+          if (kToCompact) c[j] = s[j * col_stride];
+          else s[j * col_stride] = c[j];
         }
+      }
+    }
+  }
+}
+
+// Copies every block of the strided view of `layout` from or to a compact buffer, elements of the
+// same dtype being copied as they are, whatever it is.
+template <bool kToCompact, typename T>
+void copy_view(T* strided, T* compact, const StridedLayout& layout) {
+  const size_t r = layout.shape.size();
+  for_each_block(layout, [&](size_t strided_offset, size_t compact_offset) {
+    copy_block<kToCompact>(strided + strided_offset, compact + compact_offset, layout.shape[r - 2], layout.shape[r - 1],
+                           layout.strides[r - 2], layout.strides[r - 1]);
+  });
+}
+
+template <bool kToCompact>
+void copy_view(const minima::cpu::AlignedBuffer& strided, size_t offset, const minima::cpu::AlignedBuffer& compact,
+               const StridedLayout& layout) {
+  if (minima::cpu::ElemSize(strided.dtype()) == sizeof(uint16_t)) {
+    copy_view<kToCompact>(static_cast<uint16_t*>(strided.raw()) + offset, static_cast<uint16_t*>(compact.raw()), layout);
+  } else {
+    copy_view<kToCompact>(strided.data() + offset, compact.data(), layout);
+  }
+}
+
+template <typename T>
+void fill_view(T* dst, const StridedLayout& layout, T val) {
+  const size_t r = layout.shape.size();
+  const size_t rows = layout.shape[r - 2], cols = layout.shape[r - 1];
+  const size_t row_stride = layout.strides[r - 2], col_stride = layout.strides[r - 1];
+  for_each_block(layout, [&](size_t strided_offset, size_t) {
+    for (size_t i = 0; i < rows; ++i) {
+      T* row = dst + strided_offset + i * row_stride;
+      if (col_stride == 1) std::fill(row, row + cols, val);
+      else for (size_t j = 0; j < cols; ++j) row[j * col_stride] = val;
     }
+  });
 }
 
+}  // namespace
+
 
 void minima::cpu::compact(const AlignedBuffer& a, AlignedBuffer* out, const std::vector<uint32_t>& shape,
              const std::vector<uint32_t>& strides, size_t offset) {
-    std::vector<uint32_t> indices(shape.size(), 0); 
-
-    for (size_t i = 0; i < out->size(); ++i) {
-        size_t index = calculate_index(indices, strides, offset);
-        out->set_element(i, a.get_element(index));
-        increment_indices(indices, shape);
-    } 
+    check_bounds(shape, strides, offset, a.size());
+    if (a.dtype() != out->dtype()) {
+        // only the elements of the view are copied, then converted
+        AlignedBuffer compacted(out->size(), a.dtype());
+        compact(a, &compacted, shape, strides, offset);
+        cast(compacted, out);
+        return;
+    }
+    copy_view<true>(a, offset, *out, collapse(shape, strides));
 }
 
 void minima::cpu::ewise_setitem(const AlignedBuffer& a, AlignedBuffer* out, const std::vector<uint32_t>& shape,
                   const std::vector<uint32_t>& strides, size_t offset) {
-
-   std::vector<uint32_t> indices(shape.size(), 0);
-
-    for (size_t i = 0; i < a.size(); ++i) {
-        size_t index = calculate_index(indices, strides, offset);
-        out->set_element(index, a.get_element(index));
-        increment_indices(indices, shape);
+    check_bounds(shape, strides, offset, out->size());
+    if (a.dtype() != out->dtype()) {
+        AlignedBuffer converted(a.size(), out->dtype());
+        cast(a, &converted);
+        ewise_setitem(converted, out, shape, strides, offset);
+        return;
     }
+    copy_view<false>(*out, offset, a, collapse(shape, strides));
 }
 
 void minima::cpu::scalar_setitem(const size_t size, ScalarT val, AlignedBuffer* out, const std::vector<uint32_t>& shape,
                    const std::vector<uint32_t>& strides, size_t offset) {
-    std::vector<uint32_t> indices(shape.size(), 0);
-
-    for (size_t i = 0; i < size; ++i) {
-        size_t index = calculate_index(indices, strides, offset);
-        out->set_element(index, val);
-        increment_indices(indices, shape);
+    check_bounds(shape, strides, offset, out->size());
+    const StridedLayout layout = collapse(shape, strides);
+    if (out->dtype() != DType::kFloat32) {
+        fill_view(static_cast<uint16_t*>(out->raw()) + offset, layout, half_bits(val, out->dtype()));
+    } else {
+        fill_view(out->data() + offset, layout, val);
     }
 }
 
 
+// The kernels below work on raw pointers over [begin, end) chunks so that the loops vectorize, and
+// are split across the thread pool once the arrays are large enough.
+
+// Runs `chunk(n, x, y, o)` over [begin, end) in pieces of kCastChunk elements, with the elements of
+// the inputs `a` and, if given, `b` loaded into `x` and `y` as float32, and `o` stored into `out` after.
+template <typename ChunkFn>
+void convertedChunks(const minima::cpu::AlignedBuffer& a, const minima::cpu::AlignedBuffer* b,
+                     minima::cpu::AlignedBuffer* out, size_t begin, size_t end, ChunkFn chunk) {
+  const char* pa = static_cast<const char*>(a.raw());
+  const char* pb = b ? static_cast<const char*>(b->raw()) : nullptr;
+  char* po = static_cast<char*>(out->raw());
+  const size_t sa = minima::cpu::ElemSize(a.dtype()), so = minima::cpu::ElemSize(out->dtype());
+  const size_t sb = b ? minima::cpu::ElemSize(b->dtype()) : 0;
+  float x[kCastChunk], y[kCastChunk], o[kCastChunk];
+  for (size_t i = begin; i < end; i += kCastChunk) {
+    const size_t n = std::min(kCastChunk, end - i);
+    load_floats(pa + i * sa, a.dtype(), n, x);
+    if (b) load_floats(pb + i * sb, b->dtype(), n, y);
+    chunk(n, x, y, o);
+    store_floats(o, n, out->dtype(), po + i * so);
+  }
+}
+
 template <typename F>
 void eWiseOperation(const minima::cpu::AlignedBuffer& a, const minima::cpu::AlignedBuffer& b, minima::cpu::AlignedBuffer* out, F func) {
-  assert(a.size() == b.size());
-  for (size_t i = 0; i < a.size(); i++) {
-    out->set_element(i, func(a.get_element(i), b.get_element(i)));
+  if (a.size() != b.size()) throw std::invalid_argument("Size mismatch between input arrays");
+  if (!all_float32({&a, &b, out})) {
+    minima::cpu::parallel_for(a.size(), [&, func](size_t begin, size_t end) {
+      convertedChunks(a, &b, out, begin, end, [&](size_t n, const float* x, const float* y, float* o) {
+        for (size_t j = 0; j < n; ++j) o[j] = func(x[j], y[j]);
+      });
+    });
+    return;
   }
+  const minima::cpu::ScalarT* pa = a.data();
+  const minima::cpu::ScalarT* pb = b.data();
+  minima::cpu::ScalarT* po = out->data();
+  minima::cpu::parallel_for(a.size(), [=](size_t begin, size_t end) {
+    for (size_t i = begin; i < end; i++) po[i] = func(pa[i], pb[i]);
+  });
 }
 
 template <typename F>
 void scalarOperation(const minima::cpu::AlignedBuffer& a, minima::cpu::ScalarT val, minima::cpu::AlignedBuffer* out, F func) {
-  for (size_t i = 0; i < a.size(); i++) {
-    out->set_element(i, func(a.get_element(i), val));
+  if (!all_float32({&a, out})) {
+    minima::cpu::parallel_for(a.size(), [&, func, val](size_t begin, size_t end) {
+      convertedChunks(a, nullptr, out, begin, end, [&](size_t n, const float* x, const float*, float* o) {
+        for (size_t j = 0; j < n; ++j) o[j] = func(x[j], val);
+      });
+    });
+    return;
   }
+  const minima::cpu::ScalarT* pa = a.data();
+  minima::cpu::ScalarT* po = out->data();
+  minima::cpu::parallel_for(a.size(), [=](size_t begin, size_t end) {
+    for (size_t i = begin; i < end; i++) po[i] = func(pa[i], val);
+  });
 }
 
 template <typename F>
 void UnaryOperation(const minima::cpu::AlignedBuffer& a,  minima::cpu::AlignedBuffer* out, F func) {
-  for (size_t i = 0; i < a.size(); i++) {
-    out->set_element(i, func(a.get_element(i)));
-    // out->ptr[i] = func(a.ptr[i]); :3
+  if (!all_float32({&a, out})) {
+    minima::cpu::parallel_for(a.size(), [&, func](size_t begin, size_t end) {
+      convertedChunks(a, nullptr, out, begin, end, [&](size_t n, const float* x, const float*, float* o) {
+        for (size_t j = 0; j < n; ++j) o[j] = func(x[j]);
+      });
+    });
+    return;
+  }
+  const minima::cpu::ScalarT* pa = a.data();
+  minima::cpu::ScalarT* po = out->data();
+  minima::cpu::parallel_for(a.size(), [=](size_t begin, size_t end) {
+    for (size_t i = begin; i < end; i++) po[i] = func(pa[i]);
+  });
+}
+
+// Shape of a broadcast operation over two strided operands, with unit dimensions dropped and the
+// dimensions that are contiguous in both operands merged, so that the innermost loop is as long as
+// possible. Zero (broadcast) strides merge like any other.
+struct BroadcastLayout {
+  std::vector<size_t> shape;
+  std::vector<size_t> a_strides;
+  std::vector<size_t> b_strides;
+};
+
+BroadcastLayout collapse_pair(const std::vector<uint32_t>& shape, const std::vector<uint32_t>& a_strides,
+                              const std::vector<uint32_t>& b_strides) {
+  BroadcastLayout layout;
+  for (size_t i = 0; i < shape.size(); ++i) {
+    if (shape[i] == 1) continue;
+    if (!layout.shape.empty() && layout.a_strides.back() == size_t{a_strides[i]} * shape[i] &&
+        layout.b_strides.back() == size_t{b_strides[i]} * shape[i]) {
+      layout.shape.back() *= shape[i];
+      layout.a_strides.back() = a_strides[i];
+      layout.b_strides.back() = b_strides[i];
+    } else {
+      layout.shape.push_back(shape[i]);
+      layout.a_strides.push_back(a_strides[i]);
+      layout.b_strides.push_back(b_strides[i]);
+    }
+  }
+  if (layout.shape.empty()) {
+    layout.shape.push_back(1);
+    layout.a_strides.push_back(0);
+    layout.b_strides.push_back(0);
+  }
+  return layout;
+}
+
+// Writes func(a, b) into the compact `out` of `shape`, reading both operands through their own
+// strides, row by row along the last collapsed dimension. Operands that are contiguous or broadcast
+// along that dimension get loops that vectorize.
+template <typename F>
+void BroadcastOperation(const minima::cpu::AlignedBuffer& a, const minima::cpu::AlignedBuffer& b,
+                        minima::cpu::AlignedBuffer* out, const std::vector<uint32_t>& shape,
+                        const std::vector<uint32_t>& a_strides, size_t a_offset,
+                        const std::vector<uint32_t>& b_strides, size_t b_offset, F func) {
+  if (out == nullptr) throw std::invalid_argument("Null pointer passed to function");
+  if (a_strides.size() != shape.size() || b_strides.size() != shape.size()) {
+    throw std::invalid_argument("Strides must have one entry per dimension");
   }
+  size_t size = 1;
+  for (uint32_t dim : shape) size *= dim;
+  if (out->size() < size) throw std::invalid_argument("Size mismatch between input and output arrays");
+  if (size == 0) return;
+  check_bounds(shape, a_strides, a_offset, a.size());
+  check_bounds(shape, b_strides, b_offset, b.size());
+
+  const BroadcastLayout layout = collapse_pair(shape, a_strides, b_strides);
+  const size_t outer_rank = layout.shape.size() - 1;
+  const size_t cols = layout.shape[outer_rank];
+  const size_t sa = layout.a_strides[outer_rank];
+  const size_t sb = layout.b_strides[outer_rank];
+  const minima::cpu::ScalarT* pa = a.data() + a_offset;
+  const minima::cpu::ScalarT* pb = b.data() + b_offset;
+  minima::cpu::ScalarT* po = out->data();
+  const bool converted = !all_float32({&a, &b, out});
+
+  minima::cpu::parallel_for(size / cols, [&, pa, pb, po](size_t begin, size_t end) {
+    // index of row `begin` in the outer dimensions, advanced incrementally afterwards
+    std::vector<size_t> index(outer_rank);
+    size_t ia = 0, ib = 0, rest = begin;
+    for (size_t d = outer_rank; d-- > 0;) {
+      index[d] = rest % layout.shape[d];
+      rest /= layout.shape[d];
+      ia += index[d] * layout.a_strides[d];
+      ib += index[d] * layout.b_strides[d];
+    }
+    float xs[kCastChunk], ys[kCastChunk], os[kCastChunk];
+    for (size_t row = begin; row < end; ++row) {
+      if (converted) {
+        // 16-bit operands are loaded a chunk of the row at a time
+        for (size_t j0 = 0; j0 < cols; j0 += kCastChunk) {
+          const size_t n = std::min(kCastChunk, cols - j0);
+          load_strided(a.raw(), a.dtype(), a_offset + ia + j0 * sa, sa, n, xs);
+          load_strided(b.raw(), b.dtype(), b_offset + ib + j0 * sb, sb, n, ys);
+          for (size_t j = 0; j < n; ++j) os[j] = func(xs[j], ys[j]);
+          store_floats(os, n, out->dtype(),
+                       static_cast<char*>(out->raw()) + (row * cols + j0) * minima::cpu::ElemSize(out->dtype()));
+        }
+      } else {
+        const minima::cpu::ScalarT* x = pa + ia;
+        const minima::cpu::ScalarT* y = pb + ib;
+        minima::cpu::ScalarT* o = po + row * cols;
+        if (sa == 1 && sb == 1) {
+          for (size_t j = 0; j < cols; ++j) o[j] = func(x[j], y[j]);
+        } else if (sa == 1 && sb == 0) {
+          const minima::cpu::ScalarT y0 = *y;
+          for (size_t j = 0; j < cols; ++j) o[j] = func(x[j], y0);
+        } else if (sa == 0 && sb == 1) {
+          const minima::cpu::ScalarT x0 = *x;
+          for (size_t j = 0; j < cols; ++j) o[j] = func(x0, y[j]);
+        } else {
+          for (size_t j = 0; j < cols; ++j) o[j] = func(x[j * sa], y[j * sb]);
+        }
+      }
+      for (size_t d = outer_rank; d-- > 0;) {
+        ia += layout.a_strides[d];
+        ib += layout.b_strides[d];
+        if (++index[d] < layout.shape[d]) break;
+        ia -= layout.a_strides[d] * layout.shape[d];
+        ib -= layout.b_strides[d] * layout.shape[d];
+        index[d] = 0;
+      }
+    }
+  }, std::max<size_t>(1, minima::cpu::get_parallel_threshold() / cols));
 }
 
 // Function to check for null pointers
@@ -120,6 +535,24 @@ void minima::cpu::scalar_add(const AlignedBuffer& a, ScalarT val, AlignedBuffer*
     scalarOperation(a, val, out, std::plus<ScalarT>());
 }
 
+void minima::cpu::ewise_sub(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out) {
+    checkNullPointers(&a, &b, out);
+    checkSizeMatch(a, *out);
+    eWiseOperation(a, b, out, std::minus<ScalarT>());
+}
+
+void minima::cpu::scalar_sub(const AlignedBuffer& a, ScalarT val, AlignedBuffer* out) {
+    checkNullPointers(&a, nullptr, out);
+    checkSizeMatch(a, *out);
+    scalarOperation(a, val, out, std::minus<ScalarT>());
+}
+
+void minima::cpu::scalar_rsub(const AlignedBuffer& a, ScalarT val, AlignedBuffer* out) {
+    checkNullPointers(&a, nullptr, out);
+    checkSizeMatch(a, *out);
+    scalarOperation(a, val, out, [](ScalarT x, ScalarT val) { return val - x; });
+}
+
 void minima::cpu::ewise_mul(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out) {
     checkNullPointers(&a, nullptr, out);
     checkSizeMatch(a, *out); 
@@ -186,25 +619,210 @@ void minima::cpu::scalar_maximum(const AlignedBuffer& a, ScalarT val, AlignedBuf
 void minima::cpu::ewise_eq(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out) {
     checkNullPointers(&a, nullptr, out);
     checkSizeMatch(a, *out);
-    eWiseOperation(a, b, out, [](ScalarT x, ScalarT y) { return x == y; });
+    eWiseOperation(a, b, out, [](ScalarT x, ScalarT y) { return static_cast<ScalarT>(x == y); });
 }
 
 void  minima::cpu::scalar_eq(const AlignedBuffer& a, ScalarT val, AlignedBuffer* out) {
     checkNullPointers(&a, nullptr, out);
     checkSizeMatch(a, *out);
-    scalarOperation(a, val, out, [](ScalarT x, ScalarT val) { return x == val; });
+    scalarOperation(a, val, out, [](ScalarT x, ScalarT val) { return static_cast<ScalarT>(x == val); });
 }
 
 void  minima::cpu::ewise_ge(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out) {
     checkNullPointers(&a, nullptr, out);
     checkSizeMatch(a, *out);
-    eWiseOperation(a, b, out, [](ScalarT x, ScalarT y) { return x >= y; });
+    eWiseOperation(a, b, out, [](ScalarT x, ScalarT y) { return static_cast<ScalarT>(x >= y); });
 }
 
 void  minima::cpu::scalar_ge(const AlignedBuffer& a, ScalarT val, AlignedBuffer* out) {
     checkNullPointers(&a, nullptr, out);
     checkSizeMatch(a, *out);
-    scalarOperation(a, val, out, [](ScalarT x, ScalarT val) { return x >= val; });
+    scalarOperation(a, val, out, [](ScalarT x, ScalarT val) { return static_cast<ScalarT>(x >= val); });
+}
+
+void minima::cpu::ewise_add_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return x + y; });
+}
+
+void minima::cpu::ewise_sub_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return x - y; });
+}
+
+void minima::cpu::ewise_mul_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return x * y; });
+}
+
+void minima::cpu::ewise_div_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return x / y; });
+}
+
+void minima::cpu::ewise_maximum_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return std::max(x, y); });
+}
+
+void minima::cpu::ewise_eq_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return static_cast<ScalarT>(x == y); });
+}
+
+void minima::cpu::ewise_ge_strided(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                  const std::vector<uint32_t>& shape,
+                                  const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                  const std::vector<uint32_t>& b_strides, size_t b_offset) {
+    BroadcastOperation(a, b, out, shape, a_strides, a_offset, b_strides, b_offset,
+                       [](ScalarT x, ScalarT y) { return static_cast<ScalarT>(x >= y); });
+}
+
+// Batched products with fewer flops than this run on the calling thread.
+constexpr size_t kParallelMatmulFlops = size_t{1} << 21;
+
+void minima::cpu::matmul(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                         uint32_t m, uint32_t n, uint32_t p) {
+    if (a.size() < size_t{m} * n || b.size() < size_t{n} * p || out->size() < size_t{m} * p) {
+        throw std::invalid_argument("Size mismatch between input and output arrays");
+    }
+    if (!all_float32({&a, &b, out})) {
+        // the product reads every element of its operands n or p times, so 16-bit ones are converted up front
+        AlignedBuffer fa(size_t{m} * n), fb(size_t{n} * p), fo(size_t{m} * p);
+        convert(a, &fa, fa.size());
+        convert(b, &fb, fb.size());
+        gemm(m, n, p, fa.data(), n, 1, fb.data(), p, 1, fo.data(), p);
+        convert(fo, out, fo.size());
+        return;
+    }
+    gemm(m, n, p, a.data(), n, 1, b.data(), p, 1, out->data(), p);
+}
+
+namespace {
+
+// Loads the `rows` x `cols` matrix at element `index` of `src`, through its strides, into the compact `out`.
+void load_matrix(const minima::cpu::AlignedBuffer& src, size_t index, size_t rows, size_t cols,
+                 size_t row_stride, size_t col_stride, float* out) {
+  for (size_t i = 0; i < rows; ++i) {
+    load_strided(src.raw(), src.dtype(), index + i * row_stride, col_stride, cols, out + i * cols);
+  }
+}
+
+}  // namespace
+
+void minima::cpu::matmul_batched(const AlignedBuffer& a, const AlignedBuffer& b, AlignedBuffer* out,
+                                 const std::vector<uint32_t>& batch_shape,
+                                 const std::vector<uint32_t>& a_strides, size_t a_offset,
+                                 const std::vector<uint32_t>& b_strides, size_t b_offset,
+                                 uint32_t m, uint32_t n, uint32_t p) {
+    const size_t rank = batch_shape.size();
+    if (a_strides.size() != rank + 2 || b_strides.size() != rank + 2) {
+        throw std::invalid_argument("Strides must have one entry per batch dimension plus two");
+    }
+    std::vector<uint32_t> a_shape(batch_shape), b_shape(batch_shape);
+    a_shape.insert(a_shape.end(), {m, n});
+    b_shape.insert(b_shape.end(), {n, p});
+    check_bounds(a_shape, a_strides, a_offset, a.size());
+    check_bounds(b_shape, b_strides, b_offset, b.size());
+
+    size_t batch = 1;
+    for (uint32_t dim : batch_shape) batch *= dim;
+    const size_t matrix_size = size_t{m} * p;
+    if (out->size() < batch * matrix_size) {
+        throw std::invalid_argument("Size mismatch between input and output arrays");
+    }
+
+    const ScalarT* pa = a.data();
+    const ScalarT* pb = b.data();
+    ScalarT* po = out->data();
+    const bool converted = !all_float32({&a, &b, out});
+    // broadcast batch dimensions have a zero stride, so every product reads its operands in place, and
+    // 16-bit ones are converted one product at a time
+    auto run = [&](size_t begin, size_t end) {
+        std::vector<float> fa, fb, fo;
+        if (converted) {
+            fa.resize(size_t{m} * n);
+            fb.resize(size_t{n} * p);
+            fo.resize(matrix_size);
+        }
+        for (size_t i = begin; i < end; ++i) {
+            size_t a_index = a_offset, b_index = b_offset, rest = i;
+            for (size_t d = rank; d-- > 0;) {
+                const size_t index = rest % batch_shape[d];
+                rest /= batch_shape[d];
+                a_index += index * a_strides[d];
+                b_index += index * b_strides[d];
+            }
+            if (converted) {
+                load_matrix(a, a_index, m, n, a_strides[rank], a_strides[rank + 1], fa.data());
+                load_matrix(b, b_index, n, p, b_strides[rank], b_strides[rank + 1], fb.data());
+                gemm(m, n, p, fa.data(), n, 1, fb.data(), p, 1, fo.data(), p);
+                store_floats(fo.data(), matrix_size, out->dtype(),
+                             static_cast<char*>(out->raw()) + i * matrix_size * ElemSize(out->dtype()));
+                continue;
+            }
+            gemm(m, n, p, pa + a_index, a_strides[rank], a_strides[rank + 1],
+                 pb + b_index, b_strides[rank], b_strides[rank + 1], po + i * matrix_size, p);
+        }
+    };
+
+    // many products are split across the threads whole, a few large ones are each split by rows
+    if (batch >= get_num_threads() && 2 * batch * matrix_size * n >= kParallelMatmulFlops) {
+        parallel_for(batch, run, 2);
+    } else {
+        run(0, batch);
+    }
+}
+
+// Number of independent accumulators in the reductions, lets the compiler keep them in one vector
+// register instead of serializing every addition.
+constexpr size_t kReduceLanes = 8;
+
+// Reduces the elements [begin, end) of `a` with `op`, which reduces a range of floats. 16-bit elements
+// are converted a chunk at a time, and the results of the chunks reduced together.
+template <typename ReduceOp>
+minima::cpu::ScalarT reduce_range(const minima::cpu::AlignedBuffer& a, size_t begin, size_t end, ReduceOp op) {
+    if (a.dtype() == DType::kFloat32) return op(a.data() + begin, a.data() + end);
+    const char* src = static_cast<const char*>(a.raw());
+    float chunk[kCastChunk];
+    auto reduce_chunk = [&](size_t i) {
+        const size_t n = std::min(kCastChunk, end - i);
+        load_floats(src + i * sizeof(uint16_t), a.dtype(), n, chunk);
+        return op(chunk, chunk + n);
+    };
+    float results[2] = {reduce_chunk(begin), 0.0f};
+    for (size_t i = begin + kCastChunk; i < end; i += kCastChunk) {
+        results[1] = reduce_chunk(i);
+        results[0] = op(results, results + 2);
+    }
+    return results[0];
+}
+
+// Stores `value` as element `i` of `out`, whatever its dtype.
+inline void store_element(minima::cpu::AlignedBuffer* out, size_t i, minima::cpu::ScalarT value) {
+    if (out->dtype() == DType::kFloat32) {
+        out->data()[i] = value;
+    } else {
+        static_cast<uint16_t*>(out->raw())[i] = half_bits(value, out->dtype());
+    }
 }
 
 template <typename ReduceOp>
@@ -212,22 +830,391 @@ void Reduce(const minima::cpu::AlignedBuffer& a, minima::cpu::AlignedBuffer* out
     if (!out) {
         throw std::invalid_argument("Output buffer is a nullptr.");
     }
+    if (out->size() * reduce_size > a.size()) {
+        throw std::invalid_argument("Size mismatch between input and output arrays");
+    }
+    const size_t rows = out->size();
 
-    for(size_t i = 0; i < out->size(); ++i) {
-        const minima::cpu::ScalarT* start_ptr = a.data() + (i * reduce_size);
-        const minima::cpu::ScalarT* end_ptr = a.data() + ((i+1) * reduce_size);
-        out->set_element(i, op(start_ptr, end_ptr));
+    if (rows >= minima::cpu::get_num_threads() || rows * reduce_size < minima::cpu::get_parallel_threshold()) {
+        // enough rows to keep every thread busy, each one reduces whole rows
+        minima::cpu::parallel_for(rows, [&](size_t begin, size_t end) {
+            for (size_t i = begin; i < end; ++i) {
+                store_element(out, i, reduce_range(a, i * reduce_size, (i + 1) * reduce_size, op));
+            }
+        }, std::max<size_t>(1, minima::cpu::get_parallel_threshold() / std::max<size_t>(1, reduce_size)));
+        return;
+    }
+
+    // few long rows, every row is split across the threads and the partial results combined in order
+    for (size_t i = 0; i < rows; ++i) {
+        const size_t row = i * reduce_size;
+        std::mutex mutex;
+        std::vector<std::pair<size_t, minima::cpu::ScalarT>> partials;
+        minima::cpu::parallel_for(reduce_size, [&](size_t begin, size_t end) {
+            minima::cpu::ScalarT partial = reduce_range(a, row + begin, row + end, op);
+            std::lock_guard<std::mutex> lock(mutex);
+            partials.emplace_back(begin, partial);
+        });
+        std::sort(partials.begin(), partials.end());
+        std::vector<minima::cpu::ScalarT> values;
+        for (const auto& p : partials) values.push_back(p.second);
+        store_element(out, i, op(values.data(), values.data() + values.size()));
     }
 }
 
 void minima::cpu::reduce_max(const AlignedBuffer& a, AlignedBuffer* out, size_t reduce_size) {
     Reduce(a, out, reduce_size, [](const ScalarT* start, const ScalarT* end){
-        return *std::max_element(start, end);
+        const size_t n = end - start;
+        if (n < kReduceLanes) return *std::max_element(start, end);
+        ScalarT lanes[kReduceLanes];
+        std::copy(start, start + kReduceLanes, lanes);
+        size_t i = kReduceLanes;
+        for (; i + kReduceLanes <= n; i += kReduceLanes) {
+            for (size_t l = 0; l < kReduceLanes; ++l) lanes[l] = std::max(lanes[l], start[i + l]);
+        }
+        ScalarT result = *std::max_element(lanes, lanes + kReduceLanes);
+        for (; i < n; ++i) result = std::max(result, start[i]);
+        return result;
     });
 }
 
 void minima::cpu::reduce_sum(const AlignedBuffer& a, AlignedBuffer* out, size_t reduce_size) {
     Reduce(a, out, reduce_size, [](const ScalarT* start, const ScalarT* end){
-        return std::accumulate(start, end, 0.0f);
+        const size_t n = end - start;
+        ScalarT lanes[kReduceLanes] = {};
+        size_t i = 0;
+        for (; i + kReduceLanes <= n; i += kReduceLanes) {
+            for (size_t l = 0; l < kReduceLanes; ++l) lanes[l] += start[i + l];
+        }
+        ScalarT result = std::accumulate(lanes, lanes + kReduceLanes, 0.0f);
+        for (; i < n; ++i) result += start[i];
+        return result;
+    });
+}
+
+namespace {
+
+// The dimensions of a strided reduction: the kept dimensions, in the order of the compact output,
+// and the reduced dimensions, each with unit dimensions dropped and contiguous dimensions merged.
+struct ReduceLayout {
+  std::vector<size_t> keep_shape, keep_strides;
+  std::vector<size_t> reduce_shape, reduce_strides;
+  size_t keep_size = 1, reduce_size = 1;
+};
+
+void collapse_dims(const uint32_t* shape, const uint32_t* strides, size_t rank,
+                   std::vector<size_t>* out_shape, std::vector<size_t>* out_strides, size_t* size) {
+  for (size_t i = 0; i < rank; ++i) {
+    *size *= shape[i];
+    if (shape[i] == 1) continue;
+    if (!out_shape->empty() && out_strides->back() == size_t{strides[i]} * shape[i]) {
+      out_shape->back() *= shape[i];
+      out_strides->back() = strides[i];
+    } else {
+      out_shape->push_back(shape[i]);
+      out_strides->push_back(strides[i]);
+    }
+  }
+  if (out_shape->empty()) {
+    out_shape->push_back(1);
+    out_strides->push_back(0);
+  }
+}
+
+// Calls `fn(index, offset)` for the flat indices [begin, begin + count) of the index space of
+// `shape`, with the offset of each index through `strides` advanced incrementally.
+template <typename Fn>
+void walk(const std::vector<size_t>& shape, const std::vector<size_t>& strides, size_t begin, size_t count, Fn fn) {
+  const size_t rank = shape.size();
+  std::vector<size_t> index(rank);
+  size_t offset = 0, rest = begin;
+  for (size_t d = rank; d-- > 0;) {
+    index[d] = rest % shape[d];
+    rest /= shape[d];
+    offset += index[d] * strides[d];
+  }
+  for (size_t i = 0; i < count; ++i) {
+    fn(begin + i, offset);
+    for (size_t d = rank; d-- > 0;) {
+      offset += strides[d];
+      if (++index[d] < shape[d]) break;
+      offset -= strides[d] * shape[d];
+      index[d] = 0;
+    }
+  }
+}
+
+// Reduction policies: `init` starts an accumulator from the first element of the reduction, `add`
+// folds in an element, `merge` combines two accumulators started from the same first element, and
+// `store` writes the result of output `i` after `n` elements.
+
+struct SumReduction {
+  using State = minima::cpu::ScalarT;
+  minima::cpu::AlignedBuffer* out;
+  State init(minima::cpu::ScalarT) const { return 0; }
+  static void add(State& s, minima::cpu::ScalarT x) { s += x; }
+  static void merge(State& s, const State& other) { s += other; }
+  void store(size_t i, const State& s, size_t) const { store_element(out, i, s); }
+};
+
+struct MaxReduction {
+  using State = minima::cpu::ScalarT;
+  minima::cpu::AlignedBuffer* out;
+  State init(minima::cpu::ScalarT first) const { return first; }
+  static void add(State& s, minima::cpu::ScalarT x) { s = std::max(s, x); }
+  static void merge(State& s, const State& other) { s = std::max(s, other); }
+  void store(size_t i, const State& s, size_t) const { store_element(out, i, s); }
+};
+
+// Mean and (population) variance in one pass, from sums of the elements shifted by the first one
+// in double precision, which keeps E[x^2] - E[x]^2 from cancelling when the mean is large.
+struct MomentsReduction {
+  struct State {
+    double shift, sum, sum_sq;
+  };
+  minima::cpu::AlignedBuffer* mean;
+  minima::cpu::AlignedBuffer* var;
+  State init(minima::cpu::ScalarT first) const { return {first, 0.0, 0.0}; }
+  static void add(State& s, minima::cpu::ScalarT x) {
+    const double d = static_cast<double>(x) - s.shift;
+    s.sum += d;
+    s.sum_sq += d * d;
+  }
+  static void merge(State& s, const State& other) {
+    s.sum += other.sum;
+    s.sum_sq += other.sum_sq;
+  }
+  void store(size_t i, const State& s, size_t n) const {
+    const double m = s.sum / n;
+    store_element(mean, i, static_cast<minima::cpu::ScalarT>(s.shift + m));
+    store_element(var, i, static_cast<minima::cpu::ScalarT>(std::max(0.0, s.sum_sq / n - m * m)));
+  }
+};
+
+// Reduces the last `reduce_ndim` dimensions of the strided view of `a` into compact outputs over
+// the other dimensions, reading the view in place, as `Elems`.
+template <typename Elems, typename Policy>
+void ReduceStrided(const minima::cpu::AlignedBuffer& a, const std::vector<uint32_t>& shape,
+                   const std::vector<uint32_t>& strides, size_t offset, size_t reduce_ndim,
+                   size_t out_size, const Policy& policy) {
+  using State = typename Policy::State;
+  using T = typename Elems::T;
+  if (strides.size() != shape.size() || reduce_ndim > shape.size()) {
+    throw std::invalid_argument("Strides must have one entry per dimension, and at most that many are reduced");
+  }
+  ReduceLayout layout;
+  const size_t keep_ndim = shape.size() - reduce_ndim;
+  collapse_dims(shape.data(), strides.data(), keep_ndim, &layout.keep_shape, &layout.keep_strides, &layout.keep_size);
+  // a reduction doesn't depend on the order of its dimensions, sorted by decreasing stride the innermost
+  // loops walk the smallest strides, e.g. a transposed view is read in memory order
+  std::vector<size_t> order(reduce_ndim);
+  std::iota(order.begin(), order.end(), keep_ndim);
+  std::stable_sort(order.begin(), order.end(), [&](size_t i, size_t j) { return strides[i] > strides[j]; });
+  std::vector<uint32_t> reduce_shape, reduce_strides;
+  for (size_t i : order) {
+    reduce_shape.push_back(shape[i]);
+    reduce_strides.push_back(strides[i]);
+  }
+  collapse_dims(reduce_shape.data(), reduce_strides.data(), reduce_ndim,
+                &layout.reduce_shape, &layout.reduce_strides, &layout.reduce_size);
+  if (out_size < layout.keep_size) throw std::invalid_argument("Size mismatch between input and output arrays");
+  if (layout.keep_size == 0) return;
+  const size_t n = layout.reduce_size;
+  if (n == 0) throw std::invalid_argument("Cannot reduce over zero elements");
+  check_bounds(shape, strides, offset, a.size());
+
+  const T* pa = static_cast<const T*>(a.raw()) + offset;
+  const size_t threshold = minima::cpu::get_parallel_threshold();
+  const size_t inner = layout.reduce_shape.back();
+  const size_t inner_stride = layout.reduce_strides.back();
+  const std::vector<size_t> rows_shape(layout.reduce_shape.begin(), layout.reduce_shape.end() - 1);
+  const std::vector<size_t> rows_strides(layout.reduce_strides.begin(), layout.reduce_strides.end() - 1);
+  const size_t rows = n / inner;
+  const size_t cols = layout.keep_shape.back();
+  const size_t col_stride = layout.keep_strides.back();
+
+  if (inner_stride != 1 && col_stride == 1 && cols > 1) {
+    // reducing across rows of contiguous outputs (e.g. a sum over axis 0), whole tiles of outputs are
+    // accumulated together so that every element is read in memory order
+    constexpr size_t kTile = 1024;
+    const std::vector<size_t> outer_shape(layout.keep_shape.begin(), layout.keep_shape.end() - 1);
+    const std::vector<size_t> outer_strides(layout.keep_strides.begin(), layout.keep_strides.end() - 1);
+    const size_t tiles = (cols + kTile - 1) / kTile;
+    minima::cpu::parallel_for(layout.keep_size / cols * tiles, [&](size_t begin, size_t end) {
+      State states[kTile];
+      for (size_t t = begin; t < end; ++t) {
+        const size_t row = t / tiles, j0 = t % tiles * kTile, width = std::min(kTile, cols - j0);
+        size_t base = 0;
+        walk(outer_shape, outer_strides, row, 1, [&](size_t, size_t o) { base = o; });
+        const T* first = pa + base + j0;
+        for (size_t j = 0; j < width; ++j) states[j] = policy.init(Elems::Load(first[j]));
+        walk(layout.reduce_shape, layout.reduce_strides, 0, n, [&](size_t, size_t r) {
+          const T* x = first + r;
+          for (size_t j = 0; j < width; ++j) Policy::add(states[j], Elems::Load(x[j]));
+        });
+        for (size_t j = 0; j < width; ++j) policy.store(row * cols + j0 + j, states[j], n);
+      }
+    }, std::max<size_t>(1, threshold / (n * std::min(kTile, cols))));
+    return;
+  }
+
+  // Folds the elements of output `base` in reduced rows [row_begin, row_end) and, for a single
+  // contiguous row, elements [col_begin, col_end) of it, into kReduceLanes accumulators.
+  auto fold = [&](size_t base, size_t row_begin, size_t row_end, size_t col_begin, size_t col_end) {
+    State lanes[kReduceLanes];
+    for (auto& lane : lanes) lane = policy.init(Elems::Load(pa[base]));
+    walk(rows_shape, rows_strides, row_begin, row_end - row_begin, [&](size_t, size_t r) {
+      const T* x = pa + base + r;
+      if (inner_stride == 1) {
+        size_t j = col_begin;
+        for (; j + kReduceLanes <= col_end; j += kReduceLanes) {
+          for (size_t l = 0; l < kReduceLanes; ++l) Policy::add(lanes[l], Elems::Load(x[j + l]));
+        }
+        for (; j < col_end; ++j) Policy::add(lanes[0], Elems::Load(x[j]));
+      } else {
+        for (size_t j = col_begin; j < col_end; ++j) Policy::add(lanes[0], Elems::Load(x[j * inner_stride]));
+      }
+    });
+    for (size_t l = 1; l < kReduceLanes; ++l) Policy::merge(lanes[0], lanes[l]);
+    return lanes[0];
+  };
+
+  if (layout.keep_size < minima::cpu::get_num_threads() && n >= threshold) {
+    // few long reductions, each one is split across the threads and the partial results combined in order
+    walk(layout.keep_shape, layout.keep_strides, 0, layout.keep_size, [&](size_t i, size_t base) {
+      const bool split_rows = rows > 1;
+      std::mutex mutex;
+      std::vector<std::pair<size_t, State>> partials;
+      minima::cpu::parallel_for(split_rows ? rows : inner, [&](size_t begin, size_t end) {
+        State partial = split_rows ? fold(base, begin, end, 0, inner) : fold(base, 0, 1, begin, end);
+        std::lock_guard<std::mutex> lock(mutex);
+        partials.emplace_back(begin, partial);
+      }, 2);
+      std::sort(partials.begin(), partials.end(), [](const auto& x, const auto& y) { return x.first < y.first; });
+      State result = partials[0].second;
+      for (size_t p = 1; p < partials.size(); ++p) Policy::merge(result, partials[p].second);
+      policy.store(i, result, n);
+    });
+    return;
+  }
+
+  // every output reduces its own elements
+  minima::cpu::parallel_for(layout.keep_size, [&](size_t begin, size_t end) {
+    walk(layout.keep_shape, layout.keep_strides, begin, end - begin, [&](size_t i, size_t base) {
+      policy.store(i, fold(base, 0, rows, 0, inner), n);
+    });
+  }, std::max<size_t>(1, threshold / n));
+}
+
+}  // namespace
+
+void minima::cpu::reduce_sum_strided(const AlignedBuffer& a, AlignedBuffer* out, const std::vector<uint32_t>& shape,
+                                     const std::vector<uint32_t>& strides, size_t offset, size_t reduce_ndim) {
+    checkNullPointers(&a, nullptr, out);
+    dispatch_elems(a.dtype(), [&](auto elems) {
+        ReduceStrided<decltype(elems)>(a, shape, strides, offset, reduce_ndim, out->size(), SumReduction{out});
+    });
+}
+
+void minima::cpu::reduce_max_strided(const AlignedBuffer& a, AlignedBuffer* out, const std::vector<uint32_t>& shape,
+                                     const std::vector<uint32_t>& strides, size_t offset, size_t reduce_ndim) {
+    checkNullPointers(&a, nullptr, out);
+    dispatch_elems(a.dtype(), [&](auto elems) {
+        ReduceStrided<decltype(elems)>(a, shape, strides, offset, reduce_ndim, out->size(), MaxReduction{out});
+    });
+}
+
+void minima::cpu::reduce_mean_var_strided(const AlignedBuffer& a, AlignedBuffer* mean, AlignedBuffer* var,
+                                          const std::vector<uint32_t>& shape, const std::vector<uint32_t>& strides,
+                                          size_t offset, size_t reduce_ndim) {
+    checkNullPointers(&a, nullptr, mean);
+    checkNullPointers(&a, nullptr, var);
+    dispatch_elems(a.dtype(), [&](auto elems) {
+        ReduceStrided<decltype(elems)>(a, shape, strides, offset, reduce_ndim, std::min(mean->size(), var->size()),
+                                       MomentsReduction{mean, var});
     });
-}
\ No newline at end of file
+}
+
+namespace {
+
+// Checks that every target is the index of a class, before any thread reads them.
+void check_targets(const minima::cpu::AlignedBuffer& target, size_t batch, size_t classes) {
+  for (size_t i = 0; i < batch; ++i) {
+    const minima::cpu::ScalarT t = target.get_element(i);
+    if (!(t >= 0) || t >= classes || t != std::floor(t)) {
+      throw std::invalid_argument("Targets must be class indices in [0, classes)");
+    }
+  }
+}
+
+// log(sum(exp(row))), shifted by the maximum of the row so that no exponential overflows.
+minima::cpu::ScalarT row_logsumexp(const minima::cpu::ScalarT* row, size_t n) {
+  minima::cpu::ScalarT max = row[0];
+  for (size_t j = 1; j < n; ++j) max = std::max(max, row[j]);
+  minima::cpu::ScalarT lanes[kReduceLanes] = {};
+  size_t j = 0;
+  for (; j + kReduceLanes <= n; j += kReduceLanes) {
+    for (size_t l = 0; l < kReduceLanes; ++l) lanes[l] += std::exp(row[j + l] - max);
+  }
+  minima::cpu::ScalarT sum = std::accumulate(lanes, lanes + kReduceLanes, 0.0f);
+  for (; j < n; ++j) sum += std::exp(row[j] - max);
+  return max + std::log(sum);
+}
+
+}  // namespace
+
+void minima::cpu::log_softmax_nll(const AlignedBuffer& logits, const AlignedBuffer& target, AlignedBuffer* loss,
+                                  AlignedBuffer* lse, size_t batch, size_t classes) {
+    checkNullPointers(&logits, &target, loss);
+    checkNullPointers(&logits, &target, lse);
+    if (classes == 0 || logits.size() < batch * classes || target.size() < batch || loss->size() < batch || lse->size() < batch) {
+        throw std::invalid_argument("Size mismatch between the logits, the targets and the outputs");
+    }
+    check_targets(target, batch, classes);
+    const bool converted = logits.dtype() != DType::kFloat32;
+    parallel_for(batch, [&](size_t begin, size_t end) {
+        // 16-bit logits are converted a row at a time
+        std::vector<ScalarT> converted_row(converted ? classes : 0);
+        for (size_t i = begin; i < end; ++i) {
+            const ScalarT* row = logits.data() + i * classes;
+            if (converted) {
+                load_strided(logits.raw(), logits.dtype(), i * classes, 1, classes, converted_row.data());
+                row = converted_row.data();
+            }
+            const ScalarT row_lse = row_logsumexp(row, classes);
+            store_element(lse, i, row_lse);
+            store_element(loss, i, row_lse - row[static_cast<size_t>(target.get_element(i))]);
+        }
+    }, std::max<size_t>(1, get_parallel_threshold() / classes));
+}
+
+void minima::cpu::log_softmax_nll_backward(const AlignedBuffer& logits, const AlignedBuffer& target,
+                                           const AlignedBuffer& lse, const AlignedBuffer& grad_loss,
+                                           AlignedBuffer* out, size_t batch, size_t classes) {
+    checkNullPointers(&logits, &target, out);
+    if (logits.size() < batch * classes || out->size() < batch * classes || target.size() < batch ||
+        lse.size() < batch || grad_loss.size() < batch) {
+        throw std::invalid_argument("Size mismatch between the logits, the targets and the outputs");
+    }
+    check_targets(target, batch, classes);
+    const bool converted = !all_float32({&logits, out});
+    parallel_for(batch, [&](size_t begin, size_t end) {
+        // 16-bit rows are converted to float32 and back a row at a time
+        std::vector<ScalarT> row_buffer(converted ? classes : 0), grad_buffer(converted ? classes : 0);
+        for (size_t i = begin; i < end; ++i) {
+            const ScalarT* row = logits.data() + i * classes;
+            ScalarT* grad = converted ? grad_buffer.data() : out->data() + i * classes;
+            if (converted) {
+                load_strided(logits.raw(), logits.dtype(), i * classes, 1, classes, row_buffer.data());
+                row = row_buffer.data();
+            }
+            const ScalarT g = grad_loss.get_element(i), row_lse = lse.get_element(i);
+            for (size_t j = 0; j < classes; ++j) grad[j] = g * std::exp(row[j] - row_lse);
+            grad[static_cast<size_t>(target.get_element(i))] -= g;
+            if (converted) {
+                store_floats(grad, classes, out->dtype(),
+                             static_cast<char*>(out->raw()) + i * classes * ElemSize(out->dtype()));
+            }
+        }
+    }, std::max<size_t>(1, get_parallel_threshold() / classes));
+}
@@ -0,0 +1,139 @@
+#include "../../include/cpu_backend/thread_pool.h"
+
+#include <unistd.h>
+
+#include <algorithm>
+#include <cstdlib>
+#include <memory>
+
+namespace minima {
+namespace cpu {
+
+namespace {
+
+// Chunks are rounded to whole cache lines of floats so that threads never write to the same line.
+constexpr size_t kChunkAlignment = 16;
+
+thread_local bool tls_in_parallel_region = false;
+
+size_t default_num_threads() {
+  if (const char* env = std::getenv("MINIMA_NUM_THREADS")) {
+    long n = std::strtol(env, nullptr, 10);
+    if (n > 0) return static_cast<size_t>(n);
+  }
+  return std::max<size_t>(1, std::thread::hardware_concurrency());
+}
+
+size_t g_num_threads = default_num_threads();
+size_t g_parallel_threshold = 1 << 15;
+std::unique_ptr<ThreadPool> g_pool;
+pid_t g_pool_pid = 0;
+std::mutex g_pool_mutex;
+
+ThreadPool& pool() {
+  std::lock_guard<std::mutex> lock(g_pool_mutex);
+  if (g_pool && g_pool_pid != getpid()) {
+    // the workers did not survive a fork, the pool cannot be joined from the child
+    (void)g_pool.release();
+  }
+  if (!g_pool || g_pool->size() != g_num_threads) {
+    g_pool.reset(new ThreadPool(g_num_threads));
+    g_pool_pid = getpid();
+  }
+  return *g_pool;
+}
+
+}  // namespace
+
+ThreadPool::ThreadPool(size_t num_threads) {
+  for (size_t i = 1; i < num_threads; ++i) {
+    workers_.emplace_back(&ThreadPool::WorkerLoop, this, i);
+  }
+}
+
+ThreadPool::~ThreadPool() {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    stop_ = true;
+  }
+  start_.notify_all();
+  for (auto& worker : workers_) worker.join();
+}
+
+size_t ThreadPool::size() const {
+  return workers_.size() + 1;
+}
+
+void ThreadPool::RunChunk(size_t index) {
+  size_t chunk = (n_ + size() - 1) / size();
+  // short ranges (rows, matrices of a batch) are not rounded, it would leave threads without work
+  if (chunk >= kChunkAlignment) chunk = (chunk + kChunkAlignment - 1) / kChunkAlignment * kChunkAlignment;
+  const size_t begin = std::min(n_, index * chunk);
+  const size_t end = index + 1 == size() ? n_ : std::min(n_, begin + chunk);
+  if (begin < end) (*task_)(begin, end);
+}
+
+void ThreadPool::WorkerLoop(size_t index) {
+  tls_in_parallel_region = true;
+  size_t seen = 0;
+  while (true) {
+    {
+      std::unique_lock<std::mutex> lock(mutex_);
+      start_.wait(lock, [&] { return stop_ || generation_ != seen; });
+      if (stop_) return;
+      seen = generation_;
+    }
+    RunChunk(index);
+    {
+      std::lock_guard<std::mutex> lock(mutex_);
+      if (--pending_ == 0) done_.notify_one();
+    }
+  }
+}
+
+void ThreadPool::run(size_t n, const std::function<void(size_t, size_t)>& fn) {
+  {
+    std::lock_guard<std::mutex> lock(mutex_);
+    task_ = &fn;
+    n_ = n;
+    pending_ = workers_.size();
+    ++generation_;
+  }
+  start_.notify_all();
+
+  tls_in_parallel_region = true;
+  RunChunk(0);
+  tls_in_parallel_region = false;
+
+  std::unique_lock<std::mutex> lock(mutex_);
+  done_.wait(lock, [&] { return pending_ == 0; });
+  task_ = nullptr;
+}
+
+void set_num_threads(size_t num_threads) {
+  std::lock_guard<std::mutex> lock(g_pool_mutex);
+  g_num_threads = std::max<size_t>(1, num_threads);
+}
+
+size_t get_num_threads() {
+  return g_num_threads;
+}
+
+void set_parallel_threshold(size_t threshold) {
+  g_parallel_threshold = threshold;
+}
+
+size_t get_parallel_threshold() {
+  return g_parallel_threshold;
+}
+
+void run_parallel(size_t n, const std::function<void(size_t, size_t)>& fn) {
+  pool().run(n, fn);
+}
+
+bool in_parallel_region() {
+  return tls_in_parallel_region;
+}
+
+}  // namespace cpu
+}  // namespace minima